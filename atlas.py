@@ -0,0 +1,80 @@
+"""
+Packs every sprite the game loads, plus the derived palette and rotated
+variants, into a few sprite sheets with a JSON index (ATLAS_INDEX). At startup
+load_atlas() slices the images back out of the sheets, which turns dozens of
+file opens and PNG decodes (each a separate fetch in the web build) into one
+or two. Run it again after changing anything in sprites/:
+
+    python atlas.py
+"""
+import json
+import os
+import pygame
+from utils import IMAGES, ATLAS, ATLAS_INDEX, load_play_images, load_editor_images
+
+SHEET_SIZE = 1024
+SKIPPED_IMAGES = {'spr_dynamic_object_placeholder'}  # Created blank at runtime, nothing to load
+
+def pack_shelves(sizes, sheet_size=SHEET_SIZE):
+    """
+    Places rectangles left to right in rows ("shelves"), tallest first,
+    starting a new sheet when one fills up.
+    :param sizes: List of (width, height), none larger than sheet_size.
+    :return: List of (sheet_number, x, y), in the same order as sizes.
+    """
+    placements = [None] * len(sizes)
+    sheet_number, x, y, shelf_height = 0, 0, 0, 0
+    for index in sorted(range(len(sizes)), key=lambda index: (-sizes[index][1], -sizes[index][0])):
+        width, height = sizes[index]
+        if x + width > sheet_size:
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + height > sheet_size:
+            sheet_number, x, y, shelf_height = sheet_number + 1, 0, 0, 0
+        placements[index] = (sheet_number, x, y)
+        x += width
+        shelf_height = max(shelf_height, height)
+    return placements
+
+def build_atlas(index_file=ATLAS_INDEX, sheet_size=SHEET_SIZE):
+    """
+    Loads every image from its own file, packs them and writes the sheets
+    (atlas_0.png, atlas_1.png, ...) and the index next to index_file.
+    :return: The number of images packed.
+    """
+    ATLAS.clear()
+    IMAGES.clear()
+    load_play_images(use_atlas=False)
+    load_editor_images()
+    names = sorted(name for name in IMAGES if name not in SKIPPED_IMAGES)
+    placements = pack_shelves([IMAGES[name].get_size() for name in names], sheet_size)
+
+    sheets = []
+    for name, (sheet_number, x, y) in zip(names, placements):
+        while len(sheets) <= sheet_number:
+            sheets.append(pygame.Surface((sheet_size, sheet_size), pygame.SRCALPHA))
+        # Copy the pixels as they are rather than alpha-blending them onto the empty sheet
+        sheets[sheet_number].blit(IMAGES[name], (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+
+    atlas_dir = os.path.dirname(index_file)
+    sheet_files = []
+    for sheet_number, sheet in enumerate(sheets):
+        # Crop the last sheet to the part actually used
+        used = [(x + IMAGES[name].get_width(), y + IMAGES[name].get_height())
+                for name, (number, x, y) in zip(names, placements) if number == sheet_number]
+        sheet = sheet.subsurface((0, 0, max(right for right, _ in used), max(bottom for _, bottom in used)))
+        sheet_files.append("atlas_{}.png".format(sheet_number))
+        pygame.image.save(sheet, os.path.join(atlas_dir, sheet_files[-1]))
+
+    atlas_index = {
+        "sheets": sheet_files,
+        "sprites": {name: [sheet_number, x, y, IMAGES[name].get_width(), IMAGES[name].get_height()]
+                    for name, (sheet_number, x, y) in zip(names, placements)},
+    }
+    with open(index_file, "w") as index:
+        json.dump(atlas_index, index, indent=1, sort_keys=True)
+    return len(names)
+
+if __name__ == "__main__":
+    pygame.init()
+    image_count = build_atlas()
+    print("Packed {} images into {}".format(image_count, ATLAS_INDEX))
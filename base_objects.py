@@ -1,4 +1,6 @@
 import pygame
+from collision import OccupancyGrid, SpatialHash
+from utils import SCREEN_WIDTH, GRID_SPACING, get_mask, grid_cell
 
 class StartGameObject(pygame.sprite.Sprite):
     def __init__(self, image, position):
@@ -8,18 +10,90 @@ class StartGameObject(pygame.sprite.Sprite):
         
 class PlacedObject(pygame.sprite.Sprite):
     object_list = []  # This could be overridden by subclasses if separate lists are needed
+    static_layer = None  # StaticLayer caching the edit screen, told about every object placed or erased
+    cell_index = {}  # Grid cell -> placed objects whose top-left corner is in it, see utils.grid_cell()
 
     def __init__(self, pos, placed_sprites, image):
         super().__init__()
         self.image = image
         self.rect = self.image.get_rect(topleft=pos)
-        placed_sprites.add(self)
+        self.indexed_at = None
+        # None leaves adding to the group to the caller, which can then add a whole batch at once
+        if placed_sprites is not None:
+            placed_sprites.add(self)
         self.add_to_class_list()
     
     def add_to_class_list(self):
         # This method will be overridden by subclasses to add the object to the specific list
         pass
 
+    @classmethod
+    def placed_at(cls, pos):
+        """
+        Returns the object of this class whose top-left corner is pos, or None.
+        Called on PlacedObject itself, an object of any class.
+        """
+        pos = tuple(pos)
+        for sprite in PlacedObject.cell_index.get(grid_cell(pos), ()):
+            if sprite.rect.topleft == pos and (cls is PlacedObject or type(sprite) is cls):
+                return sprite
+        return None
+
+    @staticmethod
+    def placed_in_cells(cells):
+        """
+        Returns every placed object in the given grid cells, looked up in the
+        cell index instead of testing each object.
+        :param cells: Iterable of (column, row) grid cells.
+        """
+        cell_index = PlacedObject.cell_index
+        return [sprite for cell in cells for sprite in cell_index.get(cell, ())]
+
+    def index_cell(self):
+        if self.indexed_at is None:
+            self.indexed_at = grid_cell(self.rect.topleft)
+            PlacedObject.cell_index.setdefault(self.indexed_at, []).append(self)
+
+    def unindex_cell(self):
+        if self.indexed_at is not None:
+            sprites = PlacedObject.cell_index[self.indexed_at]
+            sprites.remove(self)
+            if not sprites:
+                del PlacedObject.cell_index[self.indexed_at]
+            self.indexed_at = None
+
+    def move_by(self, dx, dy):
+        """Moves a placed object, keeping the cell index and the static layer up to date."""
+        if PlacedObject.static_layer is not None:
+            PlacedObject.static_layer.mark_dirty(self.rect)
+        was_indexed = self.indexed_at is not None
+        self.unindex_cell()
+        self.rect.move_ip(dx, dy)
+        if was_indexed:
+            self.index_cell()
+        if PlacedObject.static_layer is not None:
+            PlacedObject.static_layer.mark_dirty(self.rect)
+
+    def add_internal(self, group):
+        super().add_internal(group)
+        self.index_cell()
+        if PlacedObject.static_layer is not None:
+            PlacedObject.static_layer.mark_dirty(self.rect)
+
+    def remove_internal(self, group):
+        super().remove_internal(group)
+        if not self.alive():
+            self.unindex_cell()
+        if PlacedObject.static_layer is not None:
+            PlacedObject.static_layer.mark_dirty(self.rect)
+
+    def kill(self):
+        # Sprite.kill() bypasses remove_internal()
+        if self.alive() and PlacedObject.static_layer is not None:
+            PlacedObject.static_layer.mark_dirty(self.rect)
+        super().kill()
+        self.unindex_cell()
+
     def update(self):
         pass
 
@@ -32,6 +106,11 @@ class PlacedObject(pygame.sprite.Sprite):
         pass
 
 class PlayObject(pygame.sprite.Sprite):
+    world_width = SCREEN_WIDTH  # Width of the level being played, see play_objects.set_world_width()
+    occupancy_grid = OccupancyGrid()  # Shared solidity lookup, rebuilt when play mode starts
+    enemy_batch = None  # EnemyBatch moving flyers and robots in bulk, if the level has enough of them
+    hazard_hash = SpatialHash(GRID_SPACING * 2)  # Enemies, spikes, diamonds and springs the player can touch
+
     def __init__(self, pos, play_sprites, image):
         super().__init__()
         self.image = image
@@ -40,6 +119,11 @@ class PlayObject(pygame.sprite.Sprite):
         play_sprites.add(self)
         self.add_to_class_list()
 
+    @property
+    def mask(self):
+        # pygame.sprite.collide_mask uses .mask when present instead of building one per call
+        return get_mask(self.image)
+
     def add_to_class_list(self):
         # This method should be overridden by subclasses if they maintain a specific list
         pass
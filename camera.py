@@ -0,0 +1,60 @@
+import pygame
+from utils import SCREEN_WIDTH, SCREEN_HEIGHT
+
+ACTIVE_MARGIN = SCREEN_WIDTH // 2  # Objects this far past either side of the view keep moving
+UNBOUNDED = 1 << 20
+
+class Camera():
+    """
+    A screen-sized window onto a level that may be wider than the screen. The
+    level scrolls horizontally only: world positions become screen positions
+    by subtracting x.
+    """
+    def __init__(self, world_width=SCREEN_WIDTH, view_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.view_width, self.view_height = view_size
+        self.world_width = max(world_width, self.view_width)
+        self.x = 0
+
+    @property
+    def max_x(self):
+        return self.world_width - self.view_width
+
+    @property
+    def offset(self):
+        return (self.x, 0)
+
+    @property
+    def view_rect(self):
+        """The part of the world on screen, in world coordinates."""
+        return pygame.Rect(self.x, 0, self.view_width, self.view_height)
+
+    def set_world_width(self, world_width):
+        self.world_width = max(world_width, self.view_width)
+        self.scroll_to(self.x)
+
+    def scroll_to(self, x):
+        self.x = max(0, min(int(x), self.max_x))
+
+    def scroll_by(self, dx):
+        self.scroll_to(self.x + dx)
+
+    def follow(self, rect):
+        """Centres the view on rect, stopping at the ends of the world."""
+        self.scroll_to(rect.centerx - self.view_width // 2)
+
+    def to_world(self, pos):
+        return (pos[0] + self.x, pos[1])
+
+    def to_screen(self, pos):
+        return (pos[0] - self.x, pos[1])
+
+    def active_rect(self, margin=ACTIVE_MARGIN):
+        """
+        Returns the world region whose objects are updated each tick: the view
+        widened by margin on both sides and with no practical vertical limit,
+        so falling objects keep falling. None when the whole level fits on
+        screen, since then nothing is culled.
+        """
+        if self.max_x == 0:
+            return None
+        return pygame.Rect(self.x - margin, -UNBOUNDED, self.view_width + 2 * margin, 2 * UNBOUNDED)
@@ -0,0 +1,148 @@
+from utils import GRID_SPACING, HORIZONTAL_GRID_OFFSET
+from level_format import normalize_loaded_entries
+from placed_objects import (PlacedWall, PlacedReverseWall, PlacedDiamonds, PlacedFlyer, PlacedSmilyRobot, PlacedSpring,
+                            PlacedStickyBlock, PlacedFallSpikes, PlacedStandSpikes)
+
+CHUNK_COLUMNS = 16  # Grid columns per chunk
+CHUNK_WIDTH = CHUNK_COLUMNS * GRID_SPACING
+STREAM_MARGIN_CHUNKS = 1  # Chunks kept as sprites past either side of the view
+
+# Level keys of the objects stored in chunks, in the order load_level_from_path always created them.
+# The player and door are single objects and always stay as sprites.
+PLACED_KINDS = [
+    ('wall', PlacedWall, 'wall_list'),
+    ('flyer', PlacedFlyer, 'flyer_list'),
+    ('reverse_wall', PlacedReverseWall, 'reverse_wall_list'),
+    ('spring', PlacedSpring, 'spring_list'),
+    ('smily_robot', PlacedSmilyRobot, 'smily_robot_list'),
+    ('diamonds', PlacedDiamonds, 'diamonds_list'),
+    ('sticky_block', PlacedStickyBlock, 'sticky_block_list'),
+    ('fall_spikes', PlacedFallSpikes, 'fall_spikes_list'),
+    ('stand_spikes', PlacedStandSpikes, 'stand_spikes_list'),
+]
+
+def chunk_key(x):
+    """Returns the number of the chunk (a strip CHUNK_COLUMNS grid columns wide) holding world x."""
+    return (x - HORIZONTAL_GRID_OFFSET) // CHUNK_WIDTH
+
+def entry_position(kind, entry):
+    return entry[0] if kind == 'stand_spikes' else entry
+
+def sprite_entry(kind, sprite):
+    """Returns the level entry for a placed sprite: its position, plus the rotation for standing spikes."""
+    if kind == 'stand_spikes':
+        return (sprite.rect.topleft, sprite.rotate)
+    return sprite.rect.topleft
+
+class ChunkedLevel():
+    """
+    Keeps the placed objects of a level in vertical strips ("chunks") and
+    only turns the chunks near the view into Placed* sprites. The rest stay
+    as plain position tuples until the view comes near them again.
+
+    A resident chunk's objects are the sprites in the Placed* class lists,
+    edited as usual. A stored chunk's objects are entries in self.chunks.
+    Each stored entry carries a sequence number, so objects come back in the
+    order they were loaded or placed, and a level whose chunks are all
+    resident keeps its creation order.
+    """
+    def __init__(self):
+        self.chunks = {}  # chunk key -> {kind: [(sequence, entry), ...]} for stored chunks
+        self.resident = set()
+        self.next_sequence = 0
+
+    def clear(self):
+        self.chunks = {}
+        self.resident = set()
+        self.next_sequence = 0
+
+    def store(self, kind, entry, sequence=None):
+        if sequence is None:
+            sequence = self.next_sequence
+            self.next_sequence += 1
+        kinds = self.chunks.setdefault(chunk_key(entry_position(kind, entry)[0]), {})
+        kinds.setdefault(kind, []).append((sequence, entry))
+
+    def load(self, level):
+        """
+        Replaces the stored objects with those of a level dictionary, without
+        creating any sprites. Call stream() to show them.
+        :param level: Level dictionary, as returned by read_level_file().
+        """
+        self.clear()
+        for kind, _, _ in PLACED_KINDS:
+            for entry in normalize_loaded_entries(level.get(kind, []), include_rotation=kind == 'stand_spikes'):
+                self.store(kind, entry)
+
+    def stream(self, view_rect, placed_sprites, images, margin_chunks=STREAM_MARGIN_CHUNKS):
+        """
+        Makes sprites of the chunks within margin_chunks of the view and
+        stores away the ones that fell out of range.
+        :param view_rect: The visible part of the level, in world coordinates.
+        """
+        first = chunk_key(view_rect.left) - margin_chunks
+        last = chunk_key(view_rect.right - 1) + margin_chunks
+        wanted = set(range(first, last + 1))
+        if self.resident - wanted:
+            self.evict(self.resident - wanted)
+        wanted_stored = {key for key in wanted if key in self.chunks}
+        if wanted_stored:
+            self.materialize(wanted_stored, placed_sprites, images)
+        self.resident = wanted
+
+    def make_resident(self, keys, placed_sprites, images):
+        """
+        Turns the given chunks into sprites, for edits (like an undo) out of
+        view. The next stream() stores them away again if they are still out of range.
+        """
+        keys = set(keys) - self.resident
+        if keys & self.chunks.keys():
+            self.materialize(keys, placed_sprites, images)
+        self.resident |= keys
+
+    def materialize(self, keys, placed_sprites, images):
+        """Turns the stored objects of the given chunks into sprites."""
+        chunks = [self.chunks.pop(key) for key in keys if key in self.chunks]
+        for kind, factory, _ in PLACED_KINDS:
+            entries = sorted(entry for kinds in chunks for entry in kinds.get(kind, ()))
+            if kind == 'stand_spikes':
+                for _, (position, rotate) in entries:
+                    factory(position, placed_sprites, images, rotate)
+            else:
+                for _, position in entries:
+                    factory(position, placed_sprites, images)
+
+    def evict(self, keys):
+        """Stores the sprites of the given chunks as entries and removes the sprites."""
+        for kind, placed_class, list_name in PLACED_KINDS:
+            kept = []
+            for sprite in getattr(placed_class, list_name):
+                if chunk_key(sprite.rect.x) in keys:
+                    self.store(kind, sprite_entry(kind, sprite))
+                    sprite.kill()
+                else:
+                    kept.append(sprite)
+            setattr(placed_class, list_name, kept)
+
+    def shift_entries(self, min_x, dx):
+        """Moves the stored objects right of min_x by dx, as GameState.set_world_width() does with the sprites."""
+        stored = [(kind, sequence, entry) for kinds in self.chunks.values()
+                  for kind, entries in kinds.items() for sequence, entry in entries]
+        self.chunks = {}
+        for kind, sequence, entry in stored:
+            x, y = entry_position(kind, entry)
+            if x > min_x:
+                entry = ((x + dx, y), entry[1]) if kind == 'stand_spikes' else (x + dx, y)
+            self.store(kind, entry, sequence)
+
+    def entries_by_kind(self):
+        """
+        Returns every object in the level, resident or stored, as
+        {kind: [entry, ...]} with the same entries as a level file.
+        """
+        level = {}
+        for kind, placed_class, list_name in PLACED_KINDS:
+            entries = [sprite_entry(kind, sprite) for sprite in getattr(placed_class, list_name)]
+            stored = sorted(entry for kinds in self.chunks.values() for entry in kinds.get(kind, ()))
+            level[kind] = entries + [entry for _, entry in stored]
+        return level
@@ -0,0 +1,236 @@
+import pygame
+from utils import SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Kind codes stored per cell in OccupancyGrid
+EMPTY = 0
+WALL = 1
+STICKY_BLOCK = 2
+BOUNDARY = 3
+
+def merge_rects(rects):
+    """
+    Greedily merges rects into as few rectangles as possible without changing the
+    area they cover: rects in the same row that touch or overlap are joined into
+    runs, then runs with the same horizontal extent that touch or overlap
+    vertically are stacked. Duplicate rects collapse into one.
+    :param rects: An iterable of pygame.Rect.
+    :return: A list of new pygame.Rect covering the same pixels.
+    """
+    rows = {}
+    for rect in rects:
+        rows.setdefault((rect.y, rect.height), []).append(rect)
+    runs = []
+    for row_rects in rows.values():
+        row_rects.sort(key=lambda rect: rect.x)
+        current = row_rects[0].copy()
+        for rect in row_rects[1:]:
+            if rect.x <= current.right:
+                current.width = max(current.right, rect.right) - current.x
+            else:
+                runs.append(current)
+                current = rect.copy()
+        runs.append(current)
+
+    columns = {}
+    for run in runs:
+        columns.setdefault((run.x, run.width), []).append(run)
+    merged = []
+    for column_runs in columns.values():
+        column_runs.sort(key=lambda rect: rect.y)
+        current = column_runs[0]
+        for run in column_runs[1:]:
+            if run.y <= current.bottom:
+                current.height = max(current.bottom, run.bottom) - current.y
+            else:
+                merged.append(current)
+                current = run
+        merged.append(current)
+    return merged
+
+def without_bottom_row(rect):
+    """
+    Returns a copy of rect one pixel shorter at the bottom. Sprites are a pixel
+    taller than GRID_SPACING, so one placed on a tile starts a pixel inside it;
+    sideways checks use this so the tile underfoot doesn't count as a wall.
+    """
+    return pygame.Rect(rect.x, rect.y, rect.width, rect.height - 1)
+
+class SolidRect():
+    """A merged block of solid tiles of one kind, used in place of the tile sprites for collision."""
+    def __init__(self, rect, solid_kind):
+        self.rect = rect
+        self.solid_kind = solid_kind
+
+class SpatialHash():
+    """
+    Buckets objects with a .rect into square cells so collision checks only look
+    at the objects sharing a cell with the rect being tested.
+    """
+    def __init__(self, cell_size=GRID_SPACING):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.item_cells = {}
+        self.item_order = {}
+        self.version = 0  # Bumped whenever an item changes cells
+
+    def cells_for_rect(self, rect):
+        """
+        Returns every (col, row) cell key the rect overlaps.
+        :param rect: A pygame.Rect (or anything with x, y, right and bottom).
+        :return: A list of (col, row) tuples.
+        """
+        if rect.width <= 0 or rect.height <= 0:
+            return []
+        left_col = rect.x // self.cell_size
+        right_col = (rect.right - 1) // self.cell_size
+        top_row = rect.y // self.cell_size
+        bottom_row = (rect.bottom - 1) // self.cell_size
+        return [(col, row)
+                for col in range(left_col, right_col + 1)
+                for row in range(top_row, bottom_row + 1)]
+
+    def insert(self, item):
+        cell_keys = self.cells_for_rect(item.rect)
+        for cell_key in cell_keys:
+            self.cells.setdefault(cell_key, []).append(item)
+        self.item_cells[item] = cell_keys
+        self.item_order.setdefault(item, len(self.item_order))
+
+    def remove(self, item):
+        self.remove_from_cells(item)
+        self.item_order.pop(item, None)
+
+    def remove_from_cells(self, item):
+        for cell_key in self.item_cells.pop(item, []):
+            bucket = self.cells[cell_key]
+            bucket.remove(item)
+            if not bucket:
+                del self.cells[cell_key]
+
+    def move(self, item):
+        """
+        Re-buckets an item after its rect has moved. Only touches the cells
+        when the item has actually left or entered one.
+        :return: True if the item changed cells.
+        """
+        if self.cells_for_rect(item.rect) == self.item_cells.get(item):
+            return False
+        self.remove_from_cells(item)
+        self.insert(item)
+        self.version += 1
+        return True
+
+    def clear(self):
+        self.cells = {}
+        self.item_cells = {}
+        self.item_order = {}
+        self.version += 1
+
+    def rebuild(self, items):
+        self.clear()
+        for item in items:
+            self.insert(item)
+
+    def query(self, rect):
+        """
+        Returns the objects whose cells overlap the rect, in insertion order of
+        their first shared cell and without duplicates. The result is a broad
+        phase: callers still run their own rect tests on the candidates.
+        """
+        found = []
+        seen = set()
+        for cell_key in self.cells_for_rect(rect):
+            for item in self.cells.get(cell_key, ()):
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    found.append(item)
+        return found
+
+    def nearby(self, rect):
+        """Returns query(rect) sorted into the order the items were first inserted."""
+        return sorted(self.query(rect), key=self.item_order.__getitem__)
+
+    def collide(self, rect):
+        """Returns the objects whose rect actually overlaps the given rect."""
+        return [item for item in self.query(rect) if rect.colliderect(item.rect)]
+
+    def __len__(self):
+        return len(self.item_cells)
+
+
+class OccupancyGrid():
+    """
+    One byte per grid cell holding the kind code (EMPTY, WALL, STICKY_BLOCK or
+    BOUNDARY) of the solid filling it. Cells line up with the editor placement
+    grid, with a margin around the screen for the off-screen building boundaries.
+    """
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, cell_size=GRID_SPACING):
+        self.cell_size = cell_size
+        self.origin_x = HORIZONTAL_GRID_OFFSET % cell_size - 2 * cell_size
+        self.origin_y = TOP_UI_BOUNDARY_Y_HEIGHT % cell_size - cell_size
+        self.cols = (width + cell_size - self.origin_x) // cell_size + 1
+        self.rows = (height + cell_size - self.origin_y) // cell_size + 1
+        self.cells = bytearray(self.cols * self.rows)
+
+    def clear(self):
+        self.cells = bytearray(self.cols * self.rows)
+
+    def cell_at(self, x, y):
+        return (x - self.origin_x) // self.cell_size, (y - self.origin_y) // self.cell_size
+
+    def mark_rect(self, rect, kind):
+        """
+        Stores kind in every cell whose centre lies inside rect. Tiles are a pixel
+        wider than GRID_SPACING, so this keeps each tile in exactly one cell.
+        """
+        half_cell = self.cell_size // 2
+        left_col, top_row = self.cell_at(rect.x - half_cell + self.cell_size - 1, rect.y - half_cell + self.cell_size - 1)
+        right_col, bottom_row = self.cell_at(rect.right - half_cell - 1, rect.bottom - half_cell - 1)
+        for row in range(max(top_row, 0), min(bottom_row, self.rows - 1) + 1):
+            row_start = row * self.cols
+            for col in range(max(left_col, 0), min(right_col, self.cols - 1) + 1):
+                self.cells[row_start + col] = kind
+
+    def kind_at(self, x, y):
+        """Returns the kind code of the cell containing pixel (x, y); EMPTY off the grid."""
+        col, row = self.cell_at(x, y)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return self.cells[row * self.cols + col]
+        return EMPTY
+
+    def kinds_in_rect(self, rect):
+        """Returns the set of non-empty kind codes in the cells the rect overlaps."""
+        left_col, top_row = self.cell_at(rect.x, rect.y)
+        right_col, bottom_row = self.cell_at(rect.right - 1, rect.bottom - 1)
+        kinds = set()
+        for row in range(max(top_row, 0), min(bottom_row, self.rows - 1) + 1):
+            row_start = row * self.cols
+            for col in range(max(left_col, 0), min(right_col, self.cols - 1) + 1):
+                if self.cells[row_start + col]:
+                    kinds.add(self.cells[row_start + col])
+        return kinds
+
+    def kinds_below(self, rect):
+        """Returns the kinds of solid directly under the bottom edge of rect."""
+        return self.kinds_in_rect(pygame.Rect(rect.x, rect.bottom, rect.width, 1))
+
+    def cell_top(self, y):
+        """Returns the y coordinate of the top edge of the grid row containing y."""
+        return (y - self.origin_y) // self.cell_size * self.cell_size + self.origin_y
+
+    def is_solid(self, x, y):
+        return self.kind_at(x, y) != EMPTY
+
+    def as_array(self):
+        """
+        Returns a rows x cols view of the cells without copying: a NumPy array
+        when NumPy is installed, otherwise a 2-D memoryview.
+        """
+        if np is not None:
+            return np.frombuffer(self.cells, dtype=np.uint8).reshape(self.rows, self.cols)
+        return memoryview(self.cells).cast('B', (self.rows, self.cols))
@@ -0,0 +1,107 @@
+"""
+Undo and redo for the level editor. Each edit is stored as the objects it
+erased and the objects it placed, never as a copy of the level, so the
+history grows with the number of edits rather than the size of the level.
+
+An object is recorded as a (kind, x, y, rotate) entry: its level key, the
+world position of its top-left corner, and the rotation of standing spikes
+(0 for everything else). Everything recorded between begin_stroke() and
+end_stroke(), e.g. one drag of the mouse, becomes a single command.
+Resizing the level is a command of its own, holding the old and new width.
+"""
+UNDO_LIMIT = 500  # Oldest commands are dropped past this many
+
+def sprite_edit_entry(kind, sprite):
+    return (kind, sprite.rect.x, sprite.rect.y, getattr(sprite, 'rotate', 0))
+
+class EditCommand():
+    """One undoable edit: the entries it erased and the entries it placed, in order, or a resize."""
+    def __init__(self):
+        self.erased = []
+        # A dict keeps the order and lets an erase later in the same stroke cancel the placement
+        self.placed = {}
+        self.resize = None  # (old world width, new world width) for a resize of the level
+
+    def is_empty(self):
+        return not self.erased and not self.placed and self.resize is None
+
+    def shift(self, min_x, dx):
+        def shifted(entry):
+            kind, x, y, rotate = entry
+            return (kind, x + dx, y, rotate) if x > min_x else entry
+        self.erased = [shifted(entry) for entry in self.erased]
+        self.placed = {shifted(entry): None for entry in self.placed}
+
+class EditHistory():
+    def __init__(self, limit=UNDO_LIMIT):
+        self.limit = limit
+        self.undo_stack = []
+        self.redo_stack = []
+        self.stroke = None  # Command collecting the current stroke, if one is open
+
+    def clear(self):
+        self.undo_stack = []
+        self.redo_stack = []
+        self.stroke = None
+
+    def begin_stroke(self):
+        self.end_stroke()
+        self.stroke = EditCommand()
+
+    def end_stroke(self):
+        """Closes the current stroke, pushing it as one command if it changed anything."""
+        stroke, self.stroke = self.stroke, None
+        if stroke is not None and not stroke.is_empty():
+            self.undo_stack.append(stroke)
+            del self.undo_stack[:-self.limit]
+            self.redo_stack = []
+
+    def record(self, erased=(), placed=()):
+        """
+        Adds erased and placed entries to the open stroke, or as a command of
+        their own when no stroke is open.
+        """
+        in_stroke = self.stroke is not None
+        if not in_stroke:
+            self.stroke = EditCommand()
+        for entry in erased:
+            if entry in self.stroke.placed:
+                del self.stroke.placed[entry]
+            else:
+                self.stroke.erased.append(entry)
+        for entry in placed:
+            self.stroke.placed[entry] = None
+        if not in_stroke:
+            self.end_stroke()
+
+    def record_resize(self, old_width, new_width):
+        """Adds a resize of the level as a command of its own, closing any open stroke first."""
+        self.begin_stroke()
+        self.stroke.resize = (old_width, new_width)
+        self.end_stroke()
+
+    def undo(self):
+        """
+        Returns the command to undo, or None. The caller removes its placed
+        entries and restores its erased ones, or sets the old width of a resize.
+        """
+        self.end_stroke()
+        if not self.undo_stack:
+            return None
+        command = self.undo_stack.pop()
+        self.redo_stack.append(command)
+        return command
+
+    def redo(self):
+        """Returns the command to apply again, or None."""
+        self.end_stroke()
+        if not self.redo_stack:
+            return None
+        command = self.redo_stack.pop()
+        self.undo_stack.append(command)
+        return command
+
+    def shift_entries(self, min_x, dx):
+        """Moves the recorded entries right of min_x by dx, as GameState.set_world_width() does with the objects."""
+        for command in self.undo_stack + self.redo_stack + ([self.stroke] if self.stroke is not None else []):
+            command.shift(min_x, dx)
@@ -0,0 +1,103 @@
+"""
+Grid-cell helpers behind the editor's placement tools, eraser brushes and selection.
+Cells are (column, row) pairs of the editor grid, see utils.grid_cell(); the
+tools work out which cells they cover here, and main.py turns those into
+placed objects in one batch.
+"""
+import pygame
+from collision import OccupancyGrid, EMPTY, WALL, BOUNDARY
+from utils import GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT
+
+PLACE_TOOLS = ('brush', 'line', 'rectangle', 'fill')  # Placement tools, cycled with T
+ERASER_BRUSHES = ('1x1', '3x3', 'rectangle')  # Eraser brush sizes, cycled with B
+
+def cell_topleft(cell):
+    return (HORIZONTAL_GRID_OFFSET + cell[0] * GRID_SPACING, TOP_UI_BOUNDARY_Y_HEIGHT + cell[1] * GRID_SPACING)
+
+def eraser_brush_cells(cell, brush):
+    """Returns the grid cells a 1x1 or 3x3 eraser brush centred on cell covers."""
+    if brush == '3x3':
+        return [(cell[0] + dx, cell[1] + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)]
+    return [cell]
+
+def cells_in_rect(first_cell, last_cell):
+    """Returns every grid cell in the rectangle with corners first_cell and last_cell."""
+    left, right = sorted((first_cell[0], last_cell[0]))
+    top, bottom = sorted((first_cell[1], last_cell[1]))
+    return [(col, row) for col in range(left, right + 1) for row in range(top, bottom + 1)]
+
+def cells_on_line(first_cell, last_cell):
+    """Returns the grid cells on a straight line between two cells, so a fast drag leaves no gaps."""
+    steps = max(abs(last_cell[0] - first_cell[0]), abs(last_cell[1] - first_cell[1]))
+    if steps == 0:
+        return [first_cell]
+    return [(first_cell[0] + round((last_cell[0] - first_cell[0]) * step / steps),
+             first_cell[1] + round((last_cell[1] - first_cell[1]) * step / steps)) for step in range(steps + 1)]
+
+def build_edit_grid(world_width, row_bounds, boundary_positions, placed_positions):
+    """
+    Returns an OccupancyGrid of the editor grid: EMPTY where a tool may place
+    an object, BOUNDARY outside the grid and on the building outlines, and
+    WALL wherever an object of any kind is already placed.
+    :param row_bounds: (y, left_x, right_x) of each editable grid row, as get_grid_horizontal_bounds() gives them.
+    :param boundary_positions: Top-left corners of the building outline tiles.
+    :param placed_positions: Top-left corners of the placed objects.
+    """
+    grid = OccupancyGrid(world_width)
+    grid.cells = bytearray([BOUNDARY]) * len(grid.cells)
+    for y, left_x, right_x in row_bounds:
+        grid.mark_rect(pygame.Rect(left_x, y, right_x + 1 - left_x, GRID_SPACING), EMPTY)
+    for x, y in boundary_positions:
+        grid.mark_rect(pygame.Rect(x, y, GRID_SPACING, GRID_SPACING), BOUNDARY)
+    for x, y in placed_positions:
+        grid.mark_rect(pygame.Rect(x, y, GRID_SPACING, GRID_SPACING), WALL)
+    return grid
+
+def cell_kind(grid, cell):
+    """Returns the kind code the grid has for a cell, BOUNDARY for cells off the grid altogether."""
+    col, row = grid.cell_at(*cell_topleft(cell))
+    if 0 <= col < grid.cols and 0 <= row < grid.rows:
+        return grid.cells[row * grid.cols + col]
+    return BOUNDARY
+
+def free_cells(grid, cells):
+    """Returns the cells, in order and without repeats, that the grid has EMPTY."""
+    free = []
+    seen = set()
+    for cell in cells:
+        if cell not in seen and cell_kind(grid, cell) == EMPTY:
+            seen.add(cell)
+            free.append(cell)
+    return free
+
+def flood_fill_cells(grid, start_cell):
+    """
+    Returns the EMPTY cells connected to start_cell through their edges, the
+    start included, walking the grid's bytes directly. Empty if start_cell
+    isn't EMPTY itself.
+    """
+    origin_col, origin_row = grid.cell_at(HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT)
+    col, row = start_cell[0] + origin_col, start_cell[1] + origin_row
+    if not (0 <= col < grid.cols and 0 <= row < grid.rows) or grid.cells[row * grid.cols + col] != EMPTY:
+        return []
+    cells, cols = grid.cells, grid.cols
+    filled = bytearray(len(cells))
+    start = row * cols + col
+    filled[start] = 1
+    stack = [start]
+    found = []
+    while stack:
+        index = stack.pop()
+        found.append(index)
+        col = index % cols
+        for neighbour, inside in ((index - cols, index >= cols), (index + cols, index + cols < len(cells)),
+                                  (index - 1, col > 0), (index + 1, col < cols - 1)):
+            if inside and not filled[neighbour] and cells[neighbour] == EMPTY:
+                filled[neighbour] = 1
+                stack.append(neighbour)
+    found.sort()
+    return [(index % cols - origin_col, index // cols - origin_row) for index in found]
+
+def cells_fit(grid, cells):
+    """True if none of the cells lies outside the grid or on a building outline, so objects can go there."""
+    return all(cell_kind(grid, cell) != BOUNDARY for cell in cells)
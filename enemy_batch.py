@@ -0,0 +1,169 @@
+from utils import SCREEN_WIDTH, SCREEN_HEIGHT
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MIN_BATCH_ENEMIES = 32  # Below about this many flyers and robots the per-sprite updates are faster
+
+def batching_available(enemy_count):
+    return np is not None and enemy_count >= MIN_BATCH_ENEMIES
+
+def rect_arrays(rects):
+    """
+    Returns the left, top, right and bottom edges of rects as four int64 arrays.
+    :param rects: A list of pygame.Rect.
+    """
+    edges = np.array([(rect.left, rect.top, rect.right, rect.bottom) for rect in rects], dtype=np.int64)
+    return tuple(edges.reshape(-1, 4).T)
+
+class EnemyBatch():
+    """
+    Moves every PlayFlyer and PlaySmilyRobot in one vectorized step per tick, in
+    place of their own update(). Each step copies positions, velocities and
+    directions out of the sprites into NumPy arrays, applies the same movement
+    and collision rules as the sprite code, and writes the results back, so
+    stomps, restarts and drawing keep working on the sprites themselves.
+    """
+    def __init__(self, flyers, robots, walls, reverse_walls, sticky_blocks, occupancy_grid, world_width=SCREEN_WIDTH):
+        """
+        :param flyers: List of PlayFlyer.
+        :param robots: List of PlaySmilyRobot.
+        :param walls: Objects with a .rect that block movement (merged walls and boundaries).
+        :param reverse_walls: Objects with a .rect that turn enemies around.
+        :param sticky_blocks: Objects with a .rect that block movement (merged sticky blocks).
+        :param occupancy_grid: The filled OccupancyGrid used for robot ground checks.
+        :param world_width: Width of the level; enemies turn around at either end.
+        """
+        self.flyers = flyers
+        self.robots = robots
+        self.reverse_walls = rect_arrays([reverse_wall.rect for reverse_wall in reverse_walls])
+        self.solids = rect_arrays([solid.rect for solid in list(walls) + list(sticky_blocks)])
+        # Flyers turn around once per wall they touch, checking walls, reverse walls, then sticky blocks
+        self.flyer_obstacles = [rect_arrays([wall.rect for wall in walls]), self.reverse_walls,
+                                rect_arrays([sticky_block.rect for sticky_block in sticky_blocks])]
+        self.grid = occupancy_grid
+        self.grid_cells = occupancy_grid.as_array()
+        self.world_width = world_width
+
+    def step(self, active_rect=None):
+        """:param active_rect: World rect outside which enemies are left as they are; None moves them all."""
+        flyers = self.flyers
+        robots = self.robots
+        if active_rect is not None:
+            flyers = [flyer for flyer in flyers if active_rect.colliderect(flyer.rect)]
+            robots = [robot for robot in robots if active_rect.colliderect(robot.rect)]
+        if flyers:
+            self.step_flyers(flyers)
+        if robots:
+            self.step_robots(robots)
+
+    def step_flyers(self, flyers):
+        threshold = flyers[0].WALL_BOUNDARY_THRESHOLD
+        x, y, width, height = rect_arrays([flyer.rect for flyer in flyers])
+        width = width - x
+        height = height - y
+        direction = np.array([flyer.right_or_left for flyer in flyers], dtype=np.int64)
+
+        x += direction
+        for left, top, right, bottom in self.flyer_obstacles:
+            # Only obstacles overlapping a flyer by more than the threshold vertically can turn it
+            in_band = (y[:, None] + height[:, None] > top + threshold) & (y[:, None] < bottom - threshold)
+            for index in np.flatnonzero(in_band.any(axis=0)):
+                hit = in_band[:, index] & (x < right[index]) & (x + width > left[index])
+                direction[hit] *= -1
+                x[hit] += direction[hit]
+        off_screen = (x + width > self.world_width) | (x < 0)
+        direction[off_screen] *= -1
+        x[off_screen] += direction[off_screen]
+
+        for flyer, flyer_x, flyer_direction in zip(flyers, x.tolist(), direction.tolist()):
+            flyer.rect.x = flyer_x
+            flyer.right_or_left = flyer_direction
+            flyer.sprite_direction(flyer.images)
+
+    def step_robots(self, robots):
+        robot_class = type(robots[0])
+        x, y, right, bottom = rect_arrays([robot.rect for robot in robots])
+        width = right - x
+        height = bottom - y
+        speed_x = np.array([robot.speed_x for robot in robots], dtype=np.int64)
+        speed_y = np.array([robot.speed_y for robot in robots], dtype=np.float64)
+
+        # handle_movement
+        x += speed_x
+        at_edge = (x <= 0) | (x + width >= self.world_width)
+        speed_x[at_edge] *= -1
+
+        # check_horizontal_collisions, ignoring the pixel row a robot stands in
+        x += speed_x
+        hits = self.overlaps(x, y, width, height - 1, self.solids)
+        blocked = hits.any(axis=1)
+        left, top, right, bottom = self.solids
+        moving_right = blocked & (speed_x > 0)
+        moving_left = blocked & (speed_x < 0)
+        if moving_right.any():
+            x[moving_right] = np.where(hits, left, np.iinfo(np.int64).max).min(axis=1)[moving_right] - width[moving_right]
+        if moving_left.any():
+            x[moving_left] = np.where(hits, right, np.iinfo(np.int64).min).max(axis=1)[moving_left]
+        speed_x[blocked] *= -1
+
+        # calc_grav
+        on_screen = y < SCREEN_HEIGHT
+        grounded = on_screen & (speed_y >= 0) & self.solid_below(x, y + height, width)
+        speed_y[grounded] = 0
+        y[grounded] = self.cell_tops(y[grounded] + height[grounded]) - height[grounded]
+        speed_y[on_screen & ~grounded] += robot_class.GRAVITY
+        speed_y[~on_screen] = 0
+        x[~on_screen], y[~on_screen] = robot_class.OUT_OF_PLAY_TOPLEFT
+        y = np.trunc(y + speed_y).astype(np.int64)
+
+        # check_vertical_collisions
+        y = np.trunc(y + speed_y).astype(np.int64)
+        hits = self.overlaps(x, y, width, height, self.solids)
+        blocked = hits.any(axis=1)
+        landing = blocked & (speed_y > 0)
+        rising = blocked & (speed_y < 0)
+        if landing.any():
+            y[landing] = np.where(hits, top, np.iinfo(np.int64).max).min(axis=1)[landing] - height[landing]
+        if rising.any():
+            y[rising] = np.where(hits, bottom, np.iinfo(np.int64).min).max(axis=1)[rising]
+        speed_y[landing | rising] = 0
+
+        # handle_reverse_walls
+        reversed_robots = self.overlaps(x, y, width, height, self.reverse_walls).any(axis=1)
+        speed_x[reversed_robots] *= -1
+        x[reversed_robots] += speed_x[reversed_robots]
+
+        for robot, robot_x, robot_y, robot_speed_x, robot_speed_y in zip(robots, x.tolist(), y.tolist(), speed_x.tolist(), speed_y.tolist()):
+            robot.rect.topleft = (robot_x, robot_y)
+            robot.speed_x = robot_speed_x
+            robot.speed_y = robot_speed_y
+            robot.animate()
+
+    def overlaps(self, x, y, width, height, obstacles):
+        """Returns an enemies x obstacles boolean array of which rects overlap (pygame.Rect.colliderect)."""
+        left, top, right, bottom = obstacles
+        return ((x[:, None] < right) & (x[:, None] + width[:, None] > left) &
+                (y[:, None] < bottom) & (y[:, None] + height[:, None] > top) &
+                (width[:, None] > 0) & (height[:, None] > 0))
+
+    def solid_below(self, x, bottom, width):
+        """Vectorized OccupancyGrid.kinds_below: whether any cell under each bottom edge is solid."""
+        cell_size = self.grid.cell_size
+        rows, cols = self.grid_cells.shape
+        row = (bottom - self.grid.origin_y) // cell_size
+        left_col = (x - self.grid.origin_x) // cell_size
+        right_col = (x + width - 1 - self.grid.origin_x) // cell_size
+        solid = np.zeros(len(x), dtype=bool)
+        row_valid = (row >= 0) & (row < rows)
+        for offset in range(int((right_col - left_col).max()) + 1):
+            col = left_col + offset
+            valid = row_valid & (col <= right_col) & (col >= 0) & (col < cols)
+            solid[valid] |= self.grid_cells[row[valid], col[valid]] != 0
+        return solid
+
+    def cell_tops(self, y):
+        cell_size = self.grid.cell_size
+        return (y - self.grid.origin_y) // cell_size * cell_size + self.grid.origin_y
@@ -0,0 +1,330 @@
+"""
+Reading and writing .lvl level files.
+
+Levels are saved as JSON objects:
+
+    {"format": "propeller-level", "version": 1, "world_width": 1484,
+     "player": [[273, 300]], "door": [[411, 300]],
+     "wall": [[250, 366], [273, 366]], ...,
+     "stand_spikes": [{"pos": [296, 343], "rotate": 90}]}
+
+Every object kind ('player', 'door', 'wall', 'flyer', 'reverse_wall',
+'spring', 'smily_robot', 'diamonds', 'sticky_block', 'fall_spikes',
+'stand_spikes') maps to a list of top-left positions; standing spikes also
+carry their rotation. "world_width" is only written for levels wider than
+the screen. Files from before the JSON format are Python dict literals with
+the same keys and are still read.
+
+Large level libraries can use the binary .lvlb encoding instead (see
+write_binary_level_file()); running this module converts files to it.
+read_level_file() tells the two apart by the file's first bytes.
+"""
+import json
+import mmap
+import struct
+import sys
+from array import array
+from ast import literal_eval
+from utils import SCREEN_WIDTH, GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT, MAX_WORLD_WIDTH
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LEVEL_FORMAT = "propeller-level"
+LEVEL_FORMAT_VERSION = 1
+
+# Binary .lvlb layout, all little-endian:
+#   header   BINARY_HEADER: magic, version, world width, grid origin x/y, cell size, grid cols/rows, section count
+#   sections BINARY_SECTION (kind index into LEVEL_KINDS, encoding, entry count), then the data padded to 4 bytes:
+#     ENCODING_POINTS    int32 (x, y) per entry, for the player, the door and anything off the grid
+#     ENCODING_CELLS     uint32 row * cols + col per entry
+#     ENCODING_BITPLANE  one bit per grid cell, row-major and most significant bit first
+#   Standing spikes add one byte per entry, rotation // 90, after their points or cells.
+BINARY_MAGIC = b"LVLB"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHIiiHIIH")
+BINARY_SECTION = struct.Struct("<BBI")
+ENCODING_POINTS, ENCODING_CELLS, ENCODING_BITPLANE = 0, 1, 2
+LEVEL_KINDS = ['player', 'door', 'wall', 'flyer', 'reverse_wall', 'spring', 'smily_robot',
+               'diamonds', 'sticky_block', 'fall_spikes', 'stand_spikes']
+
+def normalize_loaded_entries(entries, include_rotation=False):
+    normalized_entries = []
+    for entry in entries or []:
+        if isinstance(entry, dict):
+            pos = tuple(entry.get('pos', ()))
+            if len(pos) != 2:
+                continue
+            if include_rotation:
+                normalized_entries.append((pos, int(entry.get('rotate', 0)) % 360))
+            else:
+                normalized_entries.append(pos)
+        elif isinstance(entry, (list, tuple)) and len(entry) == 2:
+            pos = tuple(entry)
+            if include_rotation:
+                normalized_entries.append((pos, 0))
+            else:
+                normalized_entries.append(pos)
+    return normalized_entries
+
+def canonicalize_level(level):
+    """
+    Drops repeated objects: the same kind at the same position more than once,
+    which drag painting used to leave behind. The first of each is kept, in
+    its original order; different kinds sharing a cell are left alone.
+    :param level: Level dictionary, as returned by read_level_file().
+    :return: (new level dictionary, number of objects dropped)
+    """
+    canonical = dict(level)
+    dropped = 0
+    for kind in LEVEL_KINDS:
+        if kind not in level:
+            continue
+        has_rotation = kind == 'stand_spikes'
+        seen = set()
+        kept = []
+        for entry in normalize_loaded_entries(level[kind], include_rotation=has_rotation):
+            position = entry[0] if has_rotation else entry
+            if position in seen:
+                dropped += 1
+                continue
+            seen.add(position)
+            kept.append({'pos': entry[0], 'rotate': entry[1]} if has_rotation else entry)
+        canonical[kind] = kept
+    return canonical, dropped
+
+def get_world_width(level):
+    """
+    Returns how wide a level is, in whole grid columns past the screen width
+    and no wider than MAX_WORLD_WIDTH. Levels without a 'world_width' entry
+    were made before scrolling and are exactly screen-wide.
+    """
+    try:
+        extra_columns = (int(level.get('world_width', SCREEN_WIDTH)) - SCREEN_WIDTH) // GRID_SPACING
+    except (TypeError, ValueError):
+        extra_columns = 0
+    return min(SCREEN_WIDTH + max(extra_columns, 0) * GRID_SPACING, MAX_WORLD_WIDTH)
+
+def parse_level(text):
+    """
+    Parses the contents of a .lvl file, JSON or the older dict literal.
+    :return: Dictionary mapping object names ('player', 'wall', ...) to entry lists.
+    :raises SyntaxError, ValueError: If the text isn't a level this version can read.
+    """
+    try:
+        level = json.loads(text)
+    except json.JSONDecodeError:
+        # Legacy files use Python literals (single quotes, tuples), which JSON rejects on the first key
+        level = literal_eval(text)
+        if not isinstance(level, dict):
+            raise ValueError("Level file does not hold a dictionary")
+        return level
+    if not isinstance(level, dict):
+        raise ValueError("Level file does not hold a JSON object")
+    if level.pop("format", LEVEL_FORMAT) != LEVEL_FORMAT:
+        raise ValueError("Not a level file")
+    version = level.pop("version", LEVEL_FORMAT_VERSION)
+    if not isinstance(version, int) or version > LEVEL_FORMAT_VERSION:
+        raise ValueError(f"Level format version {version} is newer than this game supports")
+    return level
+
+def read_level_file(level_path):
+    """
+    Reads a .lvl or .lvlb file into the dictionary of object positions it holds.
+    :param level_path: Path to the level file.
+    :return: Dictionary mapping object names ('player', 'wall', ...) to entry lists.
+    :raises OSError, SyntaxError, ValueError: If the file can't be read or parsed.
+    """
+    with open(level_path, "rb") as open_file:
+        if open_file.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+            return read_binary_level(open_file)
+        open_file.seek(0)
+        return parse_level(open_file.read().decode("utf-8"))
+
+def write_level_file(level_path, level):
+    """
+    Writes a level dictionary (as read_level_file() returns) as a versioned JSON .lvl file.
+    :raises OSError: If the file can't be written.
+    """
+    data = {"format": LEVEL_FORMAT, "version": LEVEL_FORMAT_VERSION}
+    data.update(level)
+    with open(level_path, "w", encoding="utf-8") as open_file:
+        json.dump(data, open_file, separators=(",", ":"))
+
+
+def padded(length):
+    return (length + 3) & ~3
+
+def write_binary_level_file(level_path, level):
+    """
+    Writes a level dictionary as a binary .lvlb file. Objects on the
+    placement grid are stored as grid cell numbers, or as one bit per cell
+    when that is smaller (dense, duplicate-free kinds like floors of walls).
+    Objects in bit planes are read back in grid order rather than the order
+    they were placed.
+    :raises OSError: If the file can't be written.
+    """
+    entries_by_kind = {kind: normalize_loaded_entries(level.get(kind, []), include_rotation=kind == 'stand_spikes')
+                       for kind in LEVEL_KINDS}
+
+    def position(kind, entry):
+        return entry[0] if kind == 'stand_spikes' else entry
+
+    def on_grid(x, y):
+        return (x - HORIZONTAL_GRID_OFFSET) % GRID_SPACING == 0 and (y - TOP_UI_BOUNDARY_Y_HEIGHT) % GRID_SPACING == 0
+
+    grid_positions = [position(kind, entry) for kind in LEVEL_KINDS[2:] for entry in entries_by_kind[kind]
+                      if on_grid(*position(kind, entry))]
+    origin_x = min((x for x, _ in grid_positions), default=HORIZONTAL_GRID_OFFSET)
+    origin_y = min((y for _, y in grid_positions), default=TOP_UI_BOUNDARY_Y_HEIGHT)
+    cols = (max((x for x, _ in grid_positions), default=origin_x) - origin_x) // GRID_SPACING + 1
+    rows = (max((y for _, y in grid_positions), default=origin_y) - origin_y) // GRID_SPACING + 1
+
+    sections = []
+    for kind_index, kind in enumerate(LEVEL_KINDS):
+        entries = entries_by_kind[kind]
+        rotations = kind == 'stand_spikes'
+        if kind_index < 2:
+            grid_entries, points = [], entries
+        else:
+            grid_entries = [entry for entry in entries if on_grid(*position(kind, entry))]
+            points = [entry for entry in entries if not on_grid(*position(kind, entry))]
+        if grid_entries:
+            cells = [(y - origin_y) // GRID_SPACING * cols + (x - origin_x) // GRID_SPACING
+                     for x, y in (position(kind, entry) for entry in grid_entries)]
+            bitplane_size = (rows * cols + 7) // 8
+            if not rotations and len(set(cells)) == len(cells) and bitplane_size < 4 * len(cells):
+                bits = bytearray(bitplane_size)
+                for cell in cells:
+                    bits[cell >> 3] |= 0x80 >> (cell & 7)
+                sections.append((kind_index, ENCODING_BITPLANE, len(cells), bytes(bits)))
+            else:
+                data = array('I', cells)
+                if sys.byteorder == 'big':
+                    data.byteswap()
+                data = data.tobytes()
+                if rotations:
+                    data += bytes(rotate // 90 % 4 for _, rotate in grid_entries)
+                sections.append((kind_index, ENCODING_CELLS, len(cells), data))
+        if points:
+            data = array('i', [coordinate for entry in points for coordinate in position(kind, entry)])
+            if sys.byteorder == 'big':
+                data.byteswap()
+            data = data.tobytes()
+            if rotations:
+                data += bytes(rotate // 90 % 4 for _, rotate in points)
+            sections.append((kind_index, ENCODING_POINTS, len(points), data))
+
+    with open(level_path, "wb") as open_file:
+        open_file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, get_world_width(level),
+                                           origin_x, origin_y, GRID_SPACING, cols, rows, len(sections)))
+        for kind_index, encoding, count, data in sections:
+            open_file.write(BINARY_SECTION.pack(kind_index, encoding, count))
+            open_file.write(data.ljust(padded(len(data)), b"\0"))
+
+def read_binary_level(open_file):
+    """
+    Reads a .lvlb file through a memory map, decoding each section with one
+    NumPy operation when NumPy is installed.
+    :param open_file: The level file, opened in binary mode.
+    :return: Dictionary mapping object names to entry lists, like read_level_file().
+    :raises ValueError: If the file is truncated or from a newer version.
+    """
+    try:
+        buffer = mmap.mmap(open_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (AttributeError, OSError, ValueError):
+        # No mmap on this platform (the web build) or an empty file
+        open_file.seek(0)
+        buffer = open_file.read()
+    try:
+        return decode_binary_level(buffer)
+    except struct.error as exc:
+        raise ValueError(f"Truncated level file: {exc}")
+    finally:
+        if isinstance(buffer, mmap.mmap):
+            try:
+                buffer.close()
+            except BufferError:
+                pass  # A failed decode can leave arrays viewing the map; it closes once they are gone
+
+def decode_binary_level(buffer):
+    """Decodes the bytes of a .lvlb file; the result holds no references into buffer."""
+    magic, version, world_width, origin_x, origin_y, cell_size, cols, rows, section_count = BINARY_HEADER.unpack_from(buffer, 0)
+    if magic != BINARY_MAGIC:
+        raise ValueError("Not a binary level file")
+    if version > BINARY_VERSION:
+        raise ValueError(f"Binary level version {version} is newer than this game supports")
+    level = {kind: [] for kind in LEVEL_KINDS}
+    if world_width > SCREEN_WIDTH:
+        level['world_width'] = world_width
+    offset = BINARY_HEADER.size
+    for _ in range(section_count):
+        kind_index, encoding, count = BINARY_SECTION.unpack_from(buffer, offset)
+        offset += BINARY_SECTION.size
+        if kind_index >= len(LEVEL_KINDS):
+            raise ValueError(f"Unknown object kind {kind_index} in level file")
+        kind = LEVEL_KINDS[kind_index]
+        if encoding == ENCODING_POINTS:
+            size = 8 * count
+            xs, ys = decode_points(buffer, offset, count)
+        elif encoding == ENCODING_CELLS:
+            size = 4 * count
+            xs, ys = cells_to_positions(decode_cells(buffer, offset, count), cols, origin_x, origin_y, cell_size)
+        elif encoding == ENCODING_BITPLANE:
+            size = (rows * cols + 7) // 8
+            xs, ys = cells_to_positions(decode_bitplane(buffer, offset, size, rows * cols), cols, origin_x, origin_y, cell_size)
+        else:
+            raise ValueError(f"Unknown section encoding {encoding} in level file")
+        if kind == 'stand_spikes':
+            rotations = bytes(buffer[offset + size:offset + size + count])
+            size += count
+            level[kind].extend({'pos': (x, y), 'rotate': rotation * 90} for x, y, rotation in zip(xs, ys, rotations))
+        else:
+            level[kind].extend(zip(xs, ys))
+        offset += padded(size)
+        if offset > len(buffer):
+            raise ValueError("Truncated level file")
+    return level
+
+def decode_points(buffer, offset, count):
+    """Returns the x and y lists of count int32 (x, y) pairs."""
+    if np is not None:
+        points = np.frombuffer(buffer, dtype="<i4", count=2 * count, offset=offset)
+        return points[0::2].tolist(), points[1::2].tolist()
+    points = array('i', bytes(buffer[offset:offset + 8 * count]))
+    if sys.byteorder == 'big':
+        points.byteswap()
+    return points[0::2].tolist(), points[1::2].tolist()
+
+def decode_cells(buffer, offset, count):
+    if np is not None:
+        return np.frombuffer(buffer, dtype="<u4", count=count, offset=offset)
+    cells = array('I', bytes(buffer[offset:offset + 4 * count]))
+    if sys.byteorder == 'big':
+        cells.byteswap()
+    return cells
+
+def decode_bitplane(buffer, offset, size, cell_count):
+    """Returns the numbers of the cells whose bit is set."""
+    if np is not None:
+        bits = np.unpackbits(np.frombuffer(buffer, dtype=np.uint8, count=size, offset=offset), count=cell_count)
+        return np.flatnonzero(bits)
+    return [index * 8 + bit for index, byte in enumerate(buffer[offset:offset + size]) if byte
+            for bit in range(8) if byte & (0x80 >> bit)]
+
+def cells_to_positions(cells, cols, origin_x, origin_y, cell_size):
+    """Turns grid cell numbers into the x and y lists of their top-left corners."""
+    if np is not None:
+        cells = np.asarray(cells, dtype=np.int64)
+        return ((cells % cols) * cell_size + origin_x).tolist(), ((cells // cols) * cell_size + origin_y).tolist()
+    return ([cell % cols * cell_size + origin_x for cell in cells],
+            [cell // cols * cell_size + origin_y for cell in cells])
+
+if __name__ == "__main__":
+    # Converts levels to .lvlb next to the originals: python level_format.py levels/*.lvl
+    for source_path in sys.argv[1:]:
+        binary_path = source_path.rsplit(".", 1)[0] + ".lvlb"
+        write_binary_level_file(binary_path, read_level_file(source_path))
+        print("Wrote {}".format(binary_path))
@@ -8,16 +8,29 @@ import sys
 import os
 import copy
 import subprocess
-from ast import literal_eval
 import pygame
 from pygame.constants import RLEACCEL
 from pygame.locals import (KEYDOWN, MOUSEBUTTONDOWN, MOUSEBUTTONUP, K_LEFT,
                            K_RIGHT, QUIT, K_ESCAPE)
-from utils import SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT, FPS, IMAGES, SOUNDS, MOBILE_ACCESSIBILITY_MODE, load_image, load_sound
+from utils import (SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT, FPS, IMAGES, SOUNDS, MOBILE_ACCESSIBILITY_MODE,
+                   WYATT_LABS_FITNESS_SIZE, WYATT_LABS_FITNESS_POS, IDLE_REDRAW_MS, SALESFARCE_PARK_SIZE, MAX_WORLD_WIDTH, get_salesfarce_park_pos, grid_cell, grid_cells_rect, load_sound, load_play_images, load_editor_images,
+                   get_font, render_text, blit_text_glyphs)
 from ui import ClearButton, InfoButton, EraserButton, RestartButton, GridButton, SaveFileButton, LoadFileButton, MainMenuButton
 from start_objects import StartWall, StartReverseWall, StartDiamonds, StartDoor, StartFlyer, StartSmilyRobot, StartSpring, StartPlayer, StartStickyBlock, StartFallSpikes, StartStandSpikes, RotateButton
 from placed_objects import PlacedWall, PlacedReverseWall, PlacedDiamonds, PlacedDoor, PlacedFlyer, PlacedSmilyRobot, PlacedSpring, PlacedStickyBlock, PlacedFallSpikes, PlacedStandSpikes, PlacedPlayer
-from play_objects import PlayWall, PlayReverseWall, PlayFlyer, PlayDiamonds, PlayDoor, PlaySmilyRobot, PlayStickyBlock, PlayStandSpikes, PlayFallSpikes, PlaySpring, PlayPlayer
+from level_format import normalize_loaded_entries, read_level_file, write_level_file, write_binary_level_file, canonicalize_level, get_world_width
+from base_objects import PlacedObject
+from timestep import FixedTimestep, wait_for_events
+from render import DirtyRectTracker, StaticLayer, draw_sprites
+from camera import Camera
+from chunks import ChunkedLevel, PLACED_KINDS, chunk_key, entry_position
+from simulation import PLAY_OBJECT_FACTORIES
+from edit_history import EditHistory, sprite_edit_entry
+from edit_tools import (PLACE_TOOLS, ERASER_BRUSHES, cell_topleft, eraser_brush_cells, cells_in_rect, cells_on_line,
+                        build_edit_grid, free_cells, flood_fill_cells, cells_fit)
+from selection import CellRegion
+from play_objects import (PlayDoor, PlayStandSpikes, PlayPlayer,
+                          set_world_width, is_level_sprite, building_boundary_positions, build_building_boundaries, build_collision_data, restart_play_objects, remove_play_objects, apply_play_rules, update_play_sprites)
 
 try:
     import tkinter as tk
@@ -44,6 +57,15 @@ APP_SCREEN_MAIN_MENU = 0
 APP_SCREEN_GAME = 1
 APP_SCREEN_INFO = 2
 APP_SCREEN_LEVEL_SELECT = 3
+GRID_OVERLAYS = {}  # (grid spacing, world size) -> pre-rendered grid overlay, see get_grid_overlay()
+PLACED_CLASSES = {kind: placed_class for kind, placed_class, _ in PLACED_KINDS}  # Object type -> Placed* class, player and door aside
+OBJECT_CLASSES = {'player': PlacedPlayer, 'door': PlacedDoor, **PLACED_CLASSES}  # Every object type -> Placed* class
+OBJECT_KINDS = {placed_class: kind for kind, placed_class in OBJECT_CLASSES.items()}
+EDITOR_SCROLL_STEP = 4 * GRID_SPACING  # How far one arrow key press or wheel notch scrolls the editor
+EDITOR_RESIZE_COLUMNS = 4  # Grid columns one [ or ] press takes off or adds to the level
+ERASER_BRUSH_COLOR = (255, 60, 60)
+PLACE_TOOL_COLOR = (255, 255, 0)
+SELECTION_COLOR = (0, 200, 255)
 BUILTIN_LEVELS = [
     ("Tutorial", "tutorial.lvl"),
     ("Skyline Sprint", "skyline_sprint.lvl"),
@@ -65,13 +87,13 @@ class MenuButton:
         fill_color = tuple(min(255, c + 18) for c in self.bg_color) if hovered else self.bg_color
         pygame.draw.rect(screen, self.border_color, self.rect, border_radius=18)
         pygame.draw.rect(screen, fill_color, self.rect.inflate(-6, -6), border_radius=14)
-        text_surface = font.render(self.label, True, self.text_color)
+        text_surface = render_text(font, self.label, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         screen.blit(text_surface, text_rect)
 
 
 def draw_text_centered(screen, text, font, color, center):
-    text_surface = font.render(text, True, color)
+    text_surface = render_text(font, text, color)
     text_rect = text_surface.get_rect(center=center)
     screen.blit(text_surface, text_rect)
 
@@ -93,7 +115,7 @@ def draw_wrapped_text(screen, text, font, color, topleft, max_width, line_gap=4)
 
     x, y = topleft
     for line in lines:
-        text_surface = font.render(line, True, color)
+        text_surface = render_text(font, line, color)
         screen.blit(text_surface, (x, y))
         y += text_surface.get_height() + line_gap
     return y
@@ -124,7 +146,7 @@ def draw_main_menu(screen, background, fonts, buttons, mouse_pos):
         button.rect.topleft = pos
         button.draw(screen, fonts["button"], mouse_pos)
 
-    mobile_note = pygame.font.SysFont("Arial", 22).render("* Landscape mode recommended on mobile", True, (255, 240, 186))
+    mobile_note = render_text(get_font('Arial', 22), "* Landscape mode recommended on mobile", (255, 240, 186))
     note_padding_x = 14
     note_padding_y = 8
     note_rect = pygame.Rect(0, 0, mobile_note.get_width() + note_padding_x * 2, mobile_note.get_height() + note_padding_y * 2)
@@ -163,9 +185,9 @@ def draw_info_card(screen, rect, title, body_lines, icon=None, icon_size=(64, 64
         screen.blit(scaled_icon, (content_x, icon_y))
         text_left += icon_size[0] + 16
 
-    title_font = pygame.font.SysFont("Arial", 18, bold=True)
-    body_font = pygame.font.SysFont("Arial", 13)
-    screen.blit(title_font.render(title, True, title_color), (text_left, inner_rect.y + 12))
+    title_font = get_font('Arial', 18, bold=True)
+    body_font = get_font('Arial', 13)
+    screen.blit(render_text(title_font, title, title_color), (text_left, inner_rect.y + 12))
     y = inner_rect.y + 46
     max_width = inner_rect.right - text_left - 18
     for body_line in body_lines:
@@ -184,15 +206,15 @@ def draw_instructions_screen(screen, background):
     inner_rect = panel_rect.inflate(-6, -6)
     pygame.draw.rect(screen, (243, 247, 252), inner_rect, border_radius=24)
 
-    title_font = pygame.font.SysFont("Arial", 34, bold=True)
-    subtitle_font = pygame.font.SysFont("Arial", 18)
-    small_font = pygame.font.SysFont("Arial", 16, bold=True)
-    section_font = pygame.font.SysFont("Arial", 22, bold=True)
+    title_font = get_font('Arial', 34, bold=True)
+    subtitle_font = get_font('Arial', 18)
+    small_font = get_font('Arial', 16, bold=True)
+    section_font = get_font('Arial', 22, bold=True)
     body_color = (55, 68, 84)
 
     draw_text_centered(screen, "Instructions", title_font, (17, 39, 68), (SCREEN_WIDTH // 2, 62))
     draw_text_centered(screen, "Build, test, and beat every level.", subtitle_font, (72, 102, 134), (SCREEN_WIDTH // 2, 96))
-    screen.blit(small_font.render("Click anywhere to go back", True, (115, 126, 141)), (56, 48))
+    screen.blit(render_text(small_font, "Click anywhere to go back", (115, 126, 141)), (56, 48))
 
     controls_rect = pygame.Rect(56, 128, 430, 190)
     editor_rect = pygame.Rect(512, 128, 456, 190)
@@ -227,7 +249,7 @@ def draw_instructions_screen(screen, background):
     pygame.draw.rect(screen, (73, 116, 158), glossary_rect, border_radius=22)
     glossary_inner = glossary_rect.inflate(-6, -6)
     pygame.draw.rect(screen, (236, 243, 250), glossary_inner, border_radius=18)
-    screen.blit(section_font.render("Object Guide", True, (19, 42, 69)), (glossary_inner.x + 18, glossary_inner.y + 12))
+    screen.blit(render_text(section_font, "Object Guide", (19, 42, 69)), (glossary_inner.x + 18, glossary_inner.y + 12))
 
     object_cards = [
         ("Player", "Your spawn point.", IMAGES["spr_player_start"], (58, 100)),
@@ -249,8 +271,8 @@ def draw_instructions_screen(screen, background):
     start_y = glossary_inner.y + 52
     gap_x = 14
     gap_y = 8
-    title_font_small = pygame.font.SysFont("Arial", 11, bold=True)
-    desc_font = pygame.font.SysFont("Arial", 10)
+    title_font_small = get_font('Arial', 11, bold=True)
+    desc_font = get_font('Arial', 10)
 
     for index, (title, desc, icon, icon_size) in enumerate(object_cards):
         col = index % 4
@@ -266,81 +288,15 @@ def draw_instructions_screen(screen, background):
         icon_rect.midleft = (card_rect.x + 14 + icon_rect.width // 2, card_rect.centery)
         screen.blit(scaled_icon, icon_rect)
         text_x = card_rect.x + 64
-        screen.blit(title_font_small.render(title, True, (24, 42, 63)), (text_x, card_rect.y + 6))
+        screen.blit(render_text(title_font_small, title, (24, 42, 63)), (text_x, card_rect.y + 6))
         draw_wrapped_text(screen, desc, desc_font, body_color, (text_x, card_rect.y + 21), card_rect.width - 74, line_gap=0)
 
 
-def create_transparent_surface(width, height):
-    """
-    Creates a transparent surface of the specified size.
-    :param width: Width of the surface.
-    :param height: Height of the surface.
-    :return: A transparent surface.
-    """
-    transparent_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-    transparent_surface.fill((0, 0, 0, 0))  # Fill with complete transparency
-    return transparent_surface
-
 def load_all_assets():
     #Sprites
-    IMAGES['spr_dynamic_object_placeholder'] = create_transparent_surface(24, 24)  # Assuming 24x24 is the size for dynamic object placeholder
-    load_image("sprites/door_closed.png", "spr_door_closed", True)
-    IMAGES['spr_door_closed_start'] = pygame.transform.scale(IMAGES['spr_door_closed'], (48, 72))
-    load_image("sprites/door_open.png", "spr_door_open", True)
-    load_image("sprites/diamond.png", "spr_diamonds", True)
-    IMAGES['spr_diamonds_start'] = pygame.transform.scale(IMAGES['spr_diamonds'], (48, 48))
-    load_image("sprites/wall.png", "spr_wall", True)
-    IMAGES['spr_wall_start'] = pygame.transform.scale(IMAGES['spr_wall'], (48, 48))
-    load_image("sprites/reverse_wall.png", "spr_reverse_wall", True)
-    IMAGES['spr_reverse_wall_start'] = pygame.transform.scale(IMAGES['spr_reverse_wall'], (48, 48))
-    load_image("sprites/flyer.png", "spr_flyer", True)
-    IMAGES['spr_flyer_start'] = pygame.transform.scale(IMAGES['spr_flyer'], (48, 48))
-    load_image("sprites/spring.png", "spr_spring", True)
-    IMAGES['spr_spring_start'] = pygame.transform.scale(IMAGES['spr_spring'], (48, 48))
-    load_image("sprites/smily_robot_1.png", "spr_smily_robot", True)
-    IMAGES['spr_smily_robot_start'] = pygame.transform.scale(IMAGES['spr_smily_robot'], (48, 48))
-    load_image("sprites/smily_robot_2.png", "spr_smily_robot_2", True)
-    load_image("sprites/sticky_block.png", "spr_sticky_block", True)
-    IMAGES['spr_sticky_block_start'] = pygame.transform.scale(IMAGES['spr_sticky_block'], (48, 48))
-    load_image("sprites/fall_spikes.png", "spr_fall_spikes", True)
-    IMAGES['spr_fall_spikes_start'] = pygame.transform.scale(IMAGES['spr_fall_spikes'], (48, 48))
-    load_image("sprites/stand_spikes.png", "spr_stand_spikes_0_degrees", True)
-    IMAGES['spr_stand_spikes_90_degrees'] = pygame.transform.rotate(IMAGES["spr_stand_spikes_0_degrees"], -90)
-    IMAGES['spr_stand_spikes_180_degrees'] = pygame.transform.rotate(IMAGES["spr_stand_spikes_0_degrees"], -180)
-    IMAGES['spr_stand_spikes_270_degrees'] = pygame.transform.rotate(IMAGES["spr_stand_spikes_0_degrees"], -270)
-    IMAGES['spr_stand_spikes_0_degrees_start'] = pygame.transform.scale(IMAGES['spr_stand_spikes_0_degrees'], (48, 48))
-    IMAGES['spr_stand_spikes_90_degrees_start'] = pygame.transform.scale(IMAGES['spr_stand_spikes_90_degrees'], (48,48))
-    IMAGES['spr_stand_spikes_180_degrees_start'] = pygame.transform.scale(IMAGES['spr_stand_spikes_180_degrees'], (48,48))
-    IMAGES['spr_stand_spikes_270_degrees_start'] = pygame.transform.scale(IMAGES['spr_stand_spikes_270_degrees'], (48,48))
-    load_image("sprites/player.png", "spr_player", True)
-    IMAGES['spr_player_start'] = pygame.transform.scale(IMAGES['spr_player'], (40, 72))
-    load_image("sprites/player_propeller.png", "spr_player_propeller", True)
-    load_image("sprites/play_button.png", "spr_play_button", True)
-    load_image("sprites/stop_button.png", "spr_stop_button", True)
-    load_image("sprites/clear.png", "spr_clear_button", True)
-    load_image("sprites/info_button.png", "spr_info_button", True)
-    load_image("sprites/grid_button.png", "spr_grid_button", True)
-    load_image("sprites/restart.png", "spr_restart_button", True)
-    load_image("sprites/save_file.png", "spr_save_file_button", True)
-    load_image("sprites/load_file.png", "spr_load_file_button", True)
-    load_image("sprites/rotate.png", "spr_rotate_button", True)
-    load_image("sprites/grid.png", "spr_grid", True)
-    load_image("sprites/eraser_not_selected_button.png", "spr_eraser_not_selected_button", True)
-    load_image("sprites/eraser_selected_button.png", "spr_eraser_selected_button", True)
-    load_image("sprites/eraser_cursor.png", "spr_eraser_cursor", True)
-    
-    load_image("sprites/blue_left_arrow.png", "spr_blue_left_arrow", True)
-    load_image("sprites/blue_left_arrow_active.png", "spr_blue_left_arrow_active", True)
-
-    load_image("sprites/blue_right_arrow.png", "spr_blue_right_arrow", True)
-    load_image("sprites/blue_right_arrow_active.png", "spr_blue_right_arrow_active", True)
+    load_play_images()
+    load_editor_images()
 
-    load_image("sprites/jump_button.png", "spr_jump_button", True)
-    load_image("sprites/jump_button_active.png", "spr_jump_button_active", True)
-
-
-
-    
     #SOUNDS
     load_sound("sounds/propeller.wav", "snd_propeller")
     SOUNDS["snd_propeller"].set_volume(.15)
@@ -386,47 +342,78 @@ def draw_yellow_outline(screen, sprite_or_image, position, thickness=2):
     pygame.draw.rect(screen, pygame.Color('yellow'), outline_rect, thickness)
 
 
-def draw_building_facades(screen, building_surfaces):
+def draw_building_facades(screen, building_surfaces, grid_spacing=GRID_SPACING, special_flags=0):
     """Redraw non-playable building facades on top of the grid in edit mode."""
     # Wyatt Labs Fitness: redraw the building body below the rooftop deck.
     wl_surf, wl_pos = building_surfaces[0]
-    wl_facade_top = int(wl_surf.get_height() * 0.31) + Grid.GRID_SPACING
+    wl_facade_top = int(wl_surf.get_height() * 0.31) + grid_spacing
     wl_facade = wl_surf.subsurface((0, wl_facade_top, wl_surf.get_width(), wl_surf.get_height() - wl_facade_top))
-    screen.blit(wl_facade, (wl_pos[0], wl_pos[1] + wl_facade_top))
+    screen.blit(wl_facade, (wl_pos[0], wl_pos[1] + wl_facade_top), special_flags=special_flags)
 
     # Salesfarce Park: redraw the tower body below the rooftop park.
     sf_surf, sf_pos = building_surfaces[1]
-    sf_facade_top = int(sf_surf.get_height() * 0.50) + Grid.GRID_SPACING
+    sf_facade_top = int(sf_surf.get_height() * 0.50) + grid_spacing
     sf_facade = sf_surf.subsurface((0, sf_facade_top, sf_surf.get_width(), sf_surf.get_height() - sf_facade_top))
-    screen.blit(sf_facade, (sf_pos[0], sf_pos[1] + sf_facade_top))
+    screen.blit(sf_facade, (sf_pos[0], sf_pos[1] + sf_facade_top), special_flags=special_flags)
 
     # Redraw the tiny non-playable strip at the left side of the Salesfarce facade.
-    sf_left_strip_width = Grid.GRID_SPACING
+    sf_left_strip_width = grid_spacing
     sf_left_strip = sf_surf.subsurface((0, sf_facade_top, sf_left_strip_width, sf_surf.get_height() - sf_facade_top))
-    screen.blit(sf_left_strip, (sf_pos[0], sf_pos[1] + sf_facade_top))
+    screen.blit(sf_left_strip, (sf_pos[0], sf_pos[1] + sf_facade_top), special_flags=special_flags)
 
 
-def remove_placed_object(placed_sprites, mouse_pos, game_state):
-    # Iterate over all lists except the player list, which is handled separately now.
-    for placed_item_list in (PlacedWall.wall_list, PlacedFlyer.flyer_list,
-                             PlacedSpring.spring_list, PlacedDiamonds.diamonds_list, PlacedReverseWall.reverse_wall_list,
-                             PlacedSmilyRobot.smily_robot_list, PlacedStickyBlock.sticky_block_list,
-                             PlacedFallSpikes.fall_spikes_list, PlacedStandSpikes.stand_spikes_list):
-        for placed_item in placed_item_list:
-            if placed_item.rect.collidepoint(mouse_pos):
-                placed_sprites.remove(placed_item)
-                placed_item_list.remove(placed_item)
-
-    # Check if the placed player exists and if the mouse position collides with it.
-    if game_state.placed_player and game_state.placed_player.rect.collidepoint(mouse_pos):
-        placed_sprites.remove(game_state.placed_player)
-        game_state.placed_player = None  # Directly set the player to None since it's no longer a list.
-    if game_state.placed_door and game_state.placed_door.rect.collidepoint(mouse_pos):
-        placed_sprites.remove(game_state.placed_door)
-        game_state.placed_door = None  # Directly set the player to None since it's no longer a list.
+def remove_placed_objects(placed_sprites, cells, game_state):
+    """
+    Erases every placed object in the given grid cells in one batch, found
+    through PlacedObject.cell_index, and records the erase for undo.
+    :param cells: Iterable of (column, row) grid cells, see utils.grid_cell().
+    """
+    erased = PlacedObject.placed_in_cells(cells)
+    if erased:
+        game_state.edit_history.record(erased=[sprite_edit_entry(OBJECT_KINDS[type(sprite)], sprite) for sprite in erased])
+        remove_placed_sprites(placed_sprites, erased, game_state)
+    return placed_sprites
 
+def remove_placed_sprites(placed_sprites, erased, game_state):
+    """
+    Removes the given placed sprites in one batch: each class list they
+    belong to is rebuilt once and the group drops them all in a single call.
+    """
+    erased_set = set(erased)
+    erased_classes = {type(sprite) for sprite in erased}
+    for _, placed_class, list_name in PLACED_KINDS:
+        if placed_class in erased_classes:
+            setattr(placed_class, list_name, [sprite for sprite in getattr(placed_class, list_name) if sprite not in erased_set])
+    # The player and door are single objects rather than lists
+    if game_state.placed_player in erased_set:
+        game_state.placed_player = None
+    if game_state.placed_door in erased_set:
+        game_state.placed_door = None
+    placed_sprites.remove(*erased)
     return placed_sprites
 
+def create_placed_objects(placed_sprites, entries, game_state):
+    """
+    Creates placed objects from (kind, x, y, rotate) entries, see
+    edit_history, and adds them all to placed_sprites in one call.
+    """
+    created = []
+    for kind, x, y, rotate in entries:
+        if kind == 'player':
+            sprite = game_state.placed_player = PlacedPlayer((x, y), None, IMAGES)
+        elif kind == 'door':
+            sprite = game_state.placed_door = PlacedDoor((x, y), None, IMAGES)
+        elif kind == 'stand_spikes':
+            sprite = PlacedStandSpikes((x, y), None, IMAGES, rotate)
+        else:
+            sprite = PLACED_CLASSES[kind]((x, y), None, IMAGES)
+        created.append(sprite)
+    placed_sprites.add(*created)
+    return created
+
+def remove_placed_object(placed_sprites, mouse_pos, game_state):
+    """Erases whatever is placed in the grid cell under mouse_pos, a world position."""
+    return remove_placed_objects(placed_sprites, [grid_cell(mouse_pos)], game_state)
 
 def restart_start_objects(start, start_positions):
     start.player.rect.topleft = start_positions['player']
@@ -443,7 +430,7 @@ def restart_start_objects(start, start_positions):
     return start
 
 def get_notification_font():
-    return pygame.font.SysFont('Arial', 14)
+    return get_font('Arial', 14)
 
 def save_load_enabled():
     return not ITCH_MODE
@@ -503,7 +490,7 @@ def choose_save_file_path():
             initialdir=LEVELS_DIR,
             initialfile=DEFAULT_LEVEL_FILENAME,
             defaultextension=".lvl",
-            filetypes=[("Level files", "*.lvl"), ("All files", "*.*")],
+            filetypes=[("Level files", "*.lvl *.lvlb"), ("All files", "*.*")],
         )
     finally:
         if root:
@@ -523,7 +510,7 @@ def choose_load_file_path():
             title="Load Level",
             initialdir=LEVELS_DIR,
             defaultextension=".lvl",
-            filetypes=[("Level files", "*.lvl"), ("All files", "*.*")],
+            filetypes=[("Level files", "*.lvl *.lvlb"), ("All files", "*.*")],
         )
     finally:
         if root:
@@ -540,25 +527,6 @@ def notify(game_state, text, duration=2, color=(0, 255, 0)):
         color,
     )
 
-def normalize_loaded_entries(entries, include_rotation=False):
-    normalized_entries = []
-    for entry in entries or []:
-        if isinstance(entry, dict):
-            pos = tuple(entry.get('pos', ()))
-            if len(pos) != 2:
-                continue
-            if include_rotation:
-                normalized_entries.append((pos, int(entry.get('rotate', 0)) % 360))
-            else:
-                normalized_entries.append(pos)
-        elif isinstance(entry, (list, tuple)) and len(entry) == 2:
-            pos = tuple(entry)
-            if include_rotation:
-                normalized_entries.append((pos, 0))
-            else:
-                normalized_entries.append(pos)
-    return normalized_entries
-
 def get_default_level_path():
     os.makedirs(LEVELS_DIR, exist_ok=True)
     return DEFAULT_LEVEL_PATH
@@ -569,13 +537,17 @@ def load_level_from_path(level_path, placed_sprites, game_state, announce_succes
         return placed_sprites
 
     try:
-        with open(level_path, "r", encoding="utf-8") as open_file:
-            loaded_dict = literal_eval(open_file.read())
+        loaded_dict = read_level_file(level_path)
     except (OSError, SyntaxError, ValueError) as exc:
         notify(game_state, f"Load failed: {exc}", 3)
         return placed_sprites
 
+    loaded_dict, duplicate_count = canonicalize_level(loaded_dict)
+    if duplicate_count:
+        print(f"Dropped {duplicate_count} duplicate objects from {os.path.basename(level_path)}")
+
     remove_all_placed(game_state)
+    game_state.set_world_width(get_world_width(loaded_dict))
 
     player_positions = normalize_loaded_entries(loaded_dict.get('player', []))
     door_positions = normalize_loaded_entries(loaded_dict.get('door', []))
@@ -584,23 +556,9 @@ def load_level_from_path(level_path, placed_sprites, game_state, announce_succes
     if door_positions:
         game_state.placed_door = PlacedDoor(door_positions[0], placed_sprites, IMAGES)
 
-    object_factories = {
-        'wall': PlacedWall,
-        'flyer': PlacedFlyer,
-        'reverse_wall': PlacedReverseWall,
-        'spring': PlacedSpring,
-        'smily_robot': PlacedSmilyRobot,
-        'diamonds': PlacedDiamonds,
-        'sticky_block': PlacedStickyBlock,
-        'fall_spikes': PlacedFallSpikes,
-    }
-
-    for object_name, factory in object_factories.items():
-        for position in normalize_loaded_entries(loaded_dict.get(object_name, [])):
-            factory(position, placed_sprites, IMAGES)
-
-    for position, rotate in normalize_loaded_entries(loaded_dict.get('stand_spikes', []), include_rotation=True):
-        PlacedStandSpikes(position, placed_sprites, IMAGES, rotate)
+    # Everything else is kept as chunk data; only the chunks around the view become sprites
+    game_state.level_chunks.load(loaded_dict)
+    game_state.level_chunks.stream(game_state.camera.view_rect, placed_sprites, IMAGES)
 
     if announce_success:
         notify(game_state, f"Loaded {os.path.basename(level_path)}", 2)
@@ -624,12 +582,14 @@ def save_file(game_state):
         notify(game_state, "Save cancelled", 2, (255, 255, 0))
         return
 
-    if not level_path.endswith(".lvl"):
+    if not level_path.endswith((".lvl", ".lvlb")):
         level_path = f"{level_path}.lvl"
 
     try:
-        with open(level_path, "w", encoding="utf-8") as save_file_name:
-            save_file_name.write(str(get_dict_rect_positions(game_state)))
+        if level_path.endswith(".lvlb"):
+            write_binary_level_file(level_path, get_dict_rect_positions(game_state))
+        else:
+            write_level_file(level_path, get_dict_rect_positions(game_state))
     except OSError as exc:
         notify(game_state, f"Save failed: {exc}", 3)
         return
@@ -679,28 +639,23 @@ def draw_grid(screen, grid_spacing, screen_width, screen_height, top_ui_boundary
         pygame.draw.line(screen, grid_color, (left_x, y_position), (right_x, y_position))
 
 
-
-class BoundaryWall(pygame.sprite.Sprite):
-    """Invisible wall sprite for building collision (top surface + inner sides)."""
-    boundary_list = []
-
-    def __init__(self, x, y, play_sprites):
-        pygame.sprite.Sprite.__init__(self)
-        self.image = pygame.Surface((GRID_SPACING, GRID_SPACING), pygame.SRCALPHA)
-        self.image.fill((0, 0, 0, 0))  # Transparent
-        self.rect = self.image.get_rect()
-        self.rect.topleft = (x, y)
-        play_sprites.add(self)
-        PlayWall.wall_list.append(self)
-        BoundaryWall.boundary_list.append(self)
-
-    def kill(self):
-        if self in BoundaryWall.boundary_list:
-            BoundaryWall.boundary_list.remove(self)
-        super().kill()
-
-    def restart(self):
-        pass
+def get_grid_overlay(building_surfaces, grid_spacing=GRID_SPACING, world_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+    """
+    Returns the edit grid for the whole level with the building facades
+    covering it, rendered once per grid spacing and level size onto a
+    premultiplied-alpha surface. Draw it with special_flags=pygame.BLEND_PREMULTIPLIED.
+    """
+    key = (grid_spacing, world_size)
+    if key not in GRID_OVERLAYS:
+        # Only the current level size is kept; wide overlays are several megabytes each
+        GRID_OVERLAYS.clear()
+        overlay = pygame.Surface(world_size, pygame.SRCALPHA)
+        draw_grid(overlay, grid_spacing, world_size[0] + grid_spacing, world_size[1], TOP_UI_BOUNDARY_Y_HEIGHT, HORIZONTAL_GRID_OFFSET, top_extra_cols=10, top_extra_rows=11, top_extra_cols_left=10)
+        # The facades are semi-transparent, so compose them premultiplied to blend like drawing them straight onto the screen
+        premultiplied_surfaces = [(surface.premul_alpha(), position) for surface, position in building_surfaces]
+        draw_building_facades(overlay, premultiplied_surfaces, grid_spacing, special_flags=pygame.BLEND_PREMULTIPLIED)
+        GRID_OVERLAYS[key] = overlay
+    return GRID_OVERLAYS[key]
 
 
 class ArrowButton(pygame.sprite.Sprite):
@@ -888,21 +843,31 @@ class NotificationManager:
         self.messages = []
 
     def add_message(self, text, duration, position, font, color=(255, 0, 0)):
-        """ Adds a message to the queue. Duration in seconds. """
-        message = {'text': text, 'duration': duration, 'position': position, 'font': font, 'color': color, 'start_time': pygame.time.get_ticks()}
+        """ Adds a message to the queue. Duration in seconds. The text is rendered once, here. """
+        message = {'text': text, 'duration': duration, 'position': position, 'font': font, 'color': color, 'start_time': pygame.time.get_ticks(),
+                   'surface': render_text(font, text, color)}
         self.messages.append(message)
 
     def draw_messages(self, screen):
-        """ Draws all messages that are still active. """
+        """ Draws all messages that are still active. Returns (message, rect) for each one drawn. """
         current_time = pygame.time.get_ticks()
         active_messages = []
+        drawn = []
         for message in self.messages:
             if current_time - message['start_time'] < message['duration'] * 1000:  # Convert seconds to milliseconds
-                text_surface = message['font'].render(message['text'], True, message['color'])
-                text_rect = text_surface.get_rect(center=message['position'])
-                screen.blit(text_surface, text_rect)
+                text_rect = message['surface'].get_rect(center=message['position'])
+                screen.blit(message['surface'], text_rect)
                 active_messages.append(message)  # Keep this message for the next frame
+                drawn.append((message, text_rect))
         self.messages = active_messages  # Only keep active messages
+        return drawn
+
+    def next_expiry_ms(self):
+        """ Milliseconds until the next message expires, or None if there are no messages. """
+        if not self.messages:
+            return None
+        current_time = pygame.time.get_ticks()
+        return max(0, min(message['start_time'] + message['duration'] * 1000 for message in self.messages) - current_time)
 
 class GameState:
     EDIT_MODE, PLAY_MODE = 0, 1
@@ -930,6 +895,7 @@ class GameState:
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.clock = pygame.time.Clock()
+        self.play_timestep = FixedTimestep()
         self.grid_sprites = pygame.sprite.Group()
         self.start_sprites = pygame.sprite.Group()
         self.play_sprites = pygame.sprite.Group()
@@ -939,6 +905,11 @@ class GameState:
         self.start = Start(self.start_sprites, self.START_POSITIONS)
         self.game_mode = GameState.EDIT_MODE
         self.mouse_pos = (0, 0)
+        self.world_width = SCREEN_WIDTH
+        self.camera = Camera(self.world_width)
+        self.level_chunks = ChunkedLevel()
+        self.edit_camera_x = 0  # Where the editor view was when play mode started
+        self.building_surfaces = []  # (surface, world position) of Wyatt Labs Fitness and Salesfarce Park, set in main()
         
         self.jump_key_released = True 
         
@@ -954,6 +925,17 @@ class GameState:
         self.is_an_object_currently_being_dragged = False
         
         self.eraser_mode_active = False
+        self.eraser_brush = ERASER_BRUSHES[0]
+        self.eraser_anchor = None  # Grid cell where a rectangle erase started
+        self.last_erased_cell = None  # Brush cell of the previous erase in the current drag
+        self.edit_history = EditHistory()
+        self.place_tool = PLACE_TOOLS[0]
+        self.place_anchor = None  # Grid cell where a line or rectangle being placed started
+        self.select_mode = False  # Marquee selection instead of placing or erasing, toggled with S
+        self.selection = None  # (top-left cell, bottom-right cell) of the selected region
+        self.select_anchor = None  # Grid cell where a marquee being dragged out started
+        self.move_from = None  # Grid cell where dragging the selection to move it started
+        self.clipboard = None  # CellRegion copied with Ctrl+C
         self.init_ui_elements()
         
         # Initialize mouse and movement states
@@ -1030,8 +1012,8 @@ class GameState:
     def get_grid_horizontal_bounds(self, y_pos):
         in_top_rows = y_pos < GameState.TOP_UI_BOUNDARY_Y_HEIGHT + 11 * Grid.GRID_SPACING
         left_bound = GameState.HORIZONTAL_GRID_OFFSET - 10 * Grid.GRID_SPACING if in_top_rows else GameState.HORIZONTAL_GRID_OFFSET
-        # Match the effective width used by draw_grid(..., SCREEN_WIDTH + Grid.GRID_SPACING, ...)
-        drawable_width = (SCREEN_WIDTH + Grid.GRID_SPACING) - 2 * GameState.HORIZONTAL_GRID_OFFSET
+        # Match the effective width used by draw_grid(..., world_width + Grid.GRID_SPACING, ...)
+        drawable_width = (self.world_width + Grid.GRID_SPACING) - 2 * GameState.HORIZONTAL_GRID_OFFSET
         num_complete_vertical_cells = drawable_width // Grid.GRID_SPACING
         base_right = GameState.HORIZONTAL_GRID_OFFSET + num_complete_vertical_cells * Grid.GRID_SPACING - 1
         if in_top_rows:
@@ -1039,12 +1021,295 @@ class GameState:
         else:
             right_bound = base_right
         return left_bound, right_bound
-        
+
+    def set_world_width(self, world_width):
+        """
+        Resizes the level being edited. Salesfarce Park stays at the right end
+        of the level, so anything placed on its rooftop moves out with it.
+        :param world_width: SCREEN_WIDTH plus a whole number of grid columns.
+        """
+        shift = world_width - self.world_width
+        if shift:
+            _, field_right = self.get_grid_horizontal_bounds(SCREEN_HEIGHT)
+            for sprite in self.placed_sprites.sprites():
+                if sprite.rect.left > field_right:
+                    sprite.move_by(shift, 0)
+            self.level_chunks.shift_entries(field_right, shift)
+            self.edit_history.shift_entries(field_right, shift)
+        self.world_width = world_width
+        self.camera.set_world_width(world_width)
+        if self.building_surfaces:
+            self.building_surfaces[1] = (self.building_surfaces[1][0], get_salesfarce_park_pos(world_width))
+
+    def scroll_editor(self, dx):
+        """Scrolls the editor view within the level; resize_level() is what changes its width."""
+        self.camera.scroll_by(dx)
+
+    def resize_level(self, columns):
+        """
+        Widens the level by a number of grid columns, or narrows it when
+        columns is negative, as one undoable edit. Only empty columns at the
+        right end of the playing field can be taken off.
+        """
+        world_width = min(max(self.world_width + columns * Grid.GRID_SPACING, SCREEN_WIDTH), MAX_WORLD_WIDTH)
+        if world_width == self.world_width:
+            return
+        font = get_font('Arial', 14)
+        if world_width < self.world_width and not self.are_last_columns_empty(self.world_width - world_width):
+            self.notification_manager.add_message("Clear the last columns first", 1, (SCREEN_WIDTH-80, 100), font, (255, 255, 0))
+            return
+        self.edit_history.record_resize(self.world_width, world_width)
+        self.set_world_width(world_width)
+        self.notification_manager.add_message("Level Width: {}".format(world_width), 1, (SCREEN_WIDTH-80, 100), font)
+
+    def are_last_columns_empty(self, width):
+        """Returns whether nothing, resident or stored in chunks, is in the last width pixels of the playing field."""
+        _, field_right = self.get_grid_horizontal_bounds(SCREEN_HEIGHT)
+        positions = [sprite.rect.topleft for sprite in (self.placed_player, self.placed_door) if sprite is not None]
+        positions += [entry_position(kind, entry) for kind, entries in self.level_chunks.entries_by_kind().items() for entry in entries]
+        return not any(field_right - width < x <= field_right for x, _ in positions)
+
     def is_object_at_position(self, position):
-        for sprite in self.placed_sprites:
-            if sprite.rect.topleft == position:
-                return True
-        return False
+        return PlacedObject.placed_at(position) is not None
+
+    def apply_edit(self, erase_entries, place_entries):
+        """Removes the objects of erase_entries and creates those of place_entries, each as one batch."""
+        self.level_chunks.make_resident({chunk_key(x) for _, x, _, _ in erase_entries + place_entries}, self.placed_sprites, IMAGES)
+        erased = []
+        for kind, x, y, _ in erase_entries:
+            sprite = OBJECT_CLASSES[kind].placed_at((x, y))
+            if sprite is not None:
+                erased.append(sprite)
+        remove_placed_sprites(self.placed_sprites, erased, self)
+        create_placed_objects(self.placed_sprites, place_entries, self)
+
+    def undo(self):
+        command = self.edit_history.undo()
+        if command is not None and command.resize is not None:
+            self.set_world_width(command.resize[0])
+        elif command is not None:
+            self.apply_edit(list(command.placed), command.erased)
+
+    def redo(self):
+        command = self.edit_history.redo()
+        if command is not None and command.resize is not None:
+            self.set_world_width(command.resize[1])
+        elif command is not None:
+            self.apply_edit(command.erased, list(command.placed))
+
+    def cycle_place_tool(self):
+        self.place_tool = PLACE_TOOLS[(PLACE_TOOLS.index(self.place_tool) + 1) % len(PLACE_TOOLS)]
+        self.place_anchor = None
+        font = get_font('Arial', 14)
+        self.notification_manager.add_message("Place Tool: " + self.place_tool, 1, (SCREEN_WIDTH-80, 100), font)
+
+    def uses_place_tool(self):
+        """True when the selected object goes down with the line, rectangle or fill tool rather than the brush."""
+        return self.place_tool != 'brush' and self.selected_object_type not in (None, 'player', 'door')
+
+    def build_edit_grid(self):
+        """
+        Returns an OccupancyGrid of where the placement tools may put objects:
+        inside get_grid_horizontal_bounds(), off the building outlines and
+        away from every object already in the level, stored chunks included.
+        """
+        row_bounds = []
+        y = GameState.TOP_UI_BOUNDARY_Y_HEIGHT
+        while y < SCREEN_HEIGHT - GameState.BOTTOM_Y_GRID_OFFSET:
+            row_bounds.append((y, *self.get_grid_horizontal_bounds(y)))
+            y += Grid.GRID_SPACING
+        placed_positions = [entry_position(kind, entry)
+                            for kind, entries in self.level_chunks.entries_by_kind().items() for entry in entries]
+        placed_positions += [sprite.rect.topleft for sprite in (self.placed_player, self.placed_door) if sprite is not None]
+        return build_edit_grid(self.world_width, row_bounds, building_boundary_positions(self.world_width), placed_positions)
+
+    def start_place_tool(self, world_pos):
+        """Fills the empty area around world_pos with the fill tool, or starts a line or rectangle there."""
+        cell = grid_cell(world_pos)
+        if self.place_tool == 'fill':
+            self.place_cells(flood_fill_cells(self.build_edit_grid(), cell))
+        elif self.place_anchor is None:
+            self.place_anchor = cell
+
+    def finish_place_tool(self, world_pos):
+        """Places the line or rectangle dragged out from the anchor cell to world_pos, skipping cells already taken."""
+        if self.place_anchor is not None:
+            cell = grid_cell(world_pos)
+            if self.place_tool == 'line':
+                cells = cells_on_line(self.place_anchor, cell)
+            else:
+                cells = cells_in_rect(self.place_anchor, cell)
+            self.place_anchor = None
+            self.place_cells(free_cells(self.build_edit_grid(), cells))
+
+    def place_cells(self, cells):
+        """Places the selected object in every given cell as one batch, undone as one step."""
+        rotate = self.rotate_button.current_stand_spikes_rotate if self.selected_object_type == 'stand_spikes' else 0
+        entries = [(self.selected_object_type, *cell_topleft(cell), rotate) for cell in cells]
+        if entries:
+            self.level_chunks.make_resident({chunk_key(x) for _, x, _, _ in entries}, self.placed_sprites, IMAGES)
+            create_placed_objects(self.placed_sprites, entries, self)
+            self.edit_history.record(placed=entries)
+
+    def place_tool_rects(self):
+        """Returns the world rects of the cells the line or rectangle being dragged out covers."""
+        if self.place_anchor is None:
+            return []
+        cell = grid_cell(self.camera.to_world(self.mouse_pos))
+        if self.place_tool == 'line':
+            return [grid_cells_rect(line_cell, line_cell) for line_cell in cells_on_line(self.place_anchor, cell)]
+        return [grid_cells_rect(self.place_anchor, cell)]
+
+    def toggle_select_mode(self):
+        self.select_mode = not self.select_mode
+        self.selection = self.select_anchor = self.move_from = None
+        if self.select_mode:
+            if self.eraser_mode_active:
+                self.toggle_eraser_mode()
+            self.selected_object_type = None
+            self.start.dynamic_object_placeholder.reset()
+        font = get_font('Arial', 14)
+        self.notification_manager.add_message("Select Mode: " + ("On" if self.select_mode else "Off"), 1, (SCREEN_WIDTH-80, 100), font)
+
+    def start_selection_drag(self, world_pos):
+        """Starts moving the selection if world_pos is inside it, otherwise starts a new marquee there."""
+        cell = grid_cell(world_pos)
+        if self.selection is not None and cell in cells_in_rect(*self.selection):
+            self.move_from = cell
+        else:
+            self.selection = None
+            self.select_anchor = cell
+
+    def finish_selection_drag(self, world_pos):
+        cell = grid_cell(world_pos)
+        if self.select_anchor is not None:
+            self.selection = ((min(self.select_anchor[0], cell[0]), min(self.select_anchor[1], cell[1])),
+                              (max(self.select_anchor[0], cell[0]), max(self.select_anchor[1], cell[1])))
+            self.select_anchor = None
+        elif self.move_from is not None:
+            offset = (cell[0] - self.move_from[0], cell[1] - self.move_from[1])
+            self.move_from = None
+            if offset != (0, 0):
+                region, sprites = self.selected_region()
+                self.put_region(region, (self.selection[0][0] + offset[0], self.selection[0][1] + offset[1]), sprites)
+
+    def make_region_resident(self, first_cell, last_cell):
+        """Turns the chunks under the cells from first_cell to last_cell into sprites, see ChunkedLevel.make_resident()."""
+        first_key, last_key = chunk_key(cell_topleft(first_cell)[0]), chunk_key(cell_topleft(last_cell)[0])
+        self.level_chunks.make_resident(range(first_key, last_key + 1), self.placed_sprites, IMAGES)
+
+    def selected_region(self):
+        """Returns the objects in the selection as a CellRegion, and the sprites they came from."""
+        self.make_region_resident(*self.selection)
+        sprites = PlacedObject.placed_in_cells(cells_in_rect(*self.selection))
+        entries = [sprite_edit_entry(OBJECT_KINDS[type(sprite)], sprite) for sprite in sprites]
+        return CellRegion.from_entries(entries, *self.selection), sprites
+
+    def put_region(self, region, origin_cell, removed=()):
+        """
+        Puts a region down with its top-left cell at origin_cell, replacing
+        whatever is in the cells its objects land on, and selects it. The
+        sprites in removed (the originals of a moved selection) go too. All
+        removals are one batch, all new objects another, undone as one step.
+        :return: False, changing nothing, if part of the region would land off the grid or on a building.
+        """
+        last_cell = (origin_cell[0] + region.width - 1, origin_cell[1] + region.height - 1)
+        entries = region.to_entries(origin_cell)
+        target_cells = {grid_cell((x, y)) for _, x, y, _ in entries}
+        if not cells_fit(self.build_edit_grid(), target_cells):
+            font = get_font('Arial', 14)
+            self.notification_manager.add_message("It doesn't fit there", 1, (SCREEN_WIDTH-80, 100), font, (255, 255, 0))
+            return False
+        self.make_region_resident(origin_cell, last_cell)
+        removed = list(removed)
+        removed_set = set(removed)
+        removed += [sprite for sprite in PlacedObject.placed_in_cells(target_cells) if sprite not in removed_set]
+        self.edit_history.record(erased=[sprite_edit_entry(OBJECT_KINDS[type(sprite)], sprite) for sprite in removed], placed=entries)
+        remove_placed_sprites(self.placed_sprites, removed, self)
+        create_placed_objects(self.placed_sprites, entries, self)
+        self.selection = (origin_cell, last_cell)
+        return True
+
+    def copy_selection(self):
+        if self.selection is not None:
+            # The player and door are one of a kind, so they are left out of copies
+            self.clipboard = self.selected_region()[0].without('player', 'door')
+            font = get_font('Arial', 14)
+            self.notification_manager.add_message("Copied {} objects".format(len(self.clipboard)), 1, (SCREEN_WIDTH-80, 100), font)
+
+    def paste_clipboard(self):
+        """Pastes the clipboard with its top-left cell under the mouse."""
+        if self.clipboard is not None:
+            self.put_region(self.clipboard, grid_cell(self.camera.to_world(self.mouse_pos)))
+
+    def mirror_selection(self):
+        """Flips the selected objects left to right within the selection."""
+        if self.selection is not None:
+            region, sprites = self.selected_region()
+            self.put_region(region.mirrored(), self.selection[0], sprites)
+
+    def delete_selection(self):
+        if self.selection is not None:
+            self.make_region_resident(*self.selection)
+            remove_placed_objects(self.placed_sprites, cells_in_rect(*self.selection), self)
+
+    def selection_rect(self):
+        """Returns the world rect of the marquee being dragged out, the selection being moved, or the selection."""
+        cell = grid_cell(self.camera.to_world(self.mouse_pos))
+        if self.select_anchor is not None:
+            return grid_cells_rect(self.select_anchor, cell)
+        if self.selection is None:
+            return None
+        rect = grid_cells_rect(*self.selection)
+        if self.move_from is not None:
+            rect.move_ip((cell[0] - self.move_from[0]) * Grid.GRID_SPACING, (cell[1] - self.move_from[1]) * Grid.GRID_SPACING)
+        return rect
+
+    def cycle_eraser_brush(self):
+        self.eraser_brush = ERASER_BRUSHES[(ERASER_BRUSHES.index(self.eraser_brush) + 1) % len(ERASER_BRUSHES)]
+        self.eraser_anchor = None
+        font = get_font('Arial', 14)
+        self.notification_manager.add_message("Eraser Brush: " + self.eraser_brush, 1, (SCREEN_WIDTH-80, 100), font)
+
+    def erase_at(self, world_pos):
+        """
+        Erases under the eraser brush at world_pos. A drag also erases the
+        cells between this and the previous erase; the rectangle brush only
+        records where the rectangle starts, see finish_eraser_rectangle().
+        """
+        cell = grid_cell(world_pos)
+        if self.eraser_brush == 'rectangle':
+            if self.eraser_anchor is None:
+                self.eraser_anchor = cell
+            return
+        cells = set()
+        for stroke_cell in cells_on_line(self.last_erased_cell or cell, cell):
+            cells.update(eraser_brush_cells(stroke_cell, self.eraser_brush))
+        self.make_region_resident(min(cells), max(cells))
+        remove_placed_objects(self.placed_sprites, cells, self)
+        self.last_erased_cell = cell
+
+    def finish_eraser_rectangle(self, world_pos):
+        """Erases everything in the rectangle dragged out from the anchor cell to world_pos."""
+        if self.eraser_anchor is not None:
+            cell = grid_cell(world_pos)
+            self.make_region_resident(min(self.eraser_anchor, cell), max(self.eraser_anchor, cell))
+            remove_placed_objects(self.placed_sprites, cells_in_rect(self.eraser_anchor, cell), self)
+            self.eraser_anchor = None
+
+    def eraser_brush_rect(self):
+        """Returns the world rect the eraser brush covers under the mouse, or None when the mouse is off the grid."""
+        world_pos = self.camera.to_world(self.mouse_pos)
+        cell = grid_cell(world_pos)
+        if self.eraser_anchor is not None:
+            return grid_cells_rect(self.eraser_anchor, cell)
+        left_bound, right_bound = self.get_grid_horizontal_bounds(world_pos[1])
+        if(self.mouse_pos[1] <= GameState.TOP_UI_BOUNDARY_Y_HEIGHT or self.mouse_pos[1] > SCREEN_HEIGHT-GameState.BOTTOM_Y_GRID_OFFSET
+           or not (left_bound <= world_pos[0] <= right_bound) or self.is_point_in_edit_ui(self.mouse_pos)):
+            return None
+        if self.eraser_brush == '3x3':
+            return grid_cells_rect((cell[0] - 1, cell[1] - 1), (cell[0] + 1, cell[1] + 1))
+        return grid_cells_rect(cell, cell)
     def init_ui_elements(self):
         self.play_edit_switch_button = PlayEditSwitchButton(self.UI_ELEMENTS_POSITIONS['play_edit_switch_button'],
                                                             self.game_mode_sprites,
@@ -1094,7 +1359,7 @@ class GameState:
         for step in range(max_steps + 1):
             next_pos = (start[0] + step * dx, start[1] + step * dy)
             # Snap each intermediate position to the grid
-            snapped_pos = snap_to_grid(next_pos, SCREEN_WIDTH, SCREEN_HEIGHT, Grid.GRID_SPACING, GameState.TOP_UI_BOUNDARY_Y_HEIGHT, GameState.HORIZONTAL_GRID_OFFSET)
+            snapped_pos = snap_to_grid(next_pos, self.world_width, SCREEN_HEIGHT, Grid.GRID_SPACING, GameState.TOP_UI_BOUNDARY_Y_HEIGHT, GameState.HORIZONTAL_GRID_OFFSET)
             if snapped_pos not in interpolated_positions:
                 interpolated_positions.append(snapped_pos)
     
@@ -1102,29 +1367,25 @@ class GameState:
     
     # Assume place_object_at_position is a method that places the selected object at the given grid position
     def place_object_at_position(self, position, object_type):
-        """Place an object of the specified type at the given grid position."""
-        if object_type == "player" and not self.placed_player:
-            self.placed_player = PlacedPlayer(position, self.placed_sprites, IMAGES)
-        elif object_type == "door" and not self.placed_door:
-            self.placed_door = PlacedDoor(position, self.placed_sprites, IMAGES)
-        elif object_type == 'wall':
-            PlacedWall(position, self.placed_sprites, IMAGES)
-        elif object_type == 'flyer':
-            PlacedFlyer(position, self.placed_sprites, IMAGES)
-        elif object_type == 'reverse_wall':
-            PlacedReverseWall(position, self.placed_sprites, IMAGES)
-        elif object_type == 'spring':
-            PlacedSpring(position, self.placed_sprites, IMAGES)
-        elif object_type == 'smily_robot':
-            PlacedSmilyRobot(position, self.placed_sprites, IMAGES)
-        elif object_type == 'diamonds':
-            PlacedDiamonds(position, self.placed_sprites, IMAGES)
-        elif object_type == 'sticky_block':
-            PlacedStickyBlock(position, self.placed_sprites, IMAGES)
-        elif object_type == 'fall_spikes':
-            PlacedFallSpikes(position, self.placed_sprites, IMAGES)
+        """Place an object of the specified type at the given grid position, recording it for undo."""
+        placed_class = PLACED_CLASSES.get(object_type)
+        if placed_class is not None and placed_class.placed_at(position) is not None:
+            return  # Already there; a drag stroke passes over the same cell many times
+        if object_type == "player":
+            if self.placed_player:
+                return
+            sprite = self.placed_player = PlacedPlayer(position, self.placed_sprites, IMAGES)
+        elif object_type == "door":
+            if self.placed_door:
+                return
+            sprite = self.placed_door = PlacedDoor(position, self.placed_sprites, IMAGES)
         elif object_type == 'stand_spikes':
-            PlacedStandSpikes(position, self.placed_sprites, IMAGES, self.rotate_button.current_stand_spikes_rotate)
+            sprite = PlacedStandSpikes(position, self.placed_sprites, IMAGES, self.rotate_button.current_stand_spikes_rotate)
+        elif placed_class is not None:
+            sprite = placed_class(position, self.placed_sprites, IMAGES)
+        else:
+            return
+        self.edit_history.record(placed=[sprite_edit_entry(object_type, sprite)])
 
             
     def handle_events(self, menu_on):
@@ -1147,18 +1408,54 @@ class GameState:
                 if event.key == pygame.K_SPACE:
                     # Toggle pause state
                     self.is_paused = not self.is_paused
-                    font = pygame.font.SysFont('Arial', 14)
+                    font = get_font('Arial', 14)
                     pause_message = "Pause Toggled: " + str(self.is_paused)
                     self.notification_manager.add_message(pause_message, 1, (SCREEN_WIDTH-80, 100), font)
                     print(pause_message)
             if self.game_mode == GameState.EDIT_MODE:
+                # Scroll the level with the arrow keys or the mouse wheel; [ and ] narrow and widen it
+                if event.type == pygame.KEYDOWN and event.key in (K_LEFT, K_RIGHT):
+                    self.scroll_editor(EDITOR_SCROLL_STEP if event.key == K_RIGHT else -EDITOR_SCROLL_STEP)
+                elif event.type == pygame.MOUSEWHEEL:
+                    self.scroll_editor(EDITOR_SCROLL_STEP * (event.x - event.y))
+                elif event.type == pygame.KEYDOWN and event.key in (pygame.K_LEFTBRACKET, pygame.K_RIGHTBRACKET):
+                    self.resize_level(EDITOR_RESIZE_COLUMNS if event.key == pygame.K_RIGHTBRACKET else -EDITOR_RESIZE_COLUMNS)
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_b:
+                    self.cycle_eraser_brush()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_t:
+                    self.cycle_place_tool()
+                elif event.type == pygame.KEYDOWN and event.mod & (pygame.KMOD_CTRL | pygame.KMOD_META):
+                    # Ctrl+Z undoes; Ctrl+Y or Ctrl+Shift+Z redoes; Ctrl+C and Ctrl+V copy and paste the selection (Cmd on macOS)
+                    if event.key == pygame.K_z and not event.mod & pygame.KMOD_SHIFT:
+                        self.undo()
+                    elif event.key in (pygame.K_y, pygame.K_z):
+                        self.redo()
+                    elif event.key == pygame.K_c:
+                        self.copy_selection()
+                    elif event.key == pygame.K_v:
+                        self.paste_clipboard()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_s:
+                    self.toggle_select_mode()
+                elif event.type == pygame.KEYDOWN and event.key == pygame.K_h:
+                    self.mirror_selection()
+                elif event.type == pygame.KEYDOWN and event.key in (pygame.K_DELETE, pygame.K_BACKSPACE):
+                    self.delete_selection()
+                elif event.type == pygame.KEYDOWN and event.key == K_ESCAPE:
+                    self.selection = None
                 # Update dragging state with left click
                 if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1: # Left click hold down
                     self.is_dragging = True
                     self.last_placed_pos = None  # Reset last placed position on new click
+                    self.last_erased_cell = None
+                    self.edit_history.begin_stroke()  # Everything placed or erased until the release undoes together
                 elif event.type == pygame.MOUSEBUTTONUP and event.button == 1: # Left click release
                     self.is_dragging = False
                     self.last_placed_pos = None  # Clear the last placed position when releasing the button
+                    self.last_erased_cell = None
+                    self.finish_eraser_rectangle(self.camera.to_world(event.pos))
+                    self.finish_place_tool(self.camera.to_world(event.pos))
+                    self.finish_selection_drag(self.camera.to_world(event.pos))
+                    self.edit_history.end_stroke()
             elif self.game_mode == GameState.PLAY_MODE:
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     self.handle_mouse_down_events(event)
@@ -1211,6 +1508,8 @@ class GameState:
                     if self.eraser_mode_active:
                         # Turn off eraser mode so we can select for the start object
                         self.toggle_eraser_mode()
+                    if self.select_mode:
+                        self.toggle_select_mode()
                         
                     def select_object_for_placement():
                         start_objects = {'player': self.start.player,
@@ -1246,39 +1545,23 @@ class GameState:
             elif(event.type == MOUSEBUTTONDOWN and pygame.mouse.get_pressed()[0] and \
             self.mouse_pos[1] <= SCREEN_HEIGHT-GameState.BOTTOM_Y_GRID_OFFSET and \
             not self.is_point_in_edit_ui(self.mouse_pos)):
-                left_bound, right_bound = self.get_grid_horizontal_bounds(self.mouse_pos[1])
-                if not (left_bound <= self.mouse_pos[0] <= right_bound):
+                # The grid scrolls with the level, so work in world coordinates
+                world_pos = self.camera.to_world(self.mouse_pos)
+                left_bound, right_bound = self.get_grid_horizontal_bounds(world_pos[1])
+                if not (left_bound <= world_pos[0] <= right_bound):
                     continue
                 if not self.eraser_mode_active:
                     # Place object on location of mouse release
-                    if self.selected_object_type:
-                        _snap_left = GameState.HORIZONTAL_GRID_OFFSET - 10 * Grid.GRID_SPACING if self.mouse_pos[1] < GameState.TOP_UI_BOUNDARY_Y_HEIGHT + 11 * Grid.GRID_SPACING else GameState.HORIZONTAL_GRID_OFFSET
-                        grid_pos = snap_to_grid(self.mouse_pos, SCREEN_WIDTH, SCREEN_HEIGHT, Grid.GRID_SPACING, GameState.TOP_UI_BOUNDARY_Y_HEIGHT, _snap_left)
+                    if self.select_mode:
+                        self.start_selection_drag(world_pos)
+                    elif self.uses_place_tool():
+                        self.start_place_tool(world_pos)
+                    elif self.selected_object_type:
+                        _snap_left = GameState.HORIZONTAL_GRID_OFFSET - 10 * Grid.GRID_SPACING if world_pos[1] < GameState.TOP_UI_BOUNDARY_Y_HEIGHT + 11 * Grid.GRID_SPACING else GameState.HORIZONTAL_GRID_OFFSET
+                        grid_pos = snap_to_grid(world_pos, self.world_width, SCREEN_HEIGHT, Grid.GRID_SPACING, GameState.TOP_UI_BOUNDARY_Y_HEIGHT, _snap_left)
                         # Delete object that's already at the grid
-                        remove_placed_object(self.placed_sprites, self.mouse_pos, self)
-                        # Example for placing a player, replicate for other types
-                        if self.selected_object_type == 'player' and not self.placed_player:
-                            self.placed_player = PlacedPlayer(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'door' and not self.placed_door:
-                            self.placed_door = PlacedDoor(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'wall':
-                            PlacedWall(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'flyer':
-                            PlacedFlyer(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'reverse_wall':
-                            PlacedReverseWall(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'spring':
-                            PlacedSpring(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'smily_robot':
-                            PlacedSmilyRobot(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'diamonds':
-                            PlacedDiamonds(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'sticky_block':
-                            PlacedStickyBlock(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'fall_spikes':
-                            PlacedFallSpikes(grid_pos, self.placed_sprites, IMAGES)
-                        elif self.selected_object_type == 'stand_spikes':
-                            PlacedStandSpikes(grid_pos, self.placed_sprites, IMAGES, self.rotate_button.current_stand_spikes_rotate)
+                        remove_placed_object(self.placed_sprites, world_pos, self)
+                        self.place_object_at_position(grid_pos, self.selected_object_type)
 
                 elif self.eraser_mode_active:
                     # Either delete object being dragged or delete object on grid (if not currently dragging an object)
@@ -1288,8 +1571,8 @@ class GameState:
                         self.start = restart_start_objects(self.start, self.START_POSITIONS)
                         self.is_an_object_currently_being_dragged = False
                     else:
-                        # No object is currently being dragged, attempt to delete object at grid position
-                        remove_placed_object(self.placed_sprites, self.mouse_pos, self)
+                        # No object is currently being dragged, erase under the brush
+                        self.erase_at(world_pos)
             #################
             # RIGHT CLICK (RELEASE)
             #################           
@@ -1304,7 +1587,7 @@ class GameState:
                     self.start.dynamic_object_placeholder.reset()
                 else:
                     # No object is currently being dragged, attempt to delete object at grid position
-                    remove_placed_object(self.placed_sprites, self.mouse_pos, self)
+                    remove_placed_object(self.placed_sprites, self.camera.to_world(self.mouse_pos), self)
             
             #################
             # CLICK AND DRAG (ERASER)
@@ -1312,7 +1595,9 @@ class GameState:
             elif (event.type == pygame.MOUSEMOTION and self.eraser_mode_active):
                 self.update_mouse_pos()
                 if self.is_dragging and self.game_mode == GameState.EDIT_MODE and self.mouse_pos[1] > GameState.TOP_UI_BOUNDARY_Y_HEIGHT:
-                    remove_placed_object(self.placed_sprites, self.mouse_pos, self)
+                    # The rectangle brush waits for the release; its outline follows the mouse meanwhile
+                    if self.eraser_brush != 'rectangle':
+                        self.erase_at(self.camera.to_world(self.mouse_pos))
                     
 
             
@@ -1320,14 +1605,16 @@ class GameState:
             elif (event.type == pygame.MOUSEMOTION and not self.eraser_mode_active):
 
                 self.update_mouse_pos()
-                in_top_rows = self.mouse_pos[1] < GameState.TOP_UI_BOUNDARY_Y_HEIGHT + 11 * Grid.GRID_SPACING
-                left_bound, right_bound = self.get_grid_horizontal_bounds(self.mouse_pos[1])
+                world_pos = self.camera.to_world(self.mouse_pos)
+                in_top_rows = world_pos[1] < GameState.TOP_UI_BOUNDARY_Y_HEIGHT + 11 * Grid.GRID_SPACING
+                left_bound, right_bound = self.get_grid_horizontal_bounds(world_pos[1])
+                # Lines and rectangles go down on release and the fill tool on the click, so only the brush paints here
                 if(self.is_dragging and self.game_mode == GameState.EDIT_MODE and self.mouse_pos[1] > GameState.TOP_UI_BOUNDARY_Y_HEIGHT \
-                   and left_bound <= self.mouse_pos[0] <= right_bound and \
+                   and not self.uses_place_tool() and left_bound <= world_pos[0] <= right_bound and \
                    self.mouse_pos[1] <= SCREEN_HEIGHT-GameState.BOTTOM_Y_GRID_OFFSET and \
                    not self.is_point_in_edit_ui(self.mouse_pos)):
                     _snap_left = GameState.HORIZONTAL_GRID_OFFSET - 10 * Grid.GRID_SPACING if in_top_rows else GameState.HORIZONTAL_GRID_OFFSET
-                    new_grid_pos = snap_to_grid(self.mouse_pos, SCREEN_WIDTH, SCREEN_HEIGHT, Grid.GRID_SPACING, GameState.TOP_UI_BOUNDARY_Y_HEIGHT, _snap_left)
+                    new_grid_pos = snap_to_grid(world_pos, self.world_width, SCREEN_HEIGHT, Grid.GRID_SPACING, GameState.TOP_UI_BOUNDARY_Y_HEIGHT, _snap_left)
     
                     if new_grid_pos != self.last_placed_pos:
                         interpolated_positions = self.interpolate_positions(self.last_placed_pos or new_grid_pos, new_grid_pos, Grid.GRID_SPACING)
@@ -1431,11 +1718,15 @@ class GameState:
     def toggle_eraser_mode(self):
         # Toggle the eraser mode state
         self.eraser_mode_active = not self.eraser_mode_active
+        self.eraser_anchor = None
+        self.place_anchor = None
+        if self.eraser_mode_active and self.select_mode:
+            self.toggle_select_mode()
         # Update the eraser button visual state
         self.eraser_button.toggle_eraser_button_image(self.eraser_mode_active)
     def switch_to_edit_mode(self):
         # Makes sure you are not in editing mode to enter editing mode
-        font = pygame.font.SysFont('Arial', 14)
+        font = get_font('Arial', 14)
         self.notification_manager.add_message("Editing Mode Activated", 1, (SCREEN_WIDTH-80, 100), font)
         print("Editing Mode Activated")
         self.game_mode = self.EDIT_MODE
@@ -1446,6 +1737,7 @@ class GameState:
         remove_all_play(self)
         self.play_sprites.empty()
         self.start = restart_start_objects(self.start, self.START_POSITIONS)
+        self.camera.scroll_to(self.edit_camera_x)
         
         #MUSIC_PLAYER = []
         #MUSIC_PLAYER = [MusicPlayer()]
@@ -1462,7 +1754,8 @@ class GameState:
             self.play_edit_switch_button.image = self.play_edit_switch_button.game_mode_button(self.game_mode)
             self.play_timer_start = pygame.time.get_ticks()
             self.play_elapsed_ms = 0
-            font = pygame.font.SysFont('Arial', 14)
+            self.play_timestep.reset()
+            font = get_font('Arial', 14)
             self.notification_manager.add_message("Play Mode Activated", 1, (SCREEN_WIDTH-80, 100), font, (0, 255, 0))
             print("Play Mode Activated")
             
@@ -1470,64 +1763,27 @@ class GameState:
             self.play_player = PlayPlayer(self.placed_player.rect.topleft, self.play_sprites, IMAGES, SOUNDS)
             if self.placed_door:
                 self.play_door = PlayDoor(self.placed_door.rect.topleft, self.play_sprites, IMAGES)
-            for placed_wall in PlacedWall.wall_list:
-                PlayWall(placed_wall.rect.topleft, self.play_sprites, IMAGES)
-            for placed_flyer in PlacedFlyer.flyer_list:
-                PlayFlyer(placed_flyer.rect.topleft, self.play_sprites, IMAGES)
-            for placed_reverse_wall in PlacedReverseWall.reverse_wall_list:
-                PlayReverseWall(placed_reverse_wall.rect.topleft, self.play_sprites, IMAGES)
-            for placed_smily_robot in PlacedSmilyRobot.smily_robot_list:
-                PlaySmilyRobot(placed_smily_robot.rect.topleft, self.play_sprites, IMAGES)
-            for placed_spring in PlacedSpring.spring_list:
-                PlaySpring(placed_spring.rect.topleft, self.play_sprites, IMAGES)
-            for placed_diamond in PlacedDiamonds.diamonds_list:
-                PlayDiamonds(placed_diamond.rect.topleft, self.play_sprites, IMAGES)
-            for placed_sticky_block in PlacedStickyBlock.sticky_block_list:
-                PlayStickyBlock(placed_sticky_block.rect.topleft, self.play_sprites, IMAGES)
-            for placed_fall_spikes in PlacedFallSpikes.fall_spikes_list:
-                PlayFallSpikes(placed_fall_spikes.rect.topleft, self.play_sprites, IMAGES)
-            for placed_stand_spikes in PlacedStandSpikes.stand_spikes_list:
-                PlayStandSpikes(placed_stand_spikes.rect.topleft, self.play_sprites, IMAGES, placed_stand_spikes.rotate)
+            # Built from every chunk, not just the ones the editor has as sprites
+            level = self.level_chunks.entries_by_kind()
+            for object_name, factory in PLAY_OBJECT_FACTORIES:
+                for position in level[object_name]:
+                    factory(position, self.play_sprites, IMAGES)
+            for position, rotate in level['stand_spikes']:
+                PlayStandSpikes(position, self.play_sprites, IMAGES, rotate)
             
             # Building boundaries — align to the visible rooftop/park surfaces
             # Created before UI buttons so buttons render on top
-            gs = Grid.GRID_SPACING
-            # --- Wyatt Labs Fitness (bottom-left): rooftop court surface ---
-            wl_surf, wl_pos = self.building_surfaces[0]
-            wl_roof_y = wl_pos[1] + int(wl_surf.get_height() * 0.31)
-            wl_top_y = ((wl_roof_y - GameState.TOP_UI_BOUNDARY_Y_HEIGHT) // gs) * gs + GameState.TOP_UI_BOUNDARY_Y_HEIGHT
-            wl_wall_x = wl_pos[0] + int(wl_surf.get_width() * 0.86)
-            wl_right_x = ((wl_wall_x - GameState.HORIZONTAL_GRID_OFFSET) // gs) * gs + GameState.HORIZONTAL_GRID_OFFSET
-            wl_roof_end_x = wl_right_x + gs
-            wl_left_start = -gs
-            x = wl_left_start
-            while x <= wl_roof_end_x:
-                BoundaryWall(x, wl_top_y, self.play_sprites)
-                x += gs
-            y = wl_top_y + gs
-            while y < SCREEN_HEIGHT:
-                BoundaryWall(wl_right_x, y, self.play_sprites)
-                y += gs
-            # --- Salesfarce Park (bottom-right): rooftop park surface ---
-            sf_surf, sf_pos = self.building_surfaces[1]
-            sf_roof_y = sf_pos[1] + int(sf_surf.get_height() * 0.50)
-            sf_top_y = ((sf_roof_y - GameState.TOP_UI_BOUNDARY_Y_HEIGHT) // gs) * gs + GameState.TOP_UI_BOUNDARY_Y_HEIGHT
-            sf_wall_x = sf_pos[0] + int(sf_surf.get_width() * 0.10)
-            sf_left_x = ((sf_wall_x - GameState.HORIZONTAL_GRID_OFFSET) // gs) * gs + GameState.HORIZONTAL_GRID_OFFSET
-            x = sf_left_x
-            while x < SCREEN_WIDTH:
-                BoundaryWall(x, sf_top_y, self.play_sprites)
-                x += gs
-            y = sf_top_y + gs
-            while y < SCREEN_HEIGHT:
-                BoundaryWall(sf_left_x, y, self.play_sprites)
-                y += gs
+            set_world_width(self.world_width)
+            build_building_boundaries(self.play_sprites)
+            build_collision_data()
+            self.edit_camera_x = self.camera.x
+            self.camera.follow(self.play_player.rect)
 
             self.left_arrow_button = ArrowButton(self.play_sprites, IMAGES, "left")
             self.right_arrow_button = ArrowButton(self.play_sprites, IMAGES, "right")
             self.jump_button = JumpButton(self.play_sprites, IMAGES)
         else:
-            font = pygame.font.SysFont('Arial', 14)
+            font = get_font('Arial', 14)
             self.notification_manager.add_message("You need a character!", 3, (SCREEN_WIDTH-80, 100), font, (255, 255, 0))
             print("You need a character!")
     def edit_mode_function(self):
@@ -1635,94 +1891,28 @@ class GameState:
         if self.jumping:
             # Make the player jump
             self.play_player.jump()
-        # Dead
-        if self.play_player.rect.top > SCREEN_HEIGHT and self.play_player.speed_y >= 0:
-            restart_level(self)
-        # Spikes fall when player goes underneath
-        if PlayFallSpikes.fall_spikes_list:
-            for fall_spike in PlayFallSpikes.fall_spikes_list:
-                if(self.play_player.rect.right > fall_spike.rect.left and
-                   self.play_player.rect.left < fall_spike.rect.right and
-                   self.play_player.rect.top > fall_spike.rect.bottom):
-                    fall_spike.fall_var = 1
-                if fall_spike.fall_var == 1:
-                    fall_spike.rect.top = fall_spike.rect.top + 5
         # Player wins when he captures all jewels and enters door
-        if self.play_door:
-            self.play_door.image = self.play_door.open_or_close(self.play_player.score, PlayDiamonds.diamonds_list)
-            if pygame.sprite.collide_mask(self.play_player, self.play_door):
-                if self.play_player.score == len(PlayDiamonds.diamonds_list):
-                    font = pygame.font.SysFont('Arial', 96)
-                    self.notification_manager.add_message("You Win!", 3, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2), font)
-                    final_ms = pygame.time.get_ticks() - self.play_timer_start if self.play_timer_start is not None else self.play_elapsed_ms
-                    final_s = final_ms // 1000
-                    final_cs = (final_ms % 1000) // 10
-                    time_font = pygame.font.SysFont('Arial', 48)
-                    self.notification_manager.add_message("Time: {:d}.{:02d}s".format(final_s, final_cs), 3, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 90), time_font)
-                    print("You Win!")
-                    self.notification_manager.draw_messages(self.screen)
-                    pygame.display.update()
-                    await asyncio.sleep(3)
-                    next_level_index = None if self.current_builtin_level_index is None else self.current_builtin_level_index + 1
-                    if next_level_index is not None and next_level_index < len(BUILTIN_LEVELS):
-                        self.start_builtin_level(next_level_index)
-                    else:
-                        self.switch_to_edit_mode()
-                        if self.current_builtin_level_index is not None:
-                            notify(self, "Campaign complete!", 3, (255, 244, 160))
-                            self.request_app_screen(APP_SCREEN_LEVEL_SELECT)
-                    #music_player = [MusicPlayer()]
-                    
-
-                
-        #####################
-        # COLLISIONS
-        #####################
-        for play_smily_robot in PlaySmilyRobot.smily_robot_list:
-            if self.play_player.rect.colliderect(play_smily_robot.rect):
-                if(self.play_player.rect.bottom <= play_smily_robot.rect.top + 10 and self.play_player.speed_y >= 0):
-                    play_smily_robot.rect.topleft = PlaySmilyRobot.OUT_OF_PLAY_TOPLEFT
-                    self.play_player.propeller = 0
-                    self.play_player.speed_y = -4
-                    self.play_player.jumps_left = 1 #Allows propeller in air
-                elif(self.play_player.rect.right-play_smily_robot.rect.left <= 10 and
-                     self.play_player.rect.bottom > play_smily_robot.rect.top + 10):
-                    restart_level(self)
-                elif(self.play_player.rect.left-play_smily_robot.rect.right <= 10 and
-                     self.play_player.rect.bottom > play_smily_robot.rect.top + 10):
-                    restart_level(self)
-        for play_flyer in PlayFlyer.flyer_list:
-            if self.play_player.rect.colliderect(play_flyer.rect):
-                restart_level(self)
-        for play_fall_spikes in PlayFallSpikes.fall_spikes_list:
-            if self.play_player.rect.colliderect(play_fall_spikes.rect):
-                restart_level(self)
-        for play_stand_spikes in PlayStandSpikes.stand_spikes_list:
-            if self.play_player.rect.colliderect(play_stand_spikes.rect):
-                restart_level(self)
-        for play_diamonds in PlayDiamonds.diamonds_list:
-            if pygame.sprite.collide_mask(self.play_player, play_diamonds):
-                self.play_player.score += 1
-                play_diamonds.image = IMAGES["spr_dynamic_object_placeholder"]
-        for spring in PlaySpring.spring_list:
-            if pygame.sprite.collide_mask(self.play_player, spring):
-                # Check if the collision is primarily on top of the spring
-                if self.play_player.rect.bottom <= spring.rect.top + 20 and self.play_player.speed_y >= 0:
-                    # This is a top collision, trigger the high jump
-                    SOUNDS["snd_spring"].play()
-                    self.play_player.propeller = 0
-                    self.play_player.rect.bottom = spring.rect.top
-                    self.play_player.speed_y = -10  # High jump
-                    self.play_player.jumps_left = 1  # Allows for propeller in air
-                else:
-                    # Side collision handling
-                    # Collision is primarily horizontal
-                    if self.play_player.rect.centerx < spring.rect.centerx:
-                        # Player is on the left side of the spring
-                        self.play_player.rect.right = spring.rect.left
-                    else:
-                        # Player is on the right side of the spring
-                        self.play_player.rect.left = spring.rect.right
+        if apply_play_rules(self.play_player, self.play_door, SOUNDS):
+            font = get_font('Arial', 96)
+            self.notification_manager.add_message("You Win!", 3, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2), font)
+            final_ms = pygame.time.get_ticks() - self.play_timer_start if self.play_timer_start is not None else self.play_elapsed_ms
+            final_s = final_ms // 1000
+            final_cs = (final_ms % 1000) // 10
+            time_font = get_font('Arial', 48)
+            self.notification_manager.add_message("Time: {:d}.{:02d}s".format(final_s, final_cs), 3, (SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 90), time_font)
+            print("You Win!")
+            self.notification_manager.draw_messages(self.screen)
+            pygame.display.update()
+            await asyncio.sleep(3)
+            next_level_index = None if self.current_builtin_level_index is None else self.current_builtin_level_index + 1
+            if next_level_index is not None and next_level_index < len(BUILTIN_LEVELS):
+                self.start_builtin_level(next_level_index)
+            else:
+                self.switch_to_edit_mode()
+                if self.current_builtin_level_index is not None:
+                    notify(self, "Campaign complete!", 3, (255, 244, 160))
+                    self.request_app_screen(APP_SCREEN_LEVEL_SELECT)
+            #music_player = [MusicPlayer()]
 
     def initiate_room(self):
         self.start.player.rect.topleft = self.START_POSITIONS['player']
@@ -1783,34 +1973,25 @@ def get_dict_rect_positions(game_state):
     if game_state.placed_door is not None:
         door_position = [game_state.placed_door.rect.topleft]
 
-    # Dictionary for all other objects except player
-    total_placed_list = {
-        'wall': PlacedWall.wall_list,
-        'flyer': PlacedFlyer.flyer_list,
-        'reverse_wall': PlacedReverseWall.reverse_wall_list,
-        'spring': PlacedSpring.spring_list,
-        'smily_robot': PlacedSmilyRobot.smily_robot_list,
-        'diamonds': PlacedDiamonds.diamonds_list,
-        'sticky_block': PlacedStickyBlock.sticky_block_list,
-        'fall_spikes': PlacedFallSpikes.fall_spikes_list,
-        'stand_spikes': PlacedStandSpikes.stand_spikes_list
-    }
-
     # Initialize the dictionary for storing object positions
     get_rect_for_all_obj = {'player': player_position,
                             'door': door_position}
+    # Screen-wide levels leave the width out, so they still load in older builds
+    if game_state.world_width > SCREEN_WIDTH:
+        get_rect_for_all_obj['world_width'] = game_state.world_width
 
-    # Loop through all lists of placed objects (except player and door)
-    for item_key, item_list in total_placed_list.items():
+    # All other objects, including those in chunks scrolled out of view
+    for item_key, entries in game_state.level_chunks.entries_by_kind().items():
         if item_key == 'stand_spikes':
-            item_list_in_name = [{'pos': item.rect.topleft, 'rotate': item.rotate} for item in item_list]
-        else:
-            item_list_in_name = [item.rect.topleft for item in item_list]
-        get_rect_for_all_obj[item_key] = item_list_in_name
+            entries = [{'pos': pos, 'rotate': rotate} for pos, rotate in entries]
+        get_rect_for_all_obj[item_key] = entries
 
     return get_rect_for_all_obj
 
 def remove_all_placed(game_state):
+    # Clearing or loading starts a new level, so there is nothing left to undo or selected
+    game_state.edit_history.clear()
+    game_state.selection = None
     for spr_list in [PlacedWall.wall_list, PlacedFlyer.flyer_list,
                      PlacedReverseWall.reverse_wall_list, PlacedSpring.spring_list, PlacedSmilyRobot.smily_robot_list,
                      PlacedDiamonds.diamonds_list, PlacedStickyBlock.sticky_block_list,
@@ -1832,39 +2013,20 @@ def remove_all_placed(game_state):
     PlacedStickyBlock.sticky_block_list = []
     PlacedFallSpikes.fall_spikes_list = []
     PlacedStandSpikes.stand_spikes_list = []
+    game_state.level_chunks.clear()
+    # A cleared level starts out screen-wide again
+    game_state.set_world_width(SCREEN_WIDTH)
 
 def remove_all_play(game_state):
-    for spr_list in [PlayWall.wall_list, PlayFlyer.flyer_list,
-                     PlayReverseWall.reverse_wall_list, PlaySpring.spring_list, PlaySmilyRobot.smily_robot_list,
-                     PlayDiamonds.diamonds_list, PlayStickyBlock.sticky_block_list,
-                     PlayFallSpikes.fall_spikes_list, PlayStandSpikes.stand_spikes_list]:
-        for obj in spr_list:
-            obj.kill()
+    remove_play_objects()
     game_state.play_player.kill()
     game_state.play_player = None
     if game_state.play_door:
         game_state.play_door.kill()
         game_state.play_door = None
-    PlayWall.wall_list = []
-    PlayFlyer.flyer_list = []
-    PlayReverseWall.reverse_wall_list = []
-    PlaySpring.spring_list = []
-    PlaySmilyRobot.smily_robot_list = []
-    PlayDiamonds.diamonds_list = []
-    PlayStickyBlock.sticky_block_list = []
-    PlayFallSpikes.fall_spikes_list = []
-    PlayStandSpikes.stand_spikes_list = []
 
 def restart_level(game_state):
-    for spr_list in [PlayWall.wall_list, PlayFlyer.flyer_list,
-                     PlayReverseWall.reverse_wall_list, PlaySpring.spring_list, PlaySmilyRobot.smily_robot_list,
-                     PlayDiamonds.diamonds_list, PlayStickyBlock.sticky_block_list,
-                     PlayFallSpikes.fall_spikes_list, PlayStandSpikes.stand_spikes_list]:
-        for obj in spr_list:
-            obj.restart()
-    game_state.play_player.restart()
-    if game_state.play_door:
-        game_state.play_door.restart()
+    restart_play_objects(game_state.play_player, game_state.play_door)
 
 async def main():
     # Tk box
@@ -1884,12 +2046,12 @@ async def main():
         notify(game_state, "Itch mode: save/load buttons disabled", 3, (255, 255, 0))
     
     #Fonts
-    FONT_ARIAL = pygame.font.SysFont('Arial', 24)
+    FONT_ARIAL = get_font('Arial', 24)
     menu_fonts = {
-        "title": pygame.font.SysFont('Arial', 44, bold=True),
-        "subtitle": pygame.font.SysFont('Arial', 24),
-        "button": pygame.font.SysFont('Arial', 30, bold=True),
-        "small": pygame.font.SysFont('Arial', 22),
+        "title": get_font('Arial', 44, bold=True),
+        "subtitle": get_font('Arial', 24),
+        "button": get_font('Arial', 30, bold=True),
+        "small": get_font('Arial', 22),
     }
 
     
@@ -1902,14 +2064,12 @@ async def main():
     METROPOLIS_BACKGROUND = pygame.image.load("sprites/metropolis_background.png").convert()
     METROPOLIS_BACKGROUND = pygame.transform.scale(METROPOLIS_BACKGROUND, (SCREEN_WIDTH, SCREEN_HEIGHT))
     SALESFARCE_PARK = pygame.image.load("sprites/salesfarce_park.png").convert_alpha()
-    SALESFARCE_PARK = pygame.transform.smoothscale(SALESFARCE_PARK, (287, 540))
-    SALESFARCE_PARK_POS = (SCREEN_WIDTH - SALESFARCE_PARK.get_width() + SCREEN_WIDTH * 2 // 100, SCREEN_HEIGHT - SALESFARCE_PARK.get_height() + SCREEN_HEIGHT * 8 // 100 - 15)
+    SALESFARCE_PARK = pygame.transform.smoothscale(SALESFARCE_PARK, SALESFARCE_PARK_SIZE)
     WYATT_LABS_FITNESS = pygame.image.load("sprites/wyatt_labs_fitness.png").convert_alpha()
-    WYATT_LABS_FITNESS = pygame.transform.smoothscale(WYATT_LABS_FITNESS, (311, 390))
-    WYATT_LABS_FITNESS_POS = (-SCREEN_WIDTH * 3 // 100, SCREEN_HEIGHT - WYATT_LABS_FITNESS.get_height())
+    WYATT_LABS_FITNESS = pygame.transform.smoothscale(WYATT_LABS_FITNESS, WYATT_LABS_FITNESS_SIZE)
     game_state.building_surfaces = [
         (WYATT_LABS_FITNESS, WYATT_LABS_FITNESS_POS),
-        (SALESFARCE_PARK, SALESFARCE_PARK_POS),
+        (SALESFARCE_PARK, get_salesfarce_park_pos(game_state.world_width)),
     ]
     main_menu_buttons = [
         MenuButton((140, 240, 322, 76), "Play Levels", bg_color=(244, 201, 82), border_color=(170, 113, 8)),
@@ -1924,10 +2084,34 @@ async def main():
         MenuButton((352, 452, 320, 62), "Back", bg_color=(225, 228, 235), border_color=(118, 124, 142)),
     ]
     #MUSIC_PLAYER = [MusicPlayer()]
+    dirty_tracker = DirtyRectTracker(SCREEN.get_rect())
+
+    def draw_edit_background(surface):
+        # The skyline stays put while the level and its buildings scroll past
+        surface.blit(METROPOLIS_BACKGROUND, (0, 0))
+        for building, (x, y) in game_state.building_surfaces:
+            surface.blit(building, (x - game_state.camera.x, y))
+
+    def draw_edit_overlay(surface):
+        grid_overlay = get_grid_overlay(game_state.building_surfaces, Grid.GRID_SPACING, (game_state.world_width, SCREEN_HEIGHT))
+        surface.blit(grid_overlay, (-game_state.camera.x, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    static_layer = StaticLayer((SCREEN_WIDTH, SCREEN_HEIGHT), draw_edit_background, draw_edit_overlay)
+    PlacedObject.static_layer = static_layer
         
+    can_idle = False  # Set after a frame with no input and nothing moving, see the end of the loop
     while True:
-        clock.tick(FPS)
+        if can_idle:
+            # Nothing changes on its own here, so sleep until input arrives or a notification expires
+            idle_ms = IDLE_REDRAW_MS
+            next_expiry_ms = game_state.notification_manager.next_expiry_ms()
+            if next_expiry_ms is not None:
+                idle_ms = min(idle_ms, next_expiry_ms)
+            await wait_for_events(idle_ms)
+        elapsed_ms = clock.tick(FPS)
         game_state.update_mouse_pos()
+        had_events = pygame.event.peek()
+        screen_state = (app_screen, game_state.game_mode, game_state.is_paused)
         
         if app_screen == APP_SCREEN_MAIN_MENU:
             for event in pygame.event.get():
@@ -1945,6 +2129,7 @@ async def main():
                         app_screen = APP_SCREEN_INFO
             draw_main_menu(SCREEN, START_MENU, menu_fonts, main_menu_buttons, game_state.mouse_pos)
             pygame.display.update()
+            dirty_tracker.invalidate()
         elif app_screen == APP_SCREEN_LEVEL_SELECT:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -1961,6 +2146,7 @@ async def main():
                             app_screen = APP_SCREEN_MAIN_MENU
             draw_level_select(SCREEN, START_MENU, menu_fonts, level_select_buttons, game_state.mouse_pos)
             pygame.display.update()
+            dirty_tracker.invalidate()
         elif app_screen == APP_SCREEN_GAME:  # Normal game state
         
             game_state.initiate_room()
@@ -1976,47 +2162,98 @@ async def main():
                     game_state.start_sprites.update()
                     game_state.placed_sprites.update()
                 elif game_state.game_mode == GameState.PLAY_MODE:
-                    await game_state.play_mode_function()
-                    game_state.play_sprites.update()
+                    # Physics advance in fixed ticks, however long this frame took
+                    for _ in range(game_state.play_timestep.advance(elapsed_ms)):
+                        await game_state.play_mode_function()
+                        if game_state.game_mode != GameState.PLAY_MODE:
+                            break
+                        # Only the stretch of level around the view moves
+                        game_state.camera.follow(game_state.play_player.rect)
+                        update_play_sprites(game_state.play_sprites, game_state.camera.active_rect())
             else:
                 # Game is paused
-                pass
+                game_state.play_timestep.reset()
             
-            SCREEN.blit(METROPOLIS_BACKGROUND, (0, 0))
-            SCREEN.blit(WYATT_LABS_FITNESS, WYATT_LABS_FITNESS_POS)
-            SCREEN.blit(SALESFARCE_PARK, SALESFARCE_PARK_POS)
+            if game_state.game_mode == game_state.PLAY_MODE:
+                game_state.camera.follow(game_state.play_player.rect)
+            # Scrolling moves everything, so any camera movement pushes the whole screen
+            dirty_tracker.track('game_mode', SCREEN.get_rect(), (game_state.game_mode, game_state.camera.x, game_state.world_width))
+            if game_state.game_mode == game_state.EDIT_MODE:
+                # Background, placed objects and grid come from the cached layer; only edited regions get redrawn
+                game_state.level_chunks.stream(game_state.camera.view_rect, game_state.placed_sprites, IMAGES)
+                static_layer.set_view(game_state.camera.offset, game_state.world_width)
+                static_layer.set_overlay_enabled(Grid.ALL_GRIDS_ENABLED)
+                for region in static_layer.refresh(game_state.placed_sprites):
+                    dirty_tracker.mark_dirty(region)
+                SCREEN.blit(static_layer.surface, (0, 0))
+            else:
+                draw_edit_background(SCREEN)
 
-            game_state.game_mode_sprites.draw(SCREEN)
-            if game_state.game_mode == game_state.EDIT_MODE: #Only draw placed sprites in editing mode
+            draw_sprites(SCREEN, game_state.game_mode_sprites)
+            dirty_tracker.track_sprites(game_state.game_mode_sprites)
+            if game_state.game_mode == game_state.EDIT_MODE: #Only draw the palette and outline in editing mode
                 if game_state.grid_button.grid_on_var:
-                    game_state.grid_sprites.draw(SCREEN)
-
-                game_state.placed_sprites.draw(SCREEN)
-                DEATH_COUNT_TEXT = FONT_ARIAL.render("", 1, (0, 0, 0))
-                if Grid.ALL_GRIDS_ENABLED:
-                    draw_grid(SCREEN, Grid.GRID_SPACING, SCREEN_WIDTH + Grid.GRID_SPACING, SCREEN_HEIGHT, GameState.TOP_UI_BOUNDARY_Y_HEIGHT, GameState.HORIZONTAL_GRID_OFFSET, top_extra_cols=10, top_extra_rows=11, top_extra_cols_left=10)
-                    draw_building_facades(SCREEN, game_state.building_surfaces)
-                game_state.start_sprites.draw(SCREEN)
+                    draw_sprites(SCREEN, game_state.grid_sprites)
+                    dirty_tracker.track_sprites(game_state.grid_sprites)
+
+                death_count_string = ""
+                DEATH_COUNT_TEXT = render_text(FONT_ARIAL, death_count_string, (0, 0, 0))
+                draw_sprites(SCREEN, game_state.start_sprites)
+                dirty_tracker.track_sprites(game_state.start_sprites)
                 # Draw yellow outline around start object being dragged
                 if game_state.selected_object_type is not None:
                     sprite_name, pos = GameState.DYNAMIC_OBJECT_PLACEHOLDER_YELLOW_OUTLINE_OBJ_AND_POS
                     draw_yellow_outline(SCREEN, IMAGES[sprite_name], pos, thickness=1)
+                    dirty_tracker.track('yellow_outline', IMAGES[sprite_name].get_rect(topleft=pos).inflate(2, 2), sprite_name)
+                # Outline the cells the eraser brush covers
+                if game_state.eraser_mode_active:
+                    brush_rect = game_state.eraser_brush_rect()
+                    if brush_rect is not None:
+                        brush_rect.move_ip(-game_state.camera.x, 0)
+                        pygame.draw.rect(SCREEN, ERASER_BRUSH_COLOR, brush_rect, 1)
+                        dirty_tracker.track('eraser_brush', brush_rect)
+                # Outline the cells of the line or rectangle being placed
+                tool_rects = [rect.move(-game_state.camera.x, 0) for rect in game_state.place_tool_rects()]
+                if tool_rects:
+                    for rect in tool_rects:
+                        pygame.draw.rect(SCREEN, PLACE_TOOL_COLOR, rect, 1)
+                    dirty_tracker.track('place_tool', tool_rects[0].unionall(tool_rects[1:]))
+                # Outline the selection, or the marquee being dragged out
+                if game_state.select_mode:
+                    selection_rect = game_state.selection_rect()
+                    if selection_rect is not None:
+                        selection_rect.move_ip(-game_state.camera.x, 0)
+                        pygame.draw.rect(SCREEN, SELECTION_COLOR, selection_rect, 1)
+                        dirty_tracker.track('selection', selection_rect)
 
             elif game_state.game_mode == game_state.PLAY_MODE: #Only draw play sprites in play mode
                 if game_state.eraser_mode_active:
                     game_state.toggle_eraser_mode()
-                game_state.play_sprites.draw(SCREEN)
-                DEATH_COUNT_TEXT = FONT_ARIAL.render("Deaths: " + str(game_state.play_player.death_count), 1, (0, 0, 0))
+                # Level sprites scroll with the camera and are culled to the view; the buttons stay on screen
+                view_rect = game_state.camera.view_rect
+                visible_sprites = [sprite for sprite in game_state.play_sprites if is_level_sprite(sprite) and view_rect.colliderect(sprite.rect)]
+                button_sprites = [sprite for sprite in game_state.play_sprites if not is_level_sprite(sprite)]
+                draw_sprites(SCREEN, visible_sprites, game_state.camera.offset)
+                dirty_tracker.track_sprites(visible_sprites, game_state.camera.offset)
+                draw_sprites(SCREEN, button_sprites)
+                dirty_tracker.track_sprites(button_sprites)
+                death_count_string = "Deaths: " + str(game_state.play_player.death_count)
+                DEATH_COUNT_TEXT = render_text(FONT_ARIAL, death_count_string, (0, 0, 0))
                 if game_state.play_timer_start is not None:
                     game_state.play_elapsed_ms = pygame.time.get_ticks() - game_state.play_timer_start
                 elapsed_s = game_state.play_elapsed_ms // 1000
                 elapsed_ms = (game_state.play_elapsed_ms % 1000) // 10
-                TIMER_TEXT = FONT_ARIAL.render("Time: {:d}.{:02d}s".format(elapsed_s, elapsed_ms), 1, (0, 0, 0))
-                SCREEN.blit(TIMER_TEXT, ((SCREEN_WIDTH / 2 + 70), 5))
-            game_state.notification_manager.draw_messages(game_state.screen)
+                timer_string = "Time: {:d}.{:02d}s".format(elapsed_s, elapsed_ms)
+                # The timer string changes every frame, so draw it from cached glyphs rather than rendering it
+                timer_rect = blit_text_glyphs(SCREEN, FONT_ARIAL, timer_string, (0, 0, 0), ((SCREEN_WIDTH / 2 + 70), 5))
+                dirty_tracker.track('timer_text', timer_rect, timer_string)
+            for index, (message, text_rect) in enumerate(game_state.notification_manager.draw_messages(game_state.screen)):
+                dirty_tracker.track(('notification', index), text_rect, message['text'])
             SCREEN.blit(DEATH_COUNT_TEXT, ((SCREEN_WIDTH/2-150), 5))
+            dirty_tracker.track('death_count_text', DEATH_COUNT_TEXT.get_rect(topleft=(SCREEN_WIDTH/2-150, 5)), death_count_string)
 
-            pygame.display.update()
+            # Only push the regions that changed since the last frame
+            dirty_tracker.present()
             pending_app_screen = game_state.consume_pending_app_screen()
             if pending_app_screen is not None:
                 app_screen = pending_app_screen
@@ -2033,6 +2270,12 @@ async def main():
                     app_screen = info_return_screen
 
             pygame.display.update()
+            dirty_tracker.invalidate()
+        # Menus, the info screen and the editor only need redrawing in response to something; play mode's timer always runs
+        is_animating = app_screen == APP_SCREEN_GAME and game_state.game_mode == GameState.PLAY_MODE
+        can_idle = not had_events and not is_animating and screen_state == (app_screen, game_state.game_mode, game_state.is_paused)
         await asyncio.sleep(0)
         
-asyncio.run(main())
+# pygbag and `python main.py` both run this file as __main__; the smoke tests import it
+if __name__ == "__main__":
+    asyncio.run(main())
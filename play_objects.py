@@ -1,10 +1,16 @@
 from base_objects import PlayObject
 import pygame
 import random
-from utils import SCREEN_WIDTH, SCREEN_HEIGHT
+from utils import (SCREEN_HEIGHT, GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT,
+                   WYATT_LABS_FITNESS_SIZE, WYATT_LABS_FITNESS_POS, SALESFARCE_PARK_SIZE, get_salesfarce_park_pos, get_variant)
+from collision import OccupancyGrid, SpatialHash, SolidRect, merge_rects, without_bottom_row, WALL, STICKY_BLOCK, BOUNDARY
+from enemy_batch import EnemyBatch, batching_available
 
 class PlayWall(PlayObject):
     wall_list = []
+    merged_wall_list = []  # SolidRects built from wall_list when play mode starts
+    wall_hash = SpatialHash()
+    solid_kind = WALL
 
     def __init__(self, pos, play_sprites, images):
         super().__init__(pos, play_sprites, images["spr_wall"])
@@ -14,9 +20,33 @@ class PlayWall(PlayObject):
 
     def remove_from_class_list(self):
         PlayWall.wall_list.remove(self)
-        
+
+class BoundaryWall(pygame.sprite.Sprite):
+    """Invisible wall sprite for building collision (top surface + inner sides)."""
+    boundary_list = []
+    solid_kind = BOUNDARY
+
+    def __init__(self, x, y, play_sprites):
+        pygame.sprite.Sprite.__init__(self)
+        self.image = pygame.Surface((GRID_SPACING, GRID_SPACING), pygame.SRCALPHA)
+        self.image.fill((0, 0, 0, 0))  # Transparent
+        self.rect = self.image.get_rect()
+        self.rect.topleft = (x, y)
+        play_sprites.add(self)
+        PlayWall.wall_list.append(self)
+        BoundaryWall.boundary_list.append(self)
+
+    def kill(self):
+        if self in BoundaryWall.boundary_list:
+            BoundaryWall.boundary_list.remove(self)
+        super().kill()
+
+    def restart(self):
+        pass
+
 class PlayReverseWall(PlayObject):
     reverse_wall_list = []
+    reverse_wall_hash = SpatialHash()
 
     def __init__(self, pos, play_sprites, images):
         # Assuming you need a transparent surface for reverse walls
@@ -42,23 +72,27 @@ class PlayFlyer(PlayObject):
         self.right_or_left = random.choice([self.left_speed, self.right_speed])
 
     def update(self):
+        if self.enemy_batch is not None:
+            return  # Moved by EnemyBatch.step() instead
         self.rect.topleft = (self.rect.topleft[0]+self.right_or_left, self.rect.topleft[1])
-        for wall in PlayWall.wall_list:
+        # Reversing nudges the flyer sideways, so look a little past its rect for candidates
+        nearby_rect = self.rect.inflate(PlayFlyer.SPEED*4, 0)
+        for wall in PlayWall.wall_hash.query(nearby_rect):
             if self.rect.colliderect(wall.rect):
                 if (self.rect.bottom > wall.rect.top+PlayFlyer.WALL_BOUNDARY_THRESHOLD and self.rect.top < wall.rect.bottom-PlayFlyer.WALL_BOUNDARY_THRESHOLD):
                     self.right_or_left = self.right_or_left*-1
                     self.rect.topleft = (self.rect.topleft[0]+self.right_or_left, self.rect.topleft[1])
-        for reverse_wall in PlayReverseWall.reverse_wall_list:
+        for reverse_wall in PlayReverseWall.reverse_wall_hash.query(nearby_rect):
             if self.rect.colliderect(reverse_wall.rect):
                 if (self.rect.bottom > reverse_wall.rect.top+PlayFlyer.WALL_BOUNDARY_THRESHOLD and self.rect.top < reverse_wall.rect.bottom-PlayFlyer.WALL_BOUNDARY_THRESHOLD):
                     self.right_or_left = self.right_or_left*-1
                     self.rect.topleft = (self.rect.topleft[0]+self.right_or_left, self.rect.topleft[1])
-        for sticky_block in PlayStickyBlock.sticky_block_list:
+        for sticky_block in PlayStickyBlock.sticky_block_hash.query(nearby_rect):
             if self.rect.colliderect(sticky_block.rect):
                 if (self.rect.bottom > sticky_block.rect.top+PlayFlyer.WALL_BOUNDARY_THRESHOLD and self.rect.top < sticky_block.rect.bottom-PlayFlyer.WALL_BOUNDARY_THRESHOLD):
                     self.right_or_left = self.right_or_left*-1
                     self.rect.topleft = (self.rect.topleft[0]+self.right_or_left, self.rect.topleft[1])
-        if self.rect.right > SCREEN_WIDTH or self.rect.left < 0:
+        if self.rect.right > self.world_width or self.rect.left < 0:
             self.right_or_left = self.right_or_left*-1
             self.rect.topleft = (self.rect.topleft[0]+self.right_or_left, self.rect.topleft[1])
         self.sprite_direction(self.images)
@@ -73,7 +107,7 @@ class PlayFlyer(PlayObject):
         if self.right_or_left == self.right_speed:
             self.image = images["spr_flyer"]
         elif self.right_or_left == self.left_speed:
-            self.image = pygame.transform.flip(images["spr_flyer"], 1, 0)
+            self.image = get_variant(images["spr_flyer"], flip_x=True)
             
 class PlayDiamonds(PlayObject):
     diamonds_list = []
@@ -117,6 +151,8 @@ class PlaySmilyRobot(PlayObject):
         self.speed_y = 0
     
     def update(self):
+        if self.enemy_batch is not None:
+            return  # Moved by EnemyBatch.step() instead
         # Apply horizontal and vertical movements
         self.handle_movement()
     
@@ -142,8 +178,8 @@ class PlaySmilyRobot(PlayObject):
     def handle_movement(self):
         # Move horizontally with boundary checking
         self.rect.x += self.speed_x
-        if self.rect.left <= 0 or self.rect.right >= SCREEN_WIDTH:
-            self.speed_x *= -1  # Change direction if hitting screen bounds
+        if self.rect.left <= 0 or self.rect.right >= self.world_width:
+            self.speed_x *= -1  # Change direction if hitting the level's ends
             
     def check_horizontal_collisions(self):
         # Predict the next horizontal position
@@ -151,7 +187,8 @@ class PlaySmilyRobot(PlayObject):
         self.rect.x = next_position
     
         # Detect horizontal collisions
-        collided_blocks = pygame.sprite.spritecollide(self, PlayWall.wall_list + PlayStickyBlock.sticky_block_list, False)
+        side_rect = without_bottom_row(self.rect)
+        collided_blocks = PlayWall.wall_hash.collide(side_rect) + PlayStickyBlock.sticky_block_hash.collide(side_rect)
         if collided_blocks:
             # If moving right but collided, place the robot to the left of the block
             if self.speed_x > 0:
@@ -168,7 +205,7 @@ class PlaySmilyRobot(PlayObject):
         self.rect.y = next_position
     
         # Detect vertical collisions
-        collided_blocks = pygame.sprite.spritecollide(self, PlayWall.wall_list + PlayStickyBlock.sticky_block_list, False)
+        collided_blocks = PlayWall.wall_hash.collide(self.rect) + PlayStickyBlock.sticky_block_hash.collide(self.rect)
         if collided_blocks:
             # If falling down but collided, place the robot on top of the block
             if self.speed_y > 0:
@@ -181,7 +218,7 @@ class PlaySmilyRobot(PlayObject):
     
     def handle_reverse_walls(self):
         # Detect collisions with reverse walls
-        collided_reverse_walls = pygame.sprite.spritecollide(self, PlayReverseWall.reverse_wall_list, False)
+        collided_reverse_walls = PlayReverseWall.reverse_wall_hash.collide(self.rect)
         if collided_reverse_walls:
             # Immediately reverse direction upon collision
             self.speed_x *= -1
@@ -193,7 +230,12 @@ class PlaySmilyRobot(PlayObject):
 
     def calc_grav(self):
         if self.rect.top < SCREEN_HEIGHT:
-            self.speed_y += self.GRAVITY
+            if self.speed_y >= 0 and self.occupancy_grid.kinds_below(self.rect):
+                # Standing on a solid: settle on top of its cell instead of falling into it
+                self.speed_y = 0
+                self.rect.bottom = self.occupancy_grid.cell_top(self.rect.bottom)
+            else:
+                self.speed_y += self.GRAVITY
         else:
             self.speed_y = 0
             self.rect.topleft = self.OUT_OF_PLAY_TOPLEFT
@@ -217,6 +259,9 @@ class PlaySmilyRobot(PlayObject):
 
 class PlayStickyBlock(PlayObject):
     sticky_block_list = []
+    merged_sticky_block_list = []
+    sticky_block_hash = SpatialHash()
+    solid_kind = STICKY_BLOCK
     def __init__(self, pos, play_sprites, images):
         super().__init__(pos, play_sprites, images["spr_sticky_block"])
         self.pos = pos
@@ -306,26 +351,27 @@ class PlayPlayer(PlayObject):
         #####################
         # WALLS
         #####################
-        self.wall_hit_list = pygame.sprite.spritecollide(self, PlayWall.wall_list, False)
+        side_rect = without_bottom_row(self.rect)
+        self.wall_hit_list = PlayWall.wall_hash.collide(side_rect)
         for wall in self.wall_hit_list:
             if self.speed_x > 0: #player moves right and collides into wall
                 self.rect.right = wall.rect.left
             elif self.speed_x < 0: #player moves left and collides into wall
                 self.rect.left = wall.rect.right
-        self.stickyblock_hit_list = pygame.sprite.spritecollide(self, PlayStickyBlock.sticky_block_list, False)
+        self.stickyblock_hit_list = PlayStickyBlock.sticky_block_hash.collide(without_bottom_row(self.rect))
         for stickyblock in self.stickyblock_hit_list:
             if self.speed_x > 0: #player moves right and collides into wall
                 self.rect.right = stickyblock.rect.left
             elif self.speed_x < 0: #player moves left and collides into wall
                 self.rect.left = stickyblock.rect.right
-        # Clamp player to screen horizontal bounds
+        # Clamp player to the level's horizontal bounds
         if self.rect.left < 0:
             self.rect.left = 0
-        if self.rect.right > SCREEN_WIDTH:
-            self.rect.right = SCREEN_WIDTH
+        if self.rect.right > self.world_width:
+            self.rect.right = self.world_width
         self.rect.y += self.speed_y
         # Check and see if we hit anything
-        self.wall_hit_list = pygame.sprite.spritecollide(self, PlayWall.wall_list, False)
+        self.wall_hit_list = PlayWall.wall_hash.collide(self.rect)
         for wall in self.wall_hit_list:
             # Reset our position based on the top/bottom of the object.
             if self.speed_y > 0:
@@ -336,7 +382,7 @@ class PlayPlayer(PlayObject):
             # Stop our vertical movement
             self.speed_y = 0
             self.propeller = 0
-        self.stickyblock_hit_list = pygame.sprite.spritecollide(self, PlayStickyBlock.sticky_block_list, False)
+        self.stickyblock_hit_list = PlayStickyBlock.sticky_block_hash.collide(self.rect)
         for stickyblock in self.stickyblock_hit_list:
             # Reset our position based on the top/bottom of the object.
             if self.speed_y > 0:
@@ -370,13 +416,9 @@ class PlayPlayer(PlayObject):
             self.sounds["snd_propeller"].stop()
             self.speed_y += self.GRAVITY
     def on_ground(self):
-        self.rect.y += 1  # Temporarily adjust position to check for collisions below
-        wall_hit_list = pygame.sprite.spritecollide(self, PlayWall.wall_list, False)
-        stickyblock_hit_list = pygame.sprite.spritecollide(self, PlayStickyBlock.sticky_block_list, False)
-        self.rect.y -= 1  # Reset position
-    
-        on_ground = bool(wall_hit_list or stickyblock_hit_list)
-        on_sticky = bool(stickyblock_hit_list)
+        below_kinds = self.occupancy_grid.kinds_below(self.rect)
+        on_ground = bool(below_kinds)
+        on_sticky = STICKY_BLOCK in below_kinds
         return on_ground, on_sticky
     def jump(self):
         on_ground, on_sticky = self.on_ground()
@@ -414,15 +456,15 @@ class PlayPlayer(PlayObject):
                     self.playerproptimer = 0
             if self.last_pressed_r == 0:
                 if self.playerproptimer > 1:
-                    self.image = pygame.transform.flip(self.images["spr_player_propeller"], 1, 0)
+                    self.image = get_variant(self.images["spr_player_propeller"], flip_x=True)
                 if self.playerproptimer > 3:
-                    self.image = pygame.transform.flip(self.images["spr_player"], 1, 0)
+                    self.image = get_variant(self.images["spr_player"], flip_x=True)
                     self.playerproptimer = 0
         else:
             if self.last_pressed_r == 1:
                 self.image = self.images["spr_player"]
             else:
-                self.image = pygame.transform.flip(self.images["spr_player"], 1, 0)
+                self.image = get_variant(self.images["spr_player"], flip_x=True)
     def animate_jump(self):
         # Check if the propeller is to be used, indicating a second jump in a double jump
         if self.propeller:
@@ -456,4 +498,273 @@ class PlayPlayer(PlayObject):
         self.last_pressed_r = 1
         self.score = 0
         self.death_count += 1
-        self.rect.topleft = self.pos
\ No newline at end of file
+        self.rect.topleft = self.pos
+
+def merge_solids(solids):
+    """
+    Merges solid sprites into SolidRects, keeping each solid_kind separate so
+    walls, boundaries and sticky blocks never share a rectangle.
+    """
+    rects_by_kind = {}
+    for solid in solids:
+        rects_by_kind.setdefault(solid.solid_kind, []).append(solid.rect)
+    return [SolidRect(rect, solid_kind)
+            for solid_kind, rects in rects_by_kind.items()
+            for rect in merge_rects(rects)]
+
+def build_collision_data():
+    """
+    Compiles the static solids for play mode: merges walls, building boundaries
+    and sticky blocks into rectangles, buckets them (and the reverse walls) by
+    grid cell and fills the shared occupancy grid. Call once after all play
+    objects (including building boundaries) have been created.
+    """
+    PlayWall.merged_wall_list = merge_solids(PlayWall.wall_list)
+    PlayStickyBlock.merged_sticky_block_list = merge_solids(PlayStickyBlock.sticky_block_list)
+    PlayWall.wall_hash.rebuild(PlayWall.merged_wall_list)
+    PlayStickyBlock.sticky_block_hash.rebuild(PlayStickyBlock.merged_sticky_block_list)
+    PlayReverseWall.reverse_wall_hash.rebuild(PlayReverseWall.reverse_wall_list)
+    PlayObject.occupancy_grid.clear()
+    for wall in PlayWall.merged_wall_list:
+        PlayObject.occupancy_grid.mark_rect(wall.rect, wall.solid_kind)
+    # Sticky blocks go last so a cell holding both reads as sticky
+    for sticky_block in PlayStickyBlock.merged_sticky_block_list:
+        PlayObject.occupancy_grid.mark_rect(sticky_block.rect, sticky_block.solid_kind)
+    if batching_available(len(PlayFlyer.flyer_list) + len(PlaySmilyRobot.smily_robot_list)):
+        PlayObject.enemy_batch = EnemyBatch(PlayFlyer.flyer_list, PlaySmilyRobot.smily_robot_list,
+                                            PlayWall.merged_wall_list, PlayReverseWall.reverse_wall_list,
+                                            PlayStickyBlock.merged_sticky_block_list, PlayObject.occupancy_grid,
+                                            PlayObject.world_width)
+    else:
+        PlayObject.enemy_batch = None
+    # Inserted in the order apply_play_rules checks them, which hazards_near_player relies on
+    PlayObject.hazard_hash.rebuild(PlaySmilyRobot.smily_robot_list + PlayFlyer.flyer_list +
+                                   PlayFallSpikes.fall_spikes_list + PlayStandSpikes.stand_spikes_list +
+                                   PlayDiamonds.diamonds_list + PlaySpring.spring_list)
+
+def clear_collision_data():
+    PlayWall.merged_wall_list = []
+    PlayStickyBlock.merged_sticky_block_list = []
+    PlayWall.wall_hash.clear()
+    PlayStickyBlock.sticky_block_hash.clear()
+    PlayReverseWall.reverse_wall_hash.clear()
+    PlayObject.occupancy_grid.clear()
+    PlayObject.enemy_batch = None
+    PlayObject.hazard_hash.clear()
+
+def update_hazard_hash():
+    """Re-buckets the hazards that move (robots, flyers and falling spikes); static ones stay put."""
+    for spr_list in [PlaySmilyRobot.smily_robot_list, PlayFlyer.flyer_list, PlayFallSpikes.fall_spikes_list]:
+        for obj in spr_list:
+            PlayObject.hazard_hash.move(obj)
+
+def hazards_near_player(play_player, hazard_class):
+    """
+    Yields the hazards of one class sharing a hash cell with the player, in
+    class-list order. If the player or the hazards move mid-loop (a restart or
+    a spring), the rest are looked up again, so the result matches walking the
+    whole class list and testing each rect.
+    """
+    hazard_hash = PlayObject.hazard_hash
+    last_order = -1
+    looked_up = False
+    while not looked_up:
+        player_rect = play_player.rect.copy()
+        version = hazard_hash.version
+        looked_up = True
+        for hazard in hazard_hash.nearby(player_rect):
+            order = hazard_hash.item_order[hazard]
+            if order <= last_order or not isinstance(hazard, hazard_class):
+                continue
+            last_order = order
+            yield hazard
+            if play_player.rect != player_rect or hazard_hash.version != version:
+                looked_up = False
+                break
+
+def set_world_width(world_width):
+    """
+    Sets the width of the level about to be played, which the enemies and the
+    player are kept inside. Call before build_building_boundaries() and
+    build_collision_data().
+    """
+    if world_width != PlayObject.world_width:
+        PlayObject.world_width = world_width
+        PlayObject.occupancy_grid = OccupancyGrid(world_width)
+
+def is_level_sprite(sprite):
+    """True for sprites that live in the level (play objects and building boundaries), False for the on-screen buttons."""
+    return isinstance(sprite, (PlayObject, BoundaryWall))
+
+def update_play_sprites(play_sprites, active_rect=None):
+    """
+    Updates the play sprites for one tick, moving batched enemies in bulk.
+    :param active_rect: World rect outside which play objects are left as they
+        are this tick (see Camera.active_rect()). The player and the UI buttons
+        always update. None updates everything.
+    """
+    if active_rect is None:
+        play_sprites.update()
+    else:
+        for sprite in play_sprites.sprites():
+            if not is_level_sprite(sprite) or isinstance(sprite, PlayPlayer) or active_rect.colliderect(sprite.rect):
+                sprite.update()
+    if PlayObject.enemy_batch is not None:
+        PlayObject.enemy_batch.step(active_rect)
+
+def building_boundary_positions(world_width):
+    """
+    Returns the top-left corners of the BoundaryWalls lining the rooftops and
+    inner sides of the two background buildings, aligned to the building art
+    drawn at WYATT_LABS_FITNESS_POS and get_salesfarce_park_pos(), the latter
+    at the right end of a level world_width wide.
+    """
+    gs = GRID_SPACING
+    positions = []
+    # --- Wyatt Labs Fitness (bottom-left): rooftop court surface ---
+    wl_pos = WYATT_LABS_FITNESS_POS
+    wl_roof_y = wl_pos[1] + int(WYATT_LABS_FITNESS_SIZE[1] * 0.31)
+    wl_top_y = ((wl_roof_y - TOP_UI_BOUNDARY_Y_HEIGHT) // gs) * gs + TOP_UI_BOUNDARY_Y_HEIGHT
+    wl_wall_x = wl_pos[0] + int(WYATT_LABS_FITNESS_SIZE[0] * 0.86)
+    wl_right_x = ((wl_wall_x - HORIZONTAL_GRID_OFFSET) // gs) * gs + HORIZONTAL_GRID_OFFSET
+    wl_roof_end_x = wl_right_x + gs
+    wl_left_start = -gs
+    x = wl_left_start
+    while x <= wl_roof_end_x:
+        positions.append((x, wl_top_y))
+        x += gs
+    y = wl_top_y + gs
+    while y < SCREEN_HEIGHT:
+        positions.append((wl_right_x, y))
+        y += gs
+    # --- Salesfarce Park (bottom-right): rooftop park surface ---
+    sf_pos = get_salesfarce_park_pos(world_width)
+    sf_roof_y = sf_pos[1] + int(SALESFARCE_PARK_SIZE[1] * 0.50)
+    sf_top_y = ((sf_roof_y - TOP_UI_BOUNDARY_Y_HEIGHT) // gs) * gs + TOP_UI_BOUNDARY_Y_HEIGHT
+    sf_wall_x = sf_pos[0] + int(SALESFARCE_PARK_SIZE[0] * 0.10)
+    sf_left_x = ((sf_wall_x - HORIZONTAL_GRID_OFFSET) // gs) * gs + HORIZONTAL_GRID_OFFSET
+    x = sf_left_x
+    while x < world_width:
+        positions.append((x, sf_top_y))
+        x += gs
+    y = sf_top_y + gs
+    while y < SCREEN_HEIGHT:
+        positions.append((sf_left_x, y))
+        y += gs
+    return positions
+
+def build_building_boundaries(play_sprites):
+    """Lines the two background buildings with BoundaryWalls, see building_boundary_positions()."""
+    for x, y in building_boundary_positions(PlayObject.world_width):
+        BoundaryWall(x, y, play_sprites)
+
+def restart_play_objects(play_player, play_door):
+    """Puts every play object back where the level placed it and counts a death."""
+    for spr_list in [PlayWall.wall_list, PlayFlyer.flyer_list,
+                     PlayReverseWall.reverse_wall_list, PlaySpring.spring_list, PlaySmilyRobot.smily_robot_list,
+                     PlayDiamonds.diamonds_list, PlayStickyBlock.sticky_block_list,
+                     PlayFallSpikes.fall_spikes_list, PlayStandSpikes.stand_spikes_list]:
+        for obj in spr_list:
+            obj.restart()
+    play_player.restart()
+    if play_door:
+        play_door.restart()
+    update_hazard_hash()
+
+def remove_play_objects():
+    """Kills every play object except the player and door and empties the class lists."""
+    for spr_list in [PlayWall.wall_list, PlayFlyer.flyer_list,
+                     PlayReverseWall.reverse_wall_list, PlaySpring.spring_list, PlaySmilyRobot.smily_robot_list,
+                     PlayDiamonds.diamonds_list, PlayStickyBlock.sticky_block_list,
+                     PlayFallSpikes.fall_spikes_list, PlayStandSpikes.stand_spikes_list]:
+        for obj in spr_list:
+            obj.kill()
+    PlayWall.wall_list = []
+    PlayFlyer.flyer_list = []
+    PlayReverseWall.reverse_wall_list = []
+    PlaySpring.spring_list = []
+    PlaySmilyRobot.smily_robot_list = []
+    PlayDiamonds.diamonds_list = []
+    PlayStickyBlock.sticky_block_list = []
+    PlayFallSpikes.fall_spikes_list = []
+    PlayStandSpikes.stand_spikes_list = []
+    clear_collision_data()
+
+def apply_play_rules(play_player, play_door, sounds):
+    """
+    Runs one tick of the level rules: falling off the screen, falling spikes,
+    the door, enemies, hazards, diamonds and springs. Deaths restart the level
+    straight away. Run it after the player's input and before updating the
+    play sprites.
+    :param sounds: Dictionary holding "snd_spring".
+    :return: True if the player reached the door holding every diamond.
+    """
+    # Dead
+    if play_player.rect.top > SCREEN_HEIGHT and play_player.speed_y >= 0:
+        restart_play_objects(play_player, play_door)
+    # Spikes fall when player goes underneath
+    if PlayFallSpikes.fall_spikes_list:
+        for fall_spike in PlayFallSpikes.fall_spikes_list:
+            if(play_player.rect.right > fall_spike.rect.left and
+               play_player.rect.left < fall_spike.rect.right and
+               play_player.rect.top > fall_spike.rect.bottom):
+                fall_spike.fall_var = 1
+            if fall_spike.fall_var == 1:
+                fall_spike.rect.top = fall_spike.rect.top + 5
+    # Player wins when he captures all jewels and enters door
+    if play_door:
+        play_door.image = play_door.open_or_close(play_player.score, PlayDiamonds.diamonds_list)
+        if pygame.sprite.collide_mask(play_player, play_door):
+            if play_player.score == len(PlayDiamonds.diamonds_list):
+                return True
+
+    #####################
+    # COLLISIONS
+    #####################
+    update_hazard_hash()
+    for play_smily_robot in hazards_near_player(play_player, PlaySmilyRobot):
+        if play_player.rect.colliderect(play_smily_robot.rect):
+            if(play_player.rect.bottom <= play_smily_robot.rect.top + 10 and play_player.speed_y >= 0):
+                play_smily_robot.rect.topleft = PlaySmilyRobot.OUT_OF_PLAY_TOPLEFT
+                play_player.propeller = 0
+                play_player.speed_y = -4
+                play_player.jumps_left = 1 #Allows propeller in air
+            elif(play_player.rect.right-play_smily_robot.rect.left <= 10 and
+                 play_player.rect.bottom > play_smily_robot.rect.top + 10):
+                restart_play_objects(play_player, play_door)
+            elif(play_player.rect.left-play_smily_robot.rect.right <= 10 and
+                 play_player.rect.bottom > play_smily_robot.rect.top + 10):
+                restart_play_objects(play_player, play_door)
+    for play_flyer in hazards_near_player(play_player, PlayFlyer):
+        if play_player.rect.colliderect(play_flyer.rect):
+            restart_play_objects(play_player, play_door)
+    for play_fall_spikes in hazards_near_player(play_player, PlayFallSpikes):
+        if play_player.rect.colliderect(play_fall_spikes.rect):
+            restart_play_objects(play_player, play_door)
+    for play_stand_spikes in hazards_near_player(play_player, PlayStandSpikes):
+        if play_player.rect.colliderect(play_stand_spikes.rect):
+            restart_play_objects(play_player, play_door)
+    for play_diamonds in hazards_near_player(play_player, PlayDiamonds):
+        if pygame.sprite.collide_mask(play_player, play_diamonds):
+            play_player.score += 1
+            play_diamonds.image = play_diamonds.images["spr_dynamic_object_placeholder"]
+    for spring in hazards_near_player(play_player, PlaySpring):
+        if pygame.sprite.collide_mask(play_player, spring):
+            # Check if the collision is primarily on top of the spring
+            if play_player.rect.bottom <= spring.rect.top + 20 and play_player.speed_y >= 0:
+                # This is a top collision, trigger the high jump
+                sounds["snd_spring"].play()
+                play_player.propeller = 0
+                play_player.rect.bottom = spring.rect.top
+                play_player.speed_y = -10  # High jump
+                play_player.jumps_left = 1  # Allows for propeller in air
+            else:
+                # Side collision handling
+                # Collision is primarily horizontal
+                if play_player.rect.centerx < spring.rect.centerx:
+                    # Player is on the left side of the spring
+                    play_player.rect.right = spring.rect.left
+                else:
+                    # Player is on the right side of the spring
+                    play_player.rect.left = spring.rect.right
+    return False
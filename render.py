@@ -0,0 +1,192 @@
+import weakref
+import pygame
+
+FULL_UPDATE_AREA = 0.4  # Above this fraction of the screen a single full update is cheaper than a rect list
+MAX_DIRTY_RECTS = 64
+BLANK_SURFACES = weakref.WeakKeyDictionary()  # Surface -> whether drawing it changes nothing, see is_blank()
+
+def is_blank(image):
+    """
+    Returns True if blitting image would leave the target unchanged: every
+    pixel fully transparent, or the whole surface at zero alpha. Worked out
+    once per surface, so only use it for images that aren't drawn on later.
+    """
+    blank = BLANK_SURFACES.get(image)
+    if blank is None:
+        blank = BLANK_SURFACES[image] = image.get_alpha() == 0 or image.get_bounding_rect().width == 0
+    return blank
+
+def draw_sprites(surface, sprites, offset=(0, 0)):
+    """
+    Draws sprites in order like Group.draw(), but leaves out invisible ones
+    (reverse walls, building boundaries, collected diamonds) and sends the
+    rest to the surface in a single fblits() call.
+    :param surface: Surface to draw on.
+    :param sprites: Iterable of sprites with .image and .rect.
+    :param offset: World position of the surface's top-left corner (a Camera's offset);
+        sprites entirely off the surface are skipped.
+    """
+    if offset == (0, 0):
+        surface.fblits([(sprite.image, sprite.rect) for sprite in sprites if not is_blank(sprite.image)])
+        return
+    view = surface.get_rect(topleft=offset)
+    surface.fblits([(sprite.image, sprite.rect.move(-offset[0], -offset[1])) for sprite in sprites
+                    if view.colliderect(sprite.rect) and not is_blank(sprite.image)])
+
+def merge_overlapping(rects):
+    """
+    Unions rects that overlap until none do, so no pixel is pushed twice.
+    :param rects: A list of pygame.Rect.
+    :return: A new list of pygame.Rect.
+    """
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+class DirtyRectTracker():
+    """
+    Works out which parts of the game screen changed since the last frame, so
+    only those regions are pushed with pygame.display.update(rects).
+
+    The screen is still composed in full every frame; everything drawn is
+    reported with track() or track_sprites(). An item is dirty when it appears,
+    disappears, moves or its state (image, text) changes, and then both its old
+    and new rects are refreshed. invalidate() forces the next frame to push the
+    whole screen, for changes that aren't tracked item by item.
+    """
+    def __init__(self, screen_rect):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.previous = {}
+        self.current = {}
+        self.extra_rects = []
+        self.full_update = True
+
+    def invalidate(self):
+        self.full_update = True
+
+    def mark_dirty(self, rect):
+        """Adds a region that changed outside the tracked items, e.g. a redrawn part of a StaticLayer."""
+        self.extra_rects.append(pygame.Rect(rect))
+
+    def track(self, key, rect, state=None):
+        self.current[key] = (pygame.Rect(rect), state)
+
+    def track_sprites(self, sprites, offset=(0, 0)):
+        # Invisible sprites can move without changing a pixel, so they are left out
+        for sprite in sprites:
+            if not is_blank(sprite.image):
+                self.current[sprite] = (sprite.rect.move(-offset[0], -offset[1]), sprite.image)
+
+    def dirty_rects(self):
+        """
+        Returns the regions that changed between the previous and current frame,
+        or [screen_rect] when so much changed that a full update is cheaper.
+        """
+        rects = list(self.extra_rects)
+        for key, (rect, state) in self.current.items():
+            previous = self.previous.get(key)
+            if previous is None:
+                rects.append(rect)
+            elif previous[0] != rect or previous[1] is not state and previous[1] != state:
+                rects.append(previous[0])
+                rects.append(rect)
+        for key, (rect, state) in self.previous.items():
+            if key not in self.current:
+                rects.append(rect)
+
+        rects = [rect.clip(self.screen_rect) for rect in rects]
+        rects = merge_overlapping([rect for rect in rects if rect.width and rect.height])
+        dirty_area = sum(rect.width * rect.height for rect in rects)
+        if len(rects) > MAX_DIRTY_RECTS or dirty_area > self.screen_rect.width * self.screen_rect.height * FULL_UPDATE_AREA:
+            return [self.screen_rect.copy()]
+        return rects
+
+    def present(self):
+        """Pushes this frame's changes to the display and starts tracking the next frame."""
+        if self.full_update:
+            pygame.display.update()
+        else:
+            rects = self.dirty_rects()
+            if rects:
+                pygame.display.update(rects)
+        self.full_update = False
+        self.previous = self.current
+        self.current = {}
+        self.extra_rects = []
+
+class StaticLayer():
+    """
+    A cached composite of everything on the edit screen that only changes when
+    the level is edited: the background, the placed objects and the grid
+    overlay drawn over them. Each frame the whole layer goes to the screen in a
+    single blit; placing or erasing an object only redraws the region it covered.
+
+    The layer shows the part of the level at its offset, in world coordinates;
+    rects passed to mark_dirty() and the sprites' rects are world rects too.
+    """
+    def __init__(self, size, draw_background, draw_overlay):
+        """
+        :param size: (width, height) of the layer, normally the screen size.
+        :param draw_background: Callable(surface) drawing what goes under the placed objects.
+        :param draw_overlay: Callable(surface) drawing what goes over them while the overlay is enabled.
+        """
+        self.surface = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            self.surface = self.surface.convert()
+        self.draw_background = draw_background
+        self.draw_overlay = draw_overlay
+        self.overlay_enabled = True
+        self.offset = (0, 0)
+        self.world = None
+        self.dirty = [self.surface.get_rect()]
+
+    def invalidate(self):
+        self.dirty = [self.surface.get_rect()]
+
+    def mark_dirty(self, rect):
+        self.dirty.append(pygame.Rect(rect).move(-self.offset[0], -self.offset[1]))
+
+    def set_view(self, offset, world=None):
+        """
+        Moves the layer to show the level from offset. world is any value that
+        changes when the level behind the layer does (e.g. its size); a change
+        in either redraws the whole layer.
+        """
+        offset = tuple(offset)
+        if offset != self.offset or world != self.world:
+            self.offset = offset
+            self.world = world
+            self.invalidate()
+
+    def set_overlay_enabled(self, enabled):
+        if enabled != self.overlay_enabled:
+            self.overlay_enabled = enabled
+            self.invalidate()
+
+    def refresh(self, sprites):
+        """
+        Redraws the regions marked dirty since the last refresh, clipped so
+        only those pixels are touched. draw_background and draw_overlay are
+        expected to draw at the current offset themselves.
+        :param sprites: The placed sprites, in draw order.
+        :return: The list of regions that were redrawn.
+        """
+        # Objects streamed in or out off screen leave empty clips, dropped before the merge
+        regions = [rect.clip(self.surface.get_rect()) for rect in self.dirty]
+        regions = merge_overlapping([region for region in regions if region.width and region.height])
+        self.dirty = []
+        for region in regions:
+            self.surface.set_clip(region)
+            self.draw_background(self.surface)
+            world_region = region.move(self.offset)
+            draw_sprites(self.surface, [sprite for sprite in sprites if world_region.colliderect(sprite.rect)], self.offset)
+            if self.overlay_enabled:
+                self.draw_overlay(self.surface)
+        self.surface.set_clip(None)
+        return regions
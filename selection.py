@@ -0,0 +1,84 @@
+"""
+The clipboard behind the editor's region selection. A CellRegion holds the
+objects of a rectangle of grid cells as per-kind arrays of cell coordinates,
+relative to the rectangle's top-left cell, plus the rotation of each standing
+spike. Mirroring and placing a region work on whole arrays (NumPy arrays
+when NumPy is installed), and only the result is turned back into objects.
+"""
+from array import array
+from utils import GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT, grid_cell
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Standing spikes' rotation after a horizontal mirror: pointing left and right swap, up and down stay
+MIRRORED_ROTATIONS = {0: 0, 90: 270, 180: 180, 270: 90}
+
+def int_array(values):
+    if np is not None:
+        return np.array(values, dtype=np.int32)
+    return array('i', values)
+
+class CellRegion():
+    def __init__(self, width, height, kinds):
+        """
+        :param width: Width of the region in grid cells.
+        :param height: Height of the region in grid cells.
+        :param kinds: {kind: (cols, rows, rotates)}, three equally long int arrays per object kind.
+        """
+        self.width = width
+        self.height = height
+        self.kinds = kinds
+
+    @classmethod
+    def from_entries(cls, entries, first_cell, last_cell):
+        """
+        Builds a region from the (kind, x, y, rotate) entries (see
+        edit_history) of the objects in the cells from first_cell to last_cell.
+        """
+        left, right = sorted((first_cell[0], last_cell[0]))
+        top, bottom = sorted((first_cell[1], last_cell[1]))
+        grouped = {}
+        for kind, x, y, rotate in entries:
+            col, row = grid_cell((x, y))
+            cols, rows, rotates = grouped.setdefault(kind, ([], [], []))
+            cols.append(col - left)
+            rows.append(row - top)
+            rotates.append(rotate)
+        kinds = {kind: tuple(int_array(values) for values in columns) for kind, columns in grouped.items()}
+        return cls(right - left + 1, bottom - top + 1, kinds)
+
+    def __len__(self):
+        return sum(len(cols) for cols, _, _ in self.kinds.values())
+
+    def without(self, *kinds):
+        return CellRegion(self.width, self.height, {kind: arrays for kind, arrays in self.kinds.items() if kind not in kinds})
+
+    def mirrored(self):
+        """Returns the region flipped left to right, with standing spikes turned to match."""
+        kinds = {}
+        for kind, (cols, rows, rotates) in self.kinds.items():
+            if np is not None:
+                mirrored_cols = (self.width - 1) - cols
+                mirrored_rotates = np.select([rotates == 90, rotates == 270], [270, 90], rotates).astype(np.int32)
+            else:
+                mirrored_cols = array('i', [self.width - 1 - col for col in cols])
+                mirrored_rotates = array('i', [MIRRORED_ROTATIONS.get(rotate, rotate) for rotate in rotates])
+            kinds[kind] = (mirrored_cols, rows, mirrored_rotates)
+        return CellRegion(self.width, self.height, kinds)
+
+    def to_entries(self, origin_cell):
+        """Returns the (kind, x, y, rotate) entries of the region placed with its top-left cell at origin_cell."""
+        entries = []
+        for kind, (cols, rows, rotates) in self.kinds.items():
+            if np is not None:
+                xs = ((cols + origin_cell[0]) * GRID_SPACING + HORIZONTAL_GRID_OFFSET).tolist()
+                ys = ((rows + origin_cell[1]) * GRID_SPACING + TOP_UI_BOUNDARY_Y_HEIGHT).tolist()
+                rotates = rotates.tolist()
+            else:
+                xs = [(col + origin_cell[0]) * GRID_SPACING + HORIZONTAL_GRID_OFFSET for col in cols]
+                ys = [(row + origin_cell[1]) * GRID_SPACING + TOP_UI_BOUNDARY_Y_HEIGHT for row in rows]
+            entries.extend(zip([kind] * len(xs), xs, ys, rotates))
+        return entries
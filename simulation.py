@@ -0,0 +1,142 @@
+import random
+import pygame
+from utils import TICK_RATE, IMAGES, load_play_images
+from camera import Camera
+from level_format import normalize_loaded_entries, read_level_file, canonicalize_level, get_world_width
+from play_objects import (PlayWall, PlayReverseWall, PlayFlyer, PlayDiamonds, PlayDoor, PlaySmilyRobot, PlayStickyBlock,
+                          PlayStandSpikes, PlayFallSpikes, PlaySpring, PlayPlayer,
+                          set_world_width, build_building_boundaries, build_collision_data, remove_play_objects, apply_play_rules,
+                          update_play_sprites)
+
+# Creation order of the play objects (stand spikes come last), shared with GameState.switch_to_play_mode so seeded runs match the game
+PLAY_OBJECT_FACTORIES = [
+    ('wall', PlayWall),
+    ('flyer', PlayFlyer),
+    ('reverse_wall', PlayReverseWall),
+    ('smily_robot', PlaySmilyRobot),
+    ('spring', PlaySpring),
+    ('diamonds', PlayDiamonds),
+    ('sticky_block', PlayStickyBlock),
+    ('fall_spikes', PlayFallSpikes),
+]
+
+class SilentSound():
+    """Stands in for pygame.mixer.Sound when running without audio."""
+    def play(self, *args, **kwargs):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+class Simulation():
+    """
+    Runs a level's play mode without a display, input devices or real time.
+    Each step() is one tick of the same rules the game uses: the PlayPlayer,
+    PlayFlyer and PlaySmilyRobot updates plus apply_play_rules().
+
+    Play objects keep themselves in class-level lists, so only one Simulation
+    (or game play session) can be live at a time. Call close(), or use it as a
+    context manager, before starting the next one.
+    """
+    def __init__(self, level, seed=None, images=None):
+        """
+        :param level: Level dictionary, as returned by read_level_file().
+        :param seed: Seed for the random module (enemy starting directions).
+        :param images: Image dictionary to use; loads the play images if None.
+        :raises ValueError: If the level has no player.
+        """
+        level, _ = canonicalize_level(level)
+        player_positions = normalize_loaded_entries(level.get('player', []))
+        if not player_positions:
+            raise ValueError("Level has no player")
+        if seed is not None:
+            random.seed(seed)
+        if images is None:
+            images = IMAGES if 'spr_player' in IMAGES else load_play_images()
+        self.sounds = {"snd_propeller": SilentSound(), "snd_spring": SilentSound()}
+        self.play_sprites = pygame.sprite.Group()
+        set_world_width(get_world_width(level))
+        self.camera = Camera(get_world_width(level))
+        self.ticks = 0
+        self.won = False
+        self.jump_held = False
+
+        self.play_player = PlayPlayer(player_positions[0], self.play_sprites, images, self.sounds)
+        door_positions = normalize_loaded_entries(level.get('door', []))
+        self.play_door = PlayDoor(door_positions[0], self.play_sprites, images) if door_positions else None
+        for object_name, factory in PLAY_OBJECT_FACTORIES:
+            for position in normalize_loaded_entries(level.get(object_name, [])):
+                factory(position, self.play_sprites, images)
+        for position, rotate in normalize_loaded_entries(level.get('stand_spikes', []), include_rotation=True):
+            PlayStandSpikes(position, self.play_sprites, images, rotate)
+        build_building_boundaries(self.play_sprites)
+        build_collision_data()
+
+    @classmethod
+    def from_file(cls, level_path, seed=None, images=None):
+        return cls(read_level_file(level_path), seed, images)
+
+    def step(self, left=False, right=False, jump=False):
+        """
+        Advances the level by one tick with the given buttons held, as a
+        keyboard player would: left wins over right, and jump only triggers on
+        the tick it is first pressed. Does nothing once the level is won.
+        :return: The state() after the tick.
+        """
+        if self.won:
+            return self.state()
+        if left:
+            self.play_player.move_left()
+        elif right:
+            self.play_player.move_right()
+        else:
+            self.play_player.stop()
+        if jump and not self.jump_held:
+            self.play_player.jump()
+        self.jump_held = jump
+        self.won = apply_play_rules(self.play_player, self.play_door, self.sounds)
+        if not self.won:
+            # The game only moves the stretch of level around its view, so follow the player the same way
+            self.camera.follow(self.play_player.rect)
+            update_play_sprites(self.play_sprites, self.camera.active_rect())
+        self.ticks += 1
+        return self.state()
+
+    def run(self, inputs):
+        """
+        Steps through inputs, stopping early if the level is won.
+        :param inputs: Iterable of (left, right, jump) tuples, one per tick.
+        :return: The final state().
+        """
+        for left, right, jump in inputs:
+            if self.won:
+                break
+            self.step(left, right, jump)
+        return self.state()
+
+    def state(self):
+        return {
+            'tick': self.ticks,
+            'elapsed_ms': self.ticks * 1000 // TICK_RATE,
+            'pos': self.play_player.rect.topleft,
+            'speed': (self.play_player.speed_x, self.play_player.speed_y),
+            'score': self.play_player.score,
+            'diamonds': len(PlayDiamonds.diamonds_list),
+            'deaths': self.play_player.death_count,
+            'won': self.won,
+        }
+
+    def close(self):
+        remove_play_objects()
+        self.play_player.kill()
+        if self.play_door:
+            self.play_door.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,110 @@
+"""
+Duplicate removal in level files and the grid cell index of placed objects.
+"""
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from base_objects import PlacedObject
+from level_format import canonicalize_level
+from placed_objects import PlacedWall, PlacedSpring
+from utils import GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT
+
+
+def at(col, row):
+    return (HORIZONTAL_GRID_OFFSET + col * GRID_SPACING, TOP_UI_BOUNDARY_Y_HEIGHT + row * GRID_SPACING)
+
+
+@pytest.fixture
+def images():
+    # Plain stand-ins for the sprites, so no art has to be loaded
+    return {name: pygame.Surface((24, 24)) for name in ("spr_wall", "spr_spring")}
+
+
+@pytest.fixture(autouse=True)
+def empty_index(monkeypatch):
+    monkeypatch.setattr(PlacedObject, "cell_index", {})
+    monkeypatch.setattr(PlacedObject, "static_layer", None)
+    monkeypatch.setattr(PlacedWall, "wall_list", [])
+    monkeypatch.setattr(PlacedSpring, "spring_list", [])
+
+
+def test_canonicalize_drops_repeats_and_keeps_the_first():
+    level = {
+        'world_width': 1484,
+        'wall': [at(1, 1), at(2, 1), at(1, 1), [at(2, 1)[0], at(2, 1)[1]], at(3, 1)],
+        'stand_spikes': [{'pos': at(4, 4), 'rotate': 90}, {'pos': at(4, 4), 'rotate': 180}, {'pos': at(5, 4), 'rotate': 0}],
+    }
+    canonical, dropped = canonicalize_level(level)
+    assert dropped == 3
+    assert canonical['wall'] == [at(1, 1), at(2, 1), at(3, 1)]
+    assert canonical['stand_spikes'] == [{'pos': at(4, 4), 'rotate': 90}, {'pos': at(5, 4), 'rotate': 0}]
+    assert canonical['world_width'] == 1484
+    assert len(level['wall']) == 5  # The level passed in is left alone
+
+
+def test_canonicalize_keeps_different_kinds_in_one_cell():
+    level = {'wall': [at(1, 1)], 'spring': [at(1, 1)], 'diamonds': [at(1, 1), at(1, 1)]}
+    canonical, dropped = canonicalize_level(level)
+    assert dropped == 1
+    assert canonical['wall'] == [at(1, 1)] and canonical['spring'] == [at(1, 1)] and canonical['diamonds'] == [at(1, 1)]
+
+
+def test_index_follows_the_group(images):
+    placed_sprites = pygame.sprite.Group()
+    wall = PlacedWall(at(3, 2), placed_sprites, images)
+    spring = PlacedSpring(at(3, 2), placed_sprites, images)
+    assert PlacedObject.placed_at(at(3, 2)) in (wall, spring)
+    assert PlacedWall.placed_at(at(3, 2)) is wall
+    assert PlacedSpring.placed_at(at(3, 2)) is spring
+    assert PlacedWall.placed_at(at(3, 3)) is None
+    assert sorted(PlacedObject.placed_in_cells([(3, 2)]), key=id) == sorted([wall, spring], key=id)
+
+
+def test_placed_later_in_a_batch_is_indexed_when_added(images):
+    placed_sprites = pygame.sprite.Group()
+    walls = [PlacedWall(at(col, 5), None, images) for col in range(3)]
+    assert PlacedObject.cell_index == {}
+    placed_sprites.add(*walls)
+    assert [PlacedWall.placed_at(at(col, 5)) for col in range(3)] == walls
+
+
+def test_kill_unindexes(images):
+    placed_sprites = pygame.sprite.Group()
+    wall = PlacedWall(at(3, 2), placed_sprites, images)
+    wall.kill()
+    assert PlacedWall.placed_at(at(3, 2)) is None
+    assert PlacedObject.cell_index == {}
+
+
+def test_remove_internal_unindexes_only_when_out_of_every_group(images):
+    placed_sprites, other_group = pygame.sprite.Group(), pygame.sprite.Group()
+    wall = PlacedWall(at(3, 2), placed_sprites, images)
+    other_group.add(wall)
+    other_group.remove(wall)
+    assert PlacedWall.placed_at(at(3, 2)) is wall
+    placed_sprites.remove(wall)
+    assert PlacedWall.placed_at(at(3, 2)) is None
+    assert PlacedObject.cell_index == {}
+
+
+def test_move_by_moves_the_index_entry(images):
+    placed_sprites = pygame.sprite.Group()
+    wall = PlacedWall(at(3, 2), placed_sprites, images)
+    wall.move_by(4 * GRID_SPACING, GRID_SPACING)
+    assert PlacedWall.placed_at(at(3, 2)) is None
+    assert PlacedWall.placed_at(at(7, 3)) is wall
+    assert list(PlacedObject.cell_index) == [(7, 3)]
+    wall.kill()
+    assert PlacedObject.cell_index == {}
+
+
+def test_move_by_leaves_unplaced_objects_out_of_the_index(images):
+    wall = PlacedWall(at(3, 2), None, images)
+    wall.move_by(GRID_SPACING, 0)
+    assert PlacedObject.cell_index == {}
@@ -0,0 +1,145 @@
+"""
+Play-mode collision structures: merged wall rects, the spatial hash and the occupancy grid.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from collision import EMPTY, WALL, STICKY_BLOCK, OccupancyGrid, SpatialHash, merge_rects
+from utils import GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT
+
+TILE_SIZE = GRID_SPACING + 1  # Sprites are a pixel bigger than the grid, so neighbouring tiles overlap
+
+
+def tile(col, row):
+    return pygame.Rect(HORIZONTAL_GRID_OFFSET + col * GRID_SPACING, TOP_UI_BOUNDARY_Y_HEIGHT + row * GRID_SPACING,
+                       TILE_SIZE, TILE_SIZE)
+
+
+def covered(rects):
+    # The set of pixels the rects cover
+    return {(x, y) for rect in rects for x in range(rect.left, rect.right) for y in range(rect.top, rect.bottom)}
+
+
+class Item():
+    def __init__(self, rect):
+        self.rect = rect
+
+
+def test_merge_touching_and_overlapping_runs():
+    touching = [pygame.Rect(0, 0, 10, 10), pygame.Rect(10, 0, 10, 10)]
+    assert merge_rects(touching) == [pygame.Rect(0, 0, 20, 10)]
+    overlapping = [tile(col, 0) for col in (2, 0, 1)]
+    assert merge_rects(overlapping) == [tile(0, 0).union(tile(2, 0))]
+    apart = [pygame.Rect(0, 0, 10, 10), pygame.Rect(11, 0, 10, 10)]
+    assert sorted(merge_rects(apart)) == sorted(apart)
+
+
+def test_merge_collapses_duplicates():
+    assert merge_rects([tile(3, 3), tile(3, 3), tile(3, 3)]) == [tile(3, 3)]
+
+
+def test_merge_stacks_runs_of_equal_width():
+    block = [tile(col, row) for row in range(3) for col in range(4)]
+    assert merge_rects(block) == [tile(0, 0).union(tile(3, 2))]
+
+
+def test_merge_keeps_runs_of_different_width_apart():
+    steps = [tile(col, 0) for col in range(3)] + [tile(col, 1) for col in range(2)]
+    merged = merge_rects(steps)
+    assert len(merged) == 2
+    assert covered(merged) == covered(steps)
+
+
+def test_merge_covers_the_same_pixels():
+    rects = [tile(col, row) for col, row in ((0, 0), (1, 0), (5, 0), (0, 1), (1, 1), (5, 1), (5, 2), (1, 4), (1, 4))]
+    assert covered(merge_rects(rects)) == covered(rects)
+
+
+def test_spatial_hash_query_and_collide():
+    spatial_hash = SpatialHash(GRID_SPACING)
+    near, far = Item(pygame.Rect(0, 0, 24, 24)), Item(pygame.Rect(200, 200, 24, 24))
+    spatial_hash.rebuild([near, far])
+    assert spatial_hash.query(pygame.Rect(10, 10, 5, 5)) == [near]
+    assert spatial_hash.collide(pygame.Rect(23, 23, 1, 1)) == [near]
+    assert spatial_hash.collide(pygame.Rect(24, 24, 10, 10)) == []
+    assert len(spatial_hash) == 2
+
+
+def test_spatial_hash_move_rebuckets():
+    spatial_hash = SpatialHash(GRID_SPACING)
+    item = Item(pygame.Rect(0, 0, 10, 10))
+    spatial_hash.insert(item)
+    version = spatial_hash.version
+    item.rect.move_ip(5, 5)
+    assert not spatial_hash.move(item)  # Still in the same cell
+    assert spatial_hash.version == version
+    item.rect.move_ip(100, 0)
+    assert spatial_hash.move(item)
+    assert spatial_hash.version == version + 1
+    assert spatial_hash.query(pygame.Rect(0, 0, 10, 10)) == []
+    assert spatial_hash.query(item.rect) == [item]
+    assert all(item not in bucket for cell, bucket in spatial_hash.cells.items() if cell[0] < 4)
+
+
+def test_spatial_hash_nearby_keeps_insertion_order():
+    spatial_hash = SpatialHash(GRID_SPACING)
+    items = [Item(pygame.Rect(x, 0, 10, 10)) for x in (60, 0, 30)]
+    spatial_hash.rebuild(items)
+    items[0].rect.x = 0
+    spatial_hash.move(items[0])
+    assert spatial_hash.nearby(pygame.Rect(0, 0, 70, 10)) == items
+
+
+def test_spatial_hash_remove():
+    spatial_hash = SpatialHash(GRID_SPACING)
+    item = Item(pygame.Rect(20, 20, 30, 30))
+    spatial_hash.insert(item)
+    spatial_hash.remove(item)
+    assert spatial_hash.cells == {} and len(spatial_hash) == 0
+
+
+def test_occupancy_marks_one_cell_per_tile():
+    grid = OccupancyGrid()
+    wall = tile(4, 6)
+    grid.mark_rect(wall, WALL)
+    assert sum(1 for kind in grid.cells if kind) == 1
+    assert grid.kind_at(wall.x, wall.y) == WALL
+    assert grid.kind_at(wall.right - 2, wall.bottom - 2) == WALL
+    # The tile's last pixel row and column overlap the next cells, which stay empty
+    assert grid.kind_at(wall.right - 1, wall.y) == EMPTY
+    assert grid.kind_at(wall.x, wall.bottom - 1) == EMPTY
+    assert grid.kind_at(wall.x - 1, wall.y) == EMPTY
+
+
+def test_occupancy_marks_merged_rects_cell_by_cell():
+    grid = OccupancyGrid()
+    floor = [tile(col, 8) for col in range(5)]
+    for rect in merge_rects(floor):
+        grid.mark_rect(rect, STICKY_BLOCK)
+    assert sum(1 for kind in grid.cells if kind) == 5
+    assert all(grid.kind_at(rect.x, rect.y) == STICKY_BLOCK for rect in floor)
+
+
+def test_kinds_below_at_tile_edges():
+    grid = OccupancyGrid()
+    wall = tile(4, 6)
+    grid.mark_rect(wall, WALL)
+    standing = pygame.Rect(wall.x, wall.y - TILE_SIZE, TILE_SIZE, TILE_SIZE)
+    assert grid.kinds_below(standing) == {WALL}
+    assert grid.kinds_below(standing.move(0, -1)) == set()
+    # Overhanging by all but a pixel on either side
+    assert grid.kinds_below(standing.move(-(TILE_SIZE - 1), 0)) == {WALL}
+    assert grid.kinds_below(standing.move(GRID_SPACING - 1, 0)) == {WALL}
+    assert grid.kinds_below(standing.move(GRID_SPACING, 0)) == set()
+    assert grid.kinds_below(standing.move(-TILE_SIZE, 0)) == set()
+    assert grid.cell_top(standing.bottom + 10) == wall.y
+
+
+def test_occupancy_ignores_rects_off_the_grid():
+    grid = OccupancyGrid()
+    grid.mark_rect(pygame.Rect(-1000, -1000, 24, 24), WALL)
+    assert not any(grid.cells)
+    assert grid.kind_at(-1000, -1000) == EMPTY
@@ -0,0 +1,138 @@
+"""
+Undo/redo bookkeeping for the editor, see edit_history.py.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from edit_history import EditHistory, UNDO_LIMIT
+
+
+WALL_A = ('wall', 250, 366, 0)
+WALL_B = ('wall', 273, 366, 0)
+SPIKES = ('stand_spikes', 296, 343, 90)
+
+
+def test_stroke_is_one_command():
+    history = EditHistory()
+    history.begin_stroke()
+    history.record(placed=[WALL_A])
+    history.record(placed=[WALL_B])
+    history.record(erased=[SPIKES])
+    history.end_stroke()
+    assert len(history.undo_stack) == 1
+    command = history.undo()
+    assert list(command.placed) == [WALL_A, WALL_B]
+    assert command.erased == [SPIKES]
+    assert history.undo() is None
+
+
+def test_record_outside_a_stroke_is_its_own_command():
+    history = EditHistory()
+    history.record(placed=[WALL_A])
+    history.record(placed=[WALL_B])
+    assert [list(command.placed) for command in history.undo_stack] == [[WALL_A], [WALL_B]]
+
+
+def test_empty_stroke_is_not_pushed():
+    history = EditHistory()
+    history.begin_stroke()
+    history.end_stroke()
+    assert history.undo() is None
+
+
+def test_erase_in_the_same_stroke_cancels_the_placement():
+    history = EditHistory()
+    history.begin_stroke()
+    history.record(placed=[WALL_A, WALL_B])
+    history.record(erased=[WALL_A])
+    history.end_stroke()
+    command = history.undo()
+    assert list(command.placed) == [WALL_B]
+    assert command.erased == []
+
+
+def test_placing_and_erasing_the_same_object_leaves_no_command():
+    history = EditHistory()
+    history.begin_stroke()
+    history.record(placed=[WALL_A])
+    history.record(erased=[WALL_A])
+    history.end_stroke()
+    assert history.undo_stack == []
+
+
+def test_erase_of_an_earlier_placement_is_kept():
+    history = EditHistory()
+    history.record(placed=[WALL_A])
+    history.record(erased=[WALL_A])
+    assert len(history.undo_stack) == 2
+    assert history.undo().erased == [WALL_A]
+
+
+def test_undo_then_redo():
+    history = EditHistory()
+    history.record(placed=[WALL_A])
+    command = history.undo()
+    assert history.redo() is command
+    assert history.redo() is None
+    assert history.undo() is command
+
+
+def test_new_edit_clears_redo():
+    history = EditHistory()
+    history.record(placed=[WALL_A])
+    history.record(placed=[WALL_B])
+    history.undo()
+    assert len(history.redo_stack) == 1
+    history.record(placed=[SPIKES])
+    assert history.redo_stack == []
+    assert history.redo() is None
+
+
+def test_undo_closes_the_open_stroke():
+    history = EditHistory()
+    history.begin_stroke()
+    history.record(placed=[WALL_A])
+    assert list(history.undo().placed) == [WALL_A]
+    assert history.stroke is None
+
+
+def test_limit_drops_the_oldest_commands():
+    history = EditHistory(limit=3)
+    for x in range(5):
+        history.record(placed=[('wall', 250 + 23 * x, 366, 0)])
+    assert [list(command.placed)[0][1] for command in history.undo_stack] == [250 + 23 * 2, 250 + 23 * 3, 250 + 23 * 4]
+    assert EditHistory().limit == UNDO_LIMIT
+
+
+def test_shift_entries_follows_a_widened_level():
+    # GameState.set_world_width() moves everything right of the field by the added width
+    field_right, added = 1000, 5 * 23
+    rooftop = ('wall', 1050, 200, 0)
+    rooftop_spikes = ('stand_spikes', 1073, 177, 270)
+    history = EditHistory()
+    history.record(placed=[WALL_A, rooftop])
+    history.record(erased=[rooftop_spikes])
+    history.undo()
+    history.begin_stroke()
+    history.record(placed=[('wall', 1096, 200, 0)])
+    history.shift_entries(field_right, added)
+
+    assert list(history.undo_stack[0].placed) == [WALL_A, ('wall', 1050 + added, 200, 0)]
+    assert history.redo_stack[0].erased == [('stand_spikes', 1073 + added, 177, 270)]
+    assert list(history.stroke.placed) == [('wall', 1096 + added, 200, 0)]
+    # A shifted placement can still be cancelled by erasing it at its new position
+    history.record(erased=[('wall', 1096 + added, 200, 0)])
+    assert history.stroke.is_empty()
+
+
+def test_resize_is_a_command_of_its_own():
+    history = EditHistory()
+    history.begin_stroke()
+    history.record(placed=[WALL_A])
+    history.record_resize(1024, 1116)
+    assert history.stroke is None
+    assert [command.resize for command in history.undo_stack] == [None, (1024, 1116)]
+    assert history.undo().resize == (1024, 1116)
+    assert history.redo().resize == (1024, 1116)
@@ -0,0 +1,124 @@
+"""
+Binary .lvlb checks. Each test runs with NumPy and again through the pure-Python decoders.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import level_format
+from level_format import (BINARY_HEADER, BINARY_SECTION, ENCODING_POINTS, ENCODING_CELLS, ENCODING_BITPLANE, LEVEL_KINDS,
+                          normalize_loaded_entries, padded, read_binary_level, read_level_file, write_binary_level_file)
+from utils import SCREEN_WIDTH, GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def decoder(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(level_format, "np", None)
+    return request.param
+
+
+def at(col, row):
+    return (HORIZONTAL_GRID_OFFSET + col * GRID_SPACING, TOP_UI_BOUNDARY_Y_HEIGHT + row * GRID_SPACING)
+
+
+def entries(level, kind):
+    return normalize_loaded_entries(level.get(kind, []), include_rotation=kind == 'stand_spikes')
+
+
+def section_encodings(path):
+    # (kind, encoding) of each section, in file order
+    data = path.read_bytes()
+    *_, cols, rows, section_count = BINARY_HEADER.unpack_from(data, 0)
+    offset = BINARY_HEADER.size
+    found = []
+    for _ in range(section_count):
+        kind_index, encoding, count = BINARY_SECTION.unpack_from(data, offset)
+        offset += BINARY_SECTION.size
+        size = {ENCODING_POINTS: 8 * count, ENCODING_CELLS: 4 * count, ENCODING_BITPLANE: (rows * cols + 7) // 8}[encoding]
+        if LEVEL_KINDS[kind_index] == 'stand_spikes':
+            size += count
+        offset += padded(size)
+        found.append((LEVEL_KINDS[kind_index], encoding))
+    return found
+
+
+def write_and_read(tmp_path, level):
+    path = tmp_path / "level.lvlb"
+    write_binary_level_file(path, level)
+    return path, read_level_file(path)
+
+
+def test_bitplane_round_trip(tmp_path, decoder):
+    floor = [at(col, 12) for col in range(30)]
+    path, level = write_and_read(tmp_path, {'player': [at(1, 11)], 'door': [at(5, 11)], 'wall': floor})
+    assert ('wall', ENCODING_BITPLANE) in section_encodings(path)
+    assert ('player', ENCODING_POINTS) in section_encodings(path)
+    assert entries(level, 'wall') == floor
+    assert entries(level, 'player') == [at(1, 11)]
+    assert entries(level, 'door') == [at(5, 11)]
+
+
+def test_bitplane_reads_back_in_grid_order(tmp_path, decoder):
+    walls = [at(col, row) for row in (3, 2) for col in range(20, -1, -1)]
+    _, level = write_and_read(tmp_path, {'wall': walls})
+    assert entries(level, 'wall') == sorted(walls, key=lambda position: (position[1], position[0]))
+
+
+def test_cells_round_trip(tmp_path, decoder):
+    # Few objects spread over a big grid are cheaper as cell numbers than as a bit plane
+    walls = [at(0, 0), at(40, 15), at(7, 3)]
+    path, level = write_and_read(tmp_path, {'wall': walls})
+    assert section_encodings(path) == [('wall', ENCODING_CELLS)]
+    assert entries(level, 'wall') == walls
+
+
+def test_off_grid_positions_round_trip(tmp_path, decoder):
+    walls = [at(2, 4), (at(3, 4)[0] + 5, at(3, 4)[1] - 7), (-40, 20)]
+    path, level = write_and_read(tmp_path, {'wall': walls})
+    assert ('wall', ENCODING_POINTS) in section_encodings(path)
+    assert sorted(entries(level, 'wall')) == sorted(walls)
+
+
+def test_rotations_round_trip(tmp_path, decoder):
+    spikes = [{'pos': at(col, 9), 'rotate': rotate} for col, rotate in ((1, 0), (2, 90), (3, 180), (4, 270))]
+    spikes.append({'pos': (at(6, 9)[0] + 3, at(6, 9)[1]), 'rotate': 90})
+    path, level = write_and_read(tmp_path, {'stand_spikes': spikes})
+    assert set(section_encodings(path)) == {('stand_spikes', ENCODING_CELLS), ('stand_spikes', ENCODING_POINTS)}
+    assert entries(level, 'stand_spikes') == entries({'stand_spikes': spikes}, 'stand_spikes')
+
+
+def test_world_width_round_trip(tmp_path, decoder):
+    world_width = SCREEN_WIDTH + 12 * GRID_SPACING
+    _, level = write_and_read(tmp_path, {'world_width': world_width, 'wall': [at(50, 5)]})
+    assert level['world_width'] == world_width
+    _, level = write_and_read(tmp_path, {'wall': [at(5, 5)]})
+    assert 'world_width' not in level
+
+
+def test_truncated_files_raise_value_error(tmp_path, decoder):
+    path = tmp_path / "level.lvlb"
+    write_binary_level_file(path, {'player': [at(1, 1)], 'wall': [at(col, 12) for col in range(30)],
+                                   'stand_spikes': [{'pos': at(2, 9), 'rotate': 90}]})
+    data = path.read_bytes()
+    for length in (BINARY_HEADER.size - 1, BINARY_HEADER.size + 2,
+                   BINARY_HEADER.size + BINARY_SECTION.size + 4, len(data) - 4, len(data) - 1):
+        truncated = tmp_path / "truncated.lvlb"
+        truncated.write_bytes(data[:length])
+        with pytest.raises(ValueError):
+            read_level_file(truncated)
+
+
+def test_empty_file_raises_value_error(tmp_path, decoder):
+    path = tmp_path / "empty.lvlb"
+    path.write_bytes(b"")
+    with open(path, "rb") as open_file, pytest.raises(ValueError):
+        read_binary_level(open_file)
+    path.write_bytes(b"LVLB")
+    with pytest.raises(ValueError):
+        read_level_file(path)
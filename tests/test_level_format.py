@@ -0,0 +1,74 @@
+"""
+Level file checks: the JSON .lvl format and the legacy dict literals it replaced.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import level_format
+from level_format import LEVEL_FORMAT, LEVEL_FORMAT_VERSION, normalize_loaded_entries, read_level_file, write_level_file
+from utils import SCREEN_WIDTH, GRID_SPACING
+
+
+LEVEL = {
+    'world_width': SCREEN_WIDTH + 20 * GRID_SPACING,
+    'player': [(273, 300)],
+    'door': [(411, 300)],
+    'wall': [(250, 366), (273, 366), (1400, 366)],
+    'flyer': [(319, 159)],
+    'stand_spikes': [{'pos': (296, 343), 'rotate': 90}, {'pos': (319, 343), 'rotate': 270}],
+}
+
+
+def entries(level, kind):
+    return normalize_loaded_entries(level.get(kind, []), include_rotation=kind == 'stand_spikes')
+
+
+def test_json_round_trip(tmp_path):
+    path = tmp_path / "level.lvl"
+    write_level_file(path, LEVEL)
+    saved = json.loads(path.read_text(encoding="utf-8"))
+    assert saved["format"] == LEVEL_FORMAT and saved["version"] == LEVEL_FORMAT_VERSION
+
+    level = read_level_file(path)
+    assert "format" not in level and "version" not in level
+    assert level['world_width'] == LEVEL['world_width']
+    for kind in ('player', 'door', 'wall', 'flyer', 'stand_spikes'):
+        assert entries(level, kind) == entries(LEVEL, kind), kind
+    assert entries(level, 'stand_spikes') == [((296, 343), 90), ((319, 343), 270)]
+
+
+def test_legacy_dict_literal(tmp_path):
+    path = tmp_path / "legacy.lvl"
+    path.write_text("{'player': [(273, 300)], 'wall': [(250, 366), (273, 366)], "
+                    "'stand_spikes': [{'pos': (296, 343), 'rotate': 180}]}", encoding="utf-8")
+    level = read_level_file(path)
+    assert entries(level, 'player') == [(273, 300)]
+    assert entries(level, 'wall') == [(250, 366), (273, 366)]
+    assert entries(level, 'stand_spikes') == [((296, 343), 180)]
+    assert level_format.get_world_width(level) == SCREEN_WIDTH
+
+
+def test_legacy_literal_must_be_a_dict(tmp_path):
+    path = tmp_path / "legacy.lvl"
+    path.write_text("[(273, 300)]", encoding="utf-8")
+    with pytest.raises(ValueError):
+        read_level_file(path)
+
+
+def test_newer_version_is_rejected(tmp_path):
+    path = tmp_path / "future.lvl"
+    path.write_text(json.dumps({"format": LEVEL_FORMAT, "version": LEVEL_FORMAT_VERSION + 1, "wall": []}), encoding="utf-8")
+    with pytest.raises(ValueError, match="newer"):
+        read_level_file(path)
+
+
+def test_wrong_format_is_rejected(tmp_path):
+    path = tmp_path / "other.lvl"
+    path.write_text(json.dumps({"format": "something-else", "version": 1, "wall": []}), encoding="utf-8")
+    with pytest.raises(ValueError, match="Not a level file"):
+        read_level_file(path)
@@ -0,0 +1,68 @@
+"""
+CellRegion checks. Each test runs with NumPy arrays and again with array('i') columns.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import selection
+from selection import CellRegion
+from utils import GRID_SPACING, HORIZONTAL_GRID_OFFSET, TOP_UI_BOUNDARY_Y_HEIGHT
+
+
+@pytest.fixture(params=["numpy", "array"])
+def arrays(request, monkeypatch):
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(selection, "np", None)
+    return request.param
+
+
+def entry(kind, col, row, rotate=0):
+    return (kind, HORIZONTAL_GRID_OFFSET + col * GRID_SPACING, TOP_UI_BOUNDARY_Y_HEIGHT + row * GRID_SPACING, rotate)
+
+
+# Cells (2, 3) to (6, 5): five columns wide, three rows high
+ENTRIES = [
+    entry('wall', 2, 5), entry('wall', 3, 5), entry('wall', 6, 5),
+    entry('flyer', 4, 3),
+    entry('stand_spikes', 2, 4, 90), entry('stand_spikes', 5, 4, 270),
+    entry('stand_spikes', 3, 4, 0), entry('stand_spikes', 6, 3, 180),
+]
+
+
+def region():
+    return CellRegion.from_entries(ENTRIES, (6, 5), (2, 3))
+
+
+def test_to_entries_puts_the_region_back(arrays):
+    assert region().width == 5 and region().height == 3
+    assert len(region()) == len(ENTRIES)
+    assert sorted(region().to_entries((2, 3))) == sorted(ENTRIES)
+
+
+def test_to_entries_moves_the_region(arrays):
+    moved = region().to_entries((12, 4))
+    assert sorted(moved) == sorted((kind, x + 10 * GRID_SPACING, y + GRID_SPACING, rotate) for kind, x, y, rotate in ENTRIES)
+
+
+def test_mirror(arrays):
+    mirrored = region().mirrored()
+    assert sorted(mirrored.to_entries((2, 3))) == sorted([
+        entry('wall', 6, 5), entry('wall', 5, 5), entry('wall', 2, 5),
+        entry('flyer', 4, 3),
+        entry('stand_spikes', 6, 4, 270), entry('stand_spikes', 3, 4, 90),
+        entry('stand_spikes', 5, 4, 0), entry('stand_spikes', 2, 3, 180),
+    ])
+
+
+def test_double_mirror_is_the_original(arrays):
+    assert sorted(region().mirrored().mirrored().to_entries((2, 3))) == sorted(ENTRIES)
+
+
+def test_without_drops_kinds(arrays):
+    assert sorted(region().without('wall', 'flyer').to_entries((2, 3))) == sorted(e for e in ENTRIES if e[0] == 'stand_spikes')
@@ -0,0 +1,52 @@
+"""
+Headless smoke checks for the editor. Run from the repository root with
+`python -m pytest tests`; SDL's dummy drivers stand in for a display.
+"""
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # main.py loads its icon relative to the repository root
+
+import pygame
+import main
+from render import StaticLayer
+from utils import (SCREEN_WIDTH, SCREEN_HEIGHT, GRID_SPACING, HORIZONTAL_GRID_OFFSET, MAX_WORLD_WIDTH, WYATT_LABS_FITNESS_SIZE,
+                   WYATT_LABS_FITNESS_POS, SALESFARCE_PARK_SIZE, get_salesfarce_park_pos)
+
+
+def building_surfaces(world_width):
+    # Plain stand-ins for the building art, laid out as main() does
+    surfaces = []
+    for size, position in ((WYATT_LABS_FITNESS_SIZE, WYATT_LABS_FITNESS_POS),
+                           (SALESFARCE_PARK_SIZE, get_salesfarce_park_pos(world_width))):
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill((90, 90, 110, 200))
+        surfaces.append((surface, position))
+    return surfaces
+
+
+def test_grid_overlay_covers_the_level():
+    for world_width in (SCREEN_WIDTH, SCREEN_WIDTH + 40 * GRID_SPACING, MAX_WORLD_WIDTH):
+        overlay = main.get_grid_overlay(building_surfaces(world_width), GRID_SPACING, (world_width, SCREEN_HEIGHT))
+        assert overlay.get_size() == (world_width, SCREEN_HEIGHT)
+        assert overlay.get_bounding_rect().width > 0
+
+
+def test_edit_frame_draws_the_grid():
+    # One editor frame as main() composes it: background, placed objects, then the grid overlay
+    def draw_background(surface):
+        surface.fill((255, 255, 255))
+
+    def draw_overlay(surface):
+        overlay = main.get_grid_overlay(building_surfaces(SCREEN_WIDTH), GRID_SPACING, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        surface.blit(overlay, (0, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    layer = StaticLayer((SCREEN_WIDTH, SCREEN_HEIGHT), draw_background, draw_overlay)
+    assert layer.refresh([]) == [pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)]
+    # The grid's left edge is a vertical line
+    assert layer.surface.get_at((HORIZONTAL_GRID_OFFSET, SCREEN_HEIGHT // 2)) != pygame.Color(255, 255, 255)
+
@@ -0,0 +1,49 @@
+import asyncio
+import pygame
+from utils import TICK_RATE, MAX_CATCH_UP_TICKS, IDLE_POLL_MS
+
+class FixedTimestep():
+    """
+    Turns variable frame times into a whole number of fixed-length simulation
+    ticks. Real time is added each frame and spent in steps of 1/tick_rate
+    seconds, so play-mode physics run at the same speed however fast frames
+    are drawn.
+    """
+    def __init__(self, tick_rate=TICK_RATE, max_ticks=MAX_CATCH_UP_TICKS):
+        self.tick_ms = 1000 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator_ms = 0
+
+    def reset(self):
+        self.accumulator_ms = 0
+
+    def advance(self, elapsed_ms):
+        """
+        Adds elapsed_ms of real time and returns how many ticks to run now.
+        :param elapsed_ms: Milliseconds since the previous frame (e.g. clock.tick()).
+        :return: Number of ticks, at most max_ticks. Time beyond that is dropped
+                 so a long stall doesn't turn into a burst of catch-up steps.
+        """
+        self.accumulator_ms += elapsed_ms
+        ticks = int(self.accumulator_ms // self.tick_ms)
+        if ticks > self.max_ticks:
+            self.accumulator_ms = 0
+            return self.max_ticks
+        self.accumulator_ms -= ticks * self.tick_ms
+        return ticks
+
+async def wait_for_events(timeout_ms, poll_ms=IDLE_POLL_MS):
+    """
+    Sleeps until an event is queued or timeout_ms has passed, leaving the events
+    on the queue for the screen that handles them. Sleeping through the asyncio
+    loop, rather than blocking in pygame.event.wait(), keeps the web build's
+    browser loop running too.
+    :param timeout_ms: Longest time to wait, in milliseconds.
+    :param poll_ms: How often to check the queue, in milliseconds.
+    """
+    deadline = pygame.time.get_ticks() + timeout_ms
+    while not pygame.event.peek():
+        remaining_ms = deadline - pygame.time.get_ticks()
+        if remaining_ms <= 0:
+            return
+        await asyncio.sleep(min(poll_ms, remaining_ms) / 1000)
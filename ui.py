@@ -1,4 +1,5 @@
 import pygame
+from utils import get_font, render_text
 
 class ClearButton(pygame.sprite.Sprite):
     def __init__(self, pos, images):
@@ -62,9 +63,9 @@ def _make_text_button(label, size=(72, 72), bg_color=(240, 200, 50), border_colo
     surf = pygame.Surface(size)
     surf.fill(border_color)
     surf.fill(bg_color, (border, border, size[0] - border * 2, size[1] - border * 2))
-    font = pygame.font.SysFont("Arial", 18, bold=True)
+    font = get_font("Arial", 18, bold=True)
     lines = label.split("\n")
-    text_surfaces = [font.render(line, True, text_color) for line in lines]
+    text_surfaces = [render_text(font, line, text_color) for line in lines]
     total_height = sum(text.get_height() for text in text_surfaces) + max(0, len(text_surfaces) - 1) * 4
     y = (size[1] - total_height) // 2
     for text_surface in text_surfaces:
@@ -1,18 +1,59 @@
 import pygame
 import os
 import sys
+import json
+import weakref
+from collections import OrderedDict
 
 SCREEN_WIDTH, SCREEN_HEIGHT = 1024, 600
 GRID_SPACING = 23
 HORIZONTAL_GRID_OFFSET = 250
 TOP_UI_BOUNDARY_Y_HEIGHT = 90
 
+# Background buildings; play mode turns their rooftops into solid ground
+WYATT_LABS_FITNESS_SIZE = (311, 390)
+WYATT_LABS_FITNESS_POS = (-SCREEN_WIDTH * 3 // 100, SCREEN_HEIGHT - WYATT_LABS_FITNESS_SIZE[1])
+SALESFARCE_PARK_SIZE = (287, 540)
+SALESFARCE_PARK_POS = (SCREEN_WIDTH - SALESFARCE_PARK_SIZE[0] + SCREEN_WIDTH * 2 // 100,
+                       SCREEN_HEIGHT - SALESFARCE_PARK_SIZE[1] + SCREEN_HEIGHT * 8 // 100 - 15)
+# Levels can be wider than the screen and scroll horizontally; widths grow a grid column at a time
+MAX_WORLD_WIDTH = SCREEN_WIDTH + 128 * GRID_SPACING
+
+def get_salesfarce_park_pos(world_width=SCREEN_WIDTH):
+    """Salesfarce Park stands at the right end of the level, so it moves out as the level widens."""
+    return (SALESFARCE_PARK_POS[0] + world_width - SCREEN_WIDTH, SALESFARCE_PARK_POS[1])
+
+def grid_cell(pos):
+    """Returns the (column, row) of the editor grid cell holding world position pos."""
+    return ((pos[0] - HORIZONTAL_GRID_OFFSET) // GRID_SPACING, (pos[1] - TOP_UI_BOUNDARY_Y_HEIGHT) // GRID_SPACING)
+
+def grid_cells_rect(first_cell, last_cell):
+    """
+    Returns the world rect covering the grid cells from first_cell to last_cell,
+    corners included in either order. Sprites are a pixel bigger than
+    GRID_SPACING, so the rect is too.
+    """
+    left, right = sorted((first_cell[0], last_cell[0]))
+    top, bottom = sorted((first_cell[1], last_cell[1]))
+    return pygame.Rect(HORIZONTAL_GRID_OFFSET + left * GRID_SPACING, TOP_UI_BOUNDARY_Y_HEIGHT + top * GRID_SPACING,
+                       (right - left + 1) * GRID_SPACING + 1, (bottom - top + 1) * GRID_SPACING + 1)
+
 FPS = 60
+TICK_RATE = 60  # Play-mode simulation steps per second, independent of FPS
+MAX_CATCH_UP_TICKS = 5  # Most simulation steps run in one frame after a stall
+IDLE_POLL_MS = 15  # How often an idle screen checks for input while it sleeps
+IDLE_REDRAW_MS = 1000  # Longest an idle screen goes without redrawing
 MOBILE_ACCESSIBILITY_MODE = True
 
 IMAGES = {}
 SOUNDS = {}
-FONTS = {}
+FONTS = {}  # Also holds system fonts under (name, size, bold) keys, see get_font()
+TEXT_CACHE = OrderedDict()  # (font, text, antialias, color) -> rendered Surface, least recently used first
+TEXT_CACHE_SIZE = 256
+MASKS = weakref.WeakKeyDictionary()  # Surface -> collision mask, see get_mask()
+VARIANTS = weakref.WeakKeyDictionary()  # Surface -> {(flip_x, angle): Surface}, see get_variant()
+ATLAS = {}  # Image name -> Surface sliced from the packed sprite sheets, see load_atlas()
+ATLAS_INDEX = "sprites/atlas.json"  # Written by atlas.py
 
 def load_image(file, name, alpha=False, global_alpha=None, colorkey=None):
     """
@@ -25,9 +66,14 @@ def load_image(file, name, alpha=False, global_alpha=None, colorkey=None):
     :param colorkey: Color key for transparency. If None, no colorkey is applied.
                      If -1, the color of the top-left pixel is used.
     """
+    if alpha and global_alpha is None and colorkey is None and name in ATLAS:
+        IMAGES[name] = ATLAS[name]
+        return ATLAS[name]
     try:
         image = pygame.image.load(file)
-        if alpha:
+        # Converting needs a display; headless runs keep the image as loaded
+        can_convert = pygame.display.get_surface() is not None
+        if alpha and can_convert:
             image = image.convert_alpha()  # Converts with per-pixel alpha
 
         if global_alpha is not None:
@@ -38,7 +84,7 @@ def load_image(file, name, alpha=False, global_alpha=None, colorkey=None):
                 colorkey = image.get_at((0, 0))
             image.set_colorkey(colorkey, pygame.RLEACCEL)
 
-        if not alpha:
+        if not alpha and can_convert:
             image = image.convert()  # Converts without per-pixel alpha
 
         # Store the image in the global IMAGES dictionary
@@ -49,6 +95,179 @@ def load_image(file, name, alpha=False, global_alpha=None, colorkey=None):
         # Handle the error as per your game's requirements
         return None  # or any fallback mechanism
 
+def create_transparent_surface(width, height):
+    """
+    Creates a transparent surface of the specified size.
+    :param width: Width of the surface.
+    :param height: Height of the surface.
+    :return: A transparent surface.
+    """
+    transparent_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    transparent_surface.fill((0, 0, 0, 0))  # Fill with complete transparency
+    return transparent_surface
+
+def load_atlas(index_file=ATLAS_INDEX):
+    """
+    Loads the sprite sheets written by atlas.py and slices them into the ATLAS
+    dictionary. load_image() and the derived-image helpers take images from
+    there first, so startup opens a few sheets instead of every sprite file.
+    Without an index, or for names it doesn't list, they fall back to the
+    individual files.
+    :param index_file: Path to the atlas JSON index.
+    :return: The ATLAS dictionary.
+    """
+    ATLAS.clear()
+    if not os.path.exists(index_file):
+        return ATLAS
+    try:
+        with open(index_file) as index:
+            atlas_index = json.load(index)
+        sheets = []
+        for sheet_file in atlas_index["sheets"]:
+            sheet = pygame.image.load(os.path.join(os.path.dirname(index_file), sheet_file))
+            if pygame.display.get_surface() is not None:
+                sheet = sheet.convert_alpha()
+            sheets.append(sheet)
+        for name, (sheet_number, x, y, width, height) in atlas_index["sprites"].items():
+            ATLAS[name] = sheets[sheet_number].subsurface((x, y, width, height))
+    except (OSError, ValueError, KeyError, pygame.error) as message:
+        print('Cannot load sprite atlas:', index_file, message)
+        ATLAS.clear()
+    return ATLAS
+
+def load_scaled_image(name, source_name, size):
+    """
+    Stores IMAGES[source_name] scaled to size as IMAGES[name], taking it from
+    the atlas when it is packed there.
+    """
+    IMAGES[name] = ATLAS[name] if name in ATLAS else pygame.transform.scale(IMAGES[source_name], size)
+    return IMAGES[name]
+
+def load_variant_image(name, source_name, flip_x=False, angle=0):
+    """
+    Stores get_variant(IMAGES[source_name], flip_x, angle) as IMAGES[name]. When
+    the atlas has the variant it is registered with get_variant() instead of
+    being made again.
+    """
+    source = IMAGES[source_name]
+    if name in ATLAS:
+        VARIANTS.setdefault(source, {})[(flip_x, angle % 360)] = ATLAS[name]
+    IMAGES[name] = get_variant(source, flip_x, angle)
+    return IMAGES[name]
+
+def load_play_images(use_atlas=True):
+    """
+    Loads the images play-mode objects use into the IMAGES dictionary. Works
+    without a display, so it is all a headless Simulation needs.
+    :param use_atlas: False to load every image from its own file, ignoring the sprite sheets.
+    :return: The IMAGES dictionary.
+    """
+    if use_atlas and not ATLAS:
+        load_atlas()
+    IMAGES['spr_dynamic_object_placeholder'] = create_transparent_surface(24, 24)  # Assuming 24x24 is the size for dynamic object placeholder
+    load_image("sprites/door_closed.png", "spr_door_closed", True)
+    load_image("sprites/door_open.png", "spr_door_open", True)
+    load_image("sprites/diamond.png", "spr_diamonds", True)
+    load_image("sprites/wall.png", "spr_wall", True)
+    load_image("sprites/reverse_wall.png", "spr_reverse_wall", True)
+    load_image("sprites/flyer.png", "spr_flyer", True)
+    load_image("sprites/spring.png", "spr_spring", True)
+    load_image("sprites/smily_robot_1.png", "spr_smily_robot", True)
+    load_image("sprites/smily_robot_2.png", "spr_smily_robot_2", True)
+    load_image("sprites/sticky_block.png", "spr_sticky_block", True)
+    load_image("sprites/fall_spikes.png", "spr_fall_spikes", True)
+    load_image("sprites/stand_spikes.png", "spr_stand_spikes_0_degrees", True)
+    load_variant_image('spr_stand_spikes_90_degrees', "spr_stand_spikes_0_degrees", angle=-90)
+    load_variant_image('spr_stand_spikes_180_degrees', "spr_stand_spikes_0_degrees", angle=-180)
+    load_variant_image('spr_stand_spikes_270_degrees', "spr_stand_spikes_0_degrees", angle=-270)
+    load_image("sprites/player.png", "spr_player", True)
+    load_image("sprites/player_propeller.png", "spr_player_propeller", True)
+    # Left-facing sprites
+    for name in ("spr_flyer", "spr_player", "spr_player_propeller"):
+        get_variant(IMAGES[name], flip_x=True)
+    for image in list(IMAGES.values()):
+        get_mask(image)
+        for variant in VARIANTS.get(image, {}).values():
+            get_mask(variant)
+    return IMAGES
+
+def load_editor_images():
+    """
+    Loads the palette ("_start") images and the editor and touch-control UI
+    images into the IMAGES dictionary. Call after load_play_images().
+    :return: The IMAGES dictionary.
+    """
+    load_scaled_image('spr_door_closed_start', 'spr_door_closed', (48, 72))
+    load_scaled_image('spr_diamonds_start', 'spr_diamonds', (48, 48))
+    load_scaled_image('spr_wall_start', 'spr_wall', (48, 48))
+    load_scaled_image('spr_reverse_wall_start', 'spr_reverse_wall', (48, 48))
+    load_scaled_image('spr_flyer_start', 'spr_flyer', (48, 48))
+    load_scaled_image('spr_spring_start', 'spr_spring', (48, 48))
+    load_scaled_image('spr_smily_robot_start', 'spr_smily_robot', (48, 48))
+    load_scaled_image('spr_sticky_block_start', 'spr_sticky_block', (48, 48))
+    load_scaled_image('spr_fall_spikes_start', 'spr_fall_spikes', (48, 48))
+    load_scaled_image('spr_stand_spikes_0_degrees_start', 'spr_stand_spikes_0_degrees', (48, 48))
+    load_scaled_image('spr_stand_spikes_90_degrees_start', 'spr_stand_spikes_90_degrees', (48, 48))
+    load_scaled_image('spr_stand_spikes_180_degrees_start', 'spr_stand_spikes_180_degrees', (48, 48))
+    load_scaled_image('spr_stand_spikes_270_degrees_start', 'spr_stand_spikes_270_degrees', (48, 48))
+    load_scaled_image('spr_player_start', 'spr_player', (40, 72))
+    load_image("sprites/play_button.png", "spr_play_button", True)
+    load_image("sprites/stop_button.png", "spr_stop_button", True)
+    load_image("sprites/clear.png", "spr_clear_button", True)
+    load_image("sprites/info_button.png", "spr_info_button", True)
+    load_image("sprites/grid_button.png", "spr_grid_button", True)
+    load_image("sprites/restart.png", "spr_restart_button", True)
+    load_image("sprites/save_file.png", "spr_save_file_button", True)
+    load_image("sprites/load_file.png", "spr_load_file_button", True)
+    load_image("sprites/rotate.png", "spr_rotate_button", True)
+    load_image("sprites/grid.png", "spr_grid", True)
+    load_image("sprites/eraser_not_selected_button.png", "spr_eraser_not_selected_button", True)
+    load_image("sprites/eraser_selected_button.png", "spr_eraser_selected_button", True)
+    load_image("sprites/eraser_cursor.png", "spr_eraser_cursor", True)
+
+    load_image("sprites/blue_left_arrow.png", "spr_blue_left_arrow", True)
+    load_image("sprites/blue_left_arrow_active.png", "spr_blue_left_arrow_active", True)
+
+    load_image("sprites/blue_right_arrow.png", "spr_blue_right_arrow", True)
+    load_image("sprites/blue_right_arrow_active.png", "spr_blue_right_arrow_active", True)
+
+    load_image("sprites/jump_button.png", "spr_jump_button", True)
+    load_image("sprites/jump_button_active.png", "spr_jump_button_active", True)
+    return IMAGES
+
+def get_variant(image, flip_x=False, angle=0):
+    """
+    Returns an image mirrored left-to-right and/or rotated, making each variant
+    only once so update code never allocates a new Surface.
+    :param image: The source pygame.Surface.
+    :param flip_x: True to mirror the image horizontally.
+    :param angle: Degrees counterclockwise, as pygame.transform.rotate (applied after the flip).
+    """
+    angle %= 360
+    if not flip_x and not angle:
+        return image
+    variants = VARIANTS.get(image)
+    if variants is None:
+        variants = VARIANTS[image] = {}
+    variant = variants.get((flip_x, angle))
+    if variant is None:
+        variant = pygame.transform.flip(image, flip_x, False) if flip_x else image
+        if angle:
+            variant = pygame.transform.rotate(variant, angle)
+        variants[(flip_x, angle)] = variant
+    return variant
+
+def get_mask(image):
+    """
+    Returns the collision mask for an image, building it the first time the
+    surface is seen. Entries go away with their surface.
+    :param image: A pygame.Surface that won't be drawn on afterwards.
+    """
+    mask = MASKS.get(image)
+    if mask is None:
+        mask = MASKS[image] = pygame.mask.from_surface(image)
+    return mask
+
 def load_sound(file, name):
     """
     Loads a sound file and stores it in the SOUNDS dictionary.
@@ -88,3 +307,52 @@ def load_font(name, size, is_system_font=False):
     except IOError as e:
         print(f"Cannot load font: {name}, {e}")
         raise SystemExit(e)
+
+def get_font(name, size, bold=False):
+    """
+    Returns the system font for (name, size, bold), only asking SysFont, which
+    is a slow lookup, the first time.
+    :param name: Name of the system font.
+    :param size: Size of the font.
+    :param bold: Boolean, True for the bold face.
+    """
+    font_key = (name, size, bold)
+    if font_key not in FONTS:
+        FONTS[font_key] = pygame.font.SysFont(name, size, bold=bold)
+    return FONTS[font_key]
+
+def render_text(font, text, color, antialias=True):
+    """
+    Returns font.render(text, antialias, color), reusing the surface if the same
+    text was rendered recently. The surface is shared, so don't draw on it.
+    :param font: A pygame.font.Font.
+    :param text: The string to render.
+    :param color: Text colour as an (r, g, b) tuple.
+    :param antialias: Boolean, passed to font.render.
+    """
+    text_key = (font, text, antialias, tuple(pygame.Color(color)))
+    surface = TEXT_CACHE.get(text_key)
+    if surface is None:
+        surface = font.render(text, antialias, color)
+        TEXT_CACHE[text_key] = surface
+        if len(TEXT_CACHE) > TEXT_CACHE_SIZE:
+            TEXT_CACHE.popitem(last=False)
+    else:
+        TEXT_CACHE.move_to_end(text_key)
+    return surface
+
+def blit_text_glyphs(surface, font, text, color, position):
+    """
+    Draws text one cached character at a time, for strings like the timer that
+    change every frame but only use a handful of characters. Kerning between
+    characters is ignored.
+    :param surface: Surface to draw on.
+    :param position: Top-left (x, y) of the text.
+    :return: The pygame.Rect covering the drawn text.
+    """
+    x, y = position
+    for character in text:
+        glyph = render_text(font, character, color)
+        surface.blit(glyph, (x, y))
+        x += glyph.get_width()
+    return pygame.Rect(position[0], y, x - position[0], font.get_height())